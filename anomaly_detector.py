@@ -0,0 +1,195 @@
+"""
+Online drift and anomaly detection for console telemetry channels.
+
+Each channel learns a baseline mean and standard deviation from its first
+`warmup` samples and then runs three detectors on every new sample, all in
+O(1) time and memory:
+
+- spike: rolling z-score against a fast EWMA mean/variance, for steps and
+  outliers (|x - ewma| / ewma_std > z)
+- cusum: two-sided CUSUM of the standardized deviation from the baseline,
+  for slow creep that never looks unusual sample by sample
+- drift: the EWMA mean has moved more than `drift` baseline standard
+  deviations away from the baseline
+
+An alarm is reported once when it becomes active and re-arms when its
+score falls back below half the threshold, so a sustained fault raises one
+event per detector rather than one per sample. reset() re-learns the
+baseline, e.g. after a setpoint change.
+"""
+
+import math
+import threading
+import time
+
+DEFAULTS = {
+    "warmup": 120,       # samples used to learn the baseline
+    "alpha": 0.05,       # EWMA weight of a new sample
+    "z": 6.0,            # spike threshold (EWMA standard deviations)
+    "cusum_k": 0.5,      # CUSUM slack (baseline standard deviations)
+    "cusum_h": 12.0,     # CUSUM alarm threshold
+    "drift": 4.0,        # drift threshold (baseline standard deviations)
+    "min_std": 1e-6,     # floor for quantized or very quiet channels
+}
+
+
+class ChannelDetector:
+    """Baseline, EWMA and CUSUM state of one channel."""
+
+    __slots__ = ("params", "n", "base_mean", "base_m2", "base_std", "ewma", "ewma_var",
+                 "cusum_pos", "cusum_neg", "active", "alarms", "last_value")
+
+    def __init__(self, params):
+        self.params = params
+        self.alarms = 0
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.base_mean = 0.0
+        self.base_m2 = 0.0
+        self.base_std = None
+        self.ewma = None
+        self.ewma_var = 0.0
+        self.cusum_pos = 0.0
+        self.cusum_neg = 0.0
+        self.active = set()
+        self.last_value = None
+
+    def update(self, x):
+        """
+        Add one sample.
+
+        Returns:
+            list: (kind, score, threshold) for every alarm that just became active
+        """
+        p = self.params
+        self.last_value = x
+        self.n += 1
+        if self.base_std is None:
+            # Learn the baseline (Welford)
+            delta = x - self.base_mean
+            self.base_mean += delta / self.n
+            self.base_m2 += delta * (x - self.base_mean)
+            self.ewma = self.base_mean
+            if self.n >= p["warmup"]:
+                variance = self.base_m2 / (self.n - 1) if self.n > 1 else 0.0
+                self.base_std = max(math.sqrt(variance), p["min_std"])
+                self.ewma_var = self.base_std ** 2
+            return []
+
+        raised = []
+
+        # Spike: z-score against the EWMA before it absorbs x
+        ewma_std = max(math.sqrt(self.ewma_var), p["min_std"])
+        z = abs(x - self.ewma) / ewma_std
+        self._check("spike", z, p["z"], raised)
+
+        alpha = p["alpha"]
+        diff = x - self.ewma
+        self.ewma += alpha * diff
+        self.ewma_var = (1 - alpha) * (self.ewma_var + alpha * diff * diff)
+
+        # CUSUM on the deviation from the baseline
+        u = (x - self.base_mean) / self.base_std
+        self.cusum_pos = max(0.0, self.cusum_pos + u - p["cusum_k"])
+        self.cusum_neg = max(0.0, self.cusum_neg - u - p["cusum_k"])
+        self._check("cusum", max(self.cusum_pos, self.cusum_neg), p["cusum_h"], raised)
+
+        drift = abs(self.ewma - self.base_mean) / self.base_std
+        self._check("drift", drift, p["drift"], raised)
+
+        self.alarms += len(raised)
+        return raised
+
+    def _check(self, kind, score, threshold, raised):
+        if score > threshold:
+            if kind not in self.active:
+                self.active.add(kind)
+                raised.append((kind, score, threshold))
+        elif score < threshold / 2:
+            self.active.discard(kind)
+
+    def status(self):
+        return {
+            "samples": self.n,
+            "learning": self.base_std is None,
+            "baselineMean": self.base_mean,
+            "baselineStd": self.base_std,
+            "ewma": self.ewma,
+            "cusum": max(self.cusum_pos, self.cusum_neg),
+            "active": sorted(self.active),
+            "alarms": self.alarms,
+            "lastValue": self.last_value,
+        }
+
+
+class AnomalyDetector:
+    """Per-channel detectors with per-channel or per-prefix configuration."""
+
+    def __init__(self, config=None, defaults=None):
+        """
+        Args:
+            config (dict): channel name or prefix (e.g. "pdu.") -> parameter
+                           overrides, or None to disable the channel. The
+                           longest matching key wins.
+            defaults (dict): Overrides of DEFAULTS for all channels
+        """
+        self.defaults = dict(DEFAULTS, **(defaults or {}))
+        self.config = dict(config or {})
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def _params(self, channel):
+        matches = [key for key in self.config if channel.startswith(key)]
+        if not matches:
+            return self.defaults
+        override = self.config[max(matches, key=len)]
+        return None if override is None else dict(self.defaults, **override)
+
+    def update(self, samples, timestamp=None):
+        """
+        Feed one sample per channel.
+
+        Args:
+            samples (dict): channel -> value
+            timestamp (float): Sample time (defaults to now)
+
+        Returns:
+            list: dicts (time, channel, kind, value, score, threshold, baseline)
+                  for alarms raised by these samples
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        events = []
+        with self._lock:
+            for channel, value in samples.items():
+                if value is None or value != value:
+                    continue
+                detector = self._channels.get(channel, False)
+                if detector is False:
+                    params = self._params(channel)
+                    detector = self._channels[channel] = ChannelDetector(params) if params else None
+                if detector is None:
+                    continue
+                for kind, score, threshold in detector.update(float(value)):
+                    events.append({
+                        "time": timestamp,
+                        "channel": channel,
+                        "kind": kind,
+                        "value": float(value),
+                        "score": score,
+                        "threshold": threshold,
+                        "baseline": detector.base_mean,
+                    })
+        return events
+
+    def reset(self, prefix=""):
+        """Re-learn the baseline of every channel starting with prefix."""
+        with self._lock:
+            for channel, detector in self._channels.items():
+                if detector and channel.startswith(prefix):
+                    detector.reset()
+
+    def status(self):
+        with self._lock:
+            return {c: d.status() for c, d in sorted(self._channels.items()) if d}
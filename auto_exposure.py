@@ -0,0 +1,186 @@
+"""
+Closed-loop auto-exposure for the sensor cameras.
+
+The brightness of a light histogram (its weighted mean bin) grows roughly
+linearly with gain * exposure, so the search runs on that product, the
+effective exposure. Each step captures one histogram, measures its weighted
+mean and saturated fraction with the block moment path, and narrows a
+bracket [too dark, too bright]:
+
+- with only one side of the bracket known, step proportionally towards the
+  target (at most MAX_STEP_FACTOR per capture),
+- with both sides known, interpolate linearly between them (regula falsi),
+  or bisect geometrically if the bright side is saturated and its mean is
+  unreliable.
+
+An effective exposure is realised with the lowest gain that reaches it
+within the exposure range, so gain only rises when exposure alone is not
+enough. Converged settings are kept per camera in an ExposureCache and used
+as the starting point for the next unit.
+"""
+
+import math
+import threading
+import time
+
+import numpy as np
+
+from histogram_classifier import block_weighted_mean_std
+
+DEFAULT_TARGET_MEAN = 300.0
+DEFAULT_TOLERANCE = 25.0
+DEFAULT_MAX_SATURATION = 0.001      # fraction of counts in the last bin
+DEFAULT_GAINS = (4, 8, 16, 32)
+DEFAULT_EXPOSURE_RANGE_US = (100, 5000)
+DEFAULT_MAX_CAPTURES = 8
+MAX_STEP_FACTOR = 4.0
+
+
+def measure(histogram):
+    """
+    Weighted mean and saturated fraction of one light histogram.
+
+    Returns:
+        tuple: (mean, saturation) with the UI noise rules for the mean and
+               the share of counts in bin 1023 for the saturation
+    """
+    hist = np.asarray(histogram, dtype=np.float64)[:1024]
+    means, _ = block_weighted_mean_std(hist[np.newaxis, :])
+    total = hist.sum()
+    saturation = float(hist[-1] / total) if total > 0 else 0.0
+    return float(means[0]), saturation
+
+
+class ExposureSearch:
+    """Bracketed search for the gain/exposure that hits a target mean."""
+
+    def __init__(self, target_mean=DEFAULT_TARGET_MEAN, tolerance=DEFAULT_TOLERANCE,
+                 max_saturation=DEFAULT_MAX_SATURATION, gains=DEFAULT_GAINS,
+                 exposure_range=DEFAULT_EXPOSURE_RANGE_US, max_captures=DEFAULT_MAX_CAPTURES):
+        self.target_mean = float(target_mean)
+        self.tolerance = float(tolerance)
+        self.max_saturation = float(max_saturation)
+        self.gains = tuple(sorted(int(g) for g in gains))
+        self.exposure_range = (int(exposure_range[0]), int(exposure_range[1]))
+        self.max_captures = int(max_captures)
+
+    @property
+    def effective_range(self):
+        return self.gains[0] * self.exposure_range[0], self.gains[-1] * self.exposure_range[1]
+
+    def settings(self, effective):
+        """(gain, exposure_us) realising an effective exposure with the lowest possible gain."""
+        lo, hi = self.exposure_range
+        for gain in self.gains:
+            if effective / gain <= hi:
+                return gain, int(round(min(max(effective / gain, lo), hi)))
+        return self.gains[-1], hi
+
+    def run(self, capture, start=None):
+        """
+        Search until the mean is within tolerance of the target.
+
+        Args:
+            capture (callable): capture(gain, exposure_us) -> 1024-bin histogram,
+                                or None if the capture failed
+            start (tuple): (gain, exposure_us) to start from
+
+        Returns:
+            dict: converged, gain, exposure, mean, saturation of the best
+                  capture, captures, reason and the list of steps
+        """
+        e_min, e_max = self.effective_range
+        gain, exposure = start if start else self.settings(math.sqrt(e_min * e_max))
+        effective = float(gain * exposure)
+        dark = bright = None            # (effective, mean, saturated)
+        steps = []
+        best = None
+        reason = "max captures"
+
+        for _ in range(self.max_captures):
+            gain, exposure = self.settings(effective)
+            effective = float(gain * exposure)
+            histogram = capture(gain, exposure)
+            if histogram is None:
+                reason = "capture failed"
+                break
+            mean, saturation = measure(histogram)
+            saturated = saturation > self.max_saturation
+            step = {"gain": gain, "exposure": exposure, "mean": mean, "saturation": saturation}
+            steps.append(step)
+
+            error = abs(mean - self.target_mean)
+            if not saturated and (best is None or error < abs(best["mean"] - self.target_mean)):
+                best = step
+            if not saturated and error <= self.tolerance:
+                reason = "converged"
+                break
+
+            if saturated or mean > self.target_mean:
+                bright = (effective, mean, saturated)
+                if effective <= e_min:
+                    reason = "too bright at minimum exposure"
+                    break
+            else:
+                dark = (effective, mean, saturated)
+                if effective >= e_max:
+                    reason = "too dark at maximum exposure"
+                    break
+            effective = min(max(self._next(dark, bright), e_min), e_max)
+
+        result = dict(best or (steps[-1] if steps else {"gain": gain, "exposure": exposure,
+                                                        "mean": 0.0, "saturation": 0.0}))
+        result.update(converged=reason == "converged", captures=len(steps), reason=reason, steps=steps)
+        return result
+
+    def _next(self, dark, bright):
+        target = self.target_mean
+        if dark and bright:
+            if bright[2]:
+                return math.sqrt(dark[0] * bright[0])
+            (e0, m0, _), (e1, m1, _) = dark, bright
+            if m1 <= m0:
+                return math.sqrt(e0 * e1)
+            guess = e0 + (target - m0) * (e1 - e0) / (m1 - m0)
+            # Stay strictly inside the bracket so it keeps shrinking
+            margin = 0.05 * (e1 - e0)
+            return min(max(guess, e0 + margin), e1 - margin)
+        if dark:
+            e, m, _ = dark
+            factor = target / m if m > 1.0 else MAX_STEP_FACTOR
+            return e * min(factor, MAX_STEP_FACTOR)
+        e, m, saturated = bright
+        factor = 1.0 / MAX_STEP_FACTOR if saturated else target / m
+        return e * max(factor, 1.0 / MAX_STEP_FACTOR)
+
+
+class ExposureCache:
+    """Last converged gain/exposure per (sensor side, camera index)."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def store(self, side, camera_index, gain, exposure, mean):
+        with self._lock:
+            self._entries[(side, int(camera_index))] = {
+                "gain": int(gain), "exposure": int(exposure), "mean": float(mean), "updated": time.time(),
+            }
+
+    def get(self, side, camera_index):
+        """(gain, exposure_us) or None if the camera was never auto-exposed."""
+        with self._lock:
+            entry = self._entries.get((side, int(camera_index)))
+            return (entry["gain"], entry["exposure"]) if entry else None
+
+    def clear(self, side=None):
+        with self._lock:
+            if side is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == side]:
+                    del self._entries[key]
+
+    def to_dict(self):
+        with self._lock:
+            return {f"{side}:{cam}": dict(entry) for (side, cam), entry in sorted(self._entries.items())}
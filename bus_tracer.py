@@ -0,0 +1,245 @@
+"""
+USB / I2C transaction tracer with Chrome Trace Event export.
+
+BusTracer swaps motion_interface.console_module and each entry of
+motion_interface.sensors for a TracingProxy. The proxy forwards every
+attribute; method calls are timed and recorded with the calling thread,
+target ("console", "left", "right"), command name and a short argument
+summary: I2C mux/channel/address/offset and read lengths are kept as-is,
+buffers are reduced to their byte counts.
+
+Records go into a fixed-size ring. Writers take a slot from an
+itertools.count (atomic under the GIL) and store one tuple, so tracing adds
+no lock to the hardware path; once full, the oldest records are
+overwritten.
+
+export_chrome_trace() writes the JSON Trace Event format understood by
+chrome://tracing and https://ui.perfetto.dev: one complete ("X") event per
+call on a track per thread, so interleaving between the GUI, the status
+poller and capture threads is visible on one timeline.
+"""
+
+import collections
+import inspect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+from diagnostics import current_thread_name
+
+logger = logging.getLogger("ow-testapp.bustrace")
+
+DEFAULT_CAPACITY = 100000
+
+# Integer arguments reported in hex in the trace
+_HEX_ARGS = {"device_addr", "reg_addr", "addr", "address", "offset", "camera_position", "mask"}
+
+
+def _summarize(args, kwargs, result):
+    """Small JSON-friendly description of one call's payload."""
+    summary = {}
+    tx = 0
+    for key, value in itertools.chain(enumerate(args), kwargs.items()):
+        name = key if isinstance(key, str) else f"arg{key}"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            tx += len(value)
+        elif isinstance(value, bool) or value is None:
+            summary[name] = value
+        elif isinstance(value, int):
+            summary[name] = f"0x{value:02X}" if name in _HEX_ARGS else value
+        elif isinstance(value, float):
+            summary[name] = value
+        elif isinstance(value, str):
+            summary[name] = value if len(value) <= 64 else f"<str {len(value)}>"
+        elif isinstance(value, (list, tuple)):
+            summary[name] = f"<{type(value).__name__} {len(value)}>"
+    if tx:
+        summary["txBytes"] = tx
+
+    # read_i2c_packet and friends return (data, length)
+    if isinstance(result, tuple) and result and isinstance(result[0], (bytes, bytearray)):
+        result = result[0]
+    if isinstance(result, (bytes, bytearray, memoryview)):
+        summary["rxBytes"] = len(result)
+    return summary
+
+
+class TraceRing:
+    """Fixed-capacity record ring; lock-free for concurrent writers."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = int(capacity)
+        self._slots = [None] * self.capacity
+        self._seq = itertools.count()
+
+    def record(self, record):
+        seq = next(self._seq)
+        self._slots[seq % self.capacity] = (seq,) + record
+
+    def records(self):
+        """Recorded tuples, oldest first: (seq, start_ns, end_ns, tid, thread, target, command, args, error)."""
+        return sorted(r for r in list(self._slots) if r is not None)
+
+    def clear(self):
+        self._slots = [None] * self.capacity
+        self._seq = itertools.count()
+
+
+class TracingProxy:
+    """Forwards attribute access to `target`, timing every method call."""
+
+    def __init__(self, target_name, target, ring):
+        object.__setattr__(self, "_target_name", target_name)
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_ring", ring)
+        object.__setattr__(self, "_wrappers", {})
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        # Only methods; bound signals and other callable objects must keep
+        # their own attributes (.connect, .emit, ...)
+        if not inspect.isroutine(attr) or name.startswith("__"):
+            return attr
+        wrapper = self._wrappers.get(name)
+        if wrapper is None or wrapper.__wrapped__ != attr:
+            wrapper = self._wrap(name, attr)
+            self._wrappers[name] = wrapper
+        return wrapper
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def _wrap(self, command, method):
+        ring = self._ring
+        target_name = self._target_name
+
+        def traced(*args, **kwargs):
+            start = time.perf_counter_ns()
+            result = None
+            error = None
+            try:
+                result = method(*args, **kwargs)
+                return result
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                end = time.perf_counter_ns()
+                ring.record((
+                    start, end, threading.get_ident(), current_thread_name(),
+                    target_name, command, _summarize(args, kwargs, result), error,
+                ))
+
+        traced.__wrapped__ = method
+        traced.__name__ = command
+        return traced
+
+
+class BusTracer:
+    """Installs tracing proxies on a MOTIONInterface and exports the timeline."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.ring = TraceRing(capacity)
+        self._interface = None
+        self._originals = {}    # target name -> original object
+        self.started_at = None
+        self._t0_ns = 0
+
+    @property
+    def active(self):
+        return self._interface is not None
+
+    def install(self, interface):
+        """Wrap console_module and every sensor of `interface`; clears earlier records."""
+        if self.active:
+            return
+        self.ring.clear()
+        self.started_at = time.time()
+        self._t0_ns = time.perf_counter_ns()
+        self._originals = {}
+
+        console = getattr(interface, "console_module", None)
+        if console is not None:
+            self._originals["console"] = console
+            interface.console_module = TracingProxy("console", console, self.ring)
+        sensors = getattr(interface, "sensors", None) or {}
+        for side, sensor in list(sensors.items()):
+            if sensor is not None:
+                self._originals[side] = sensor
+                sensors[side] = TracingProxy(side, sensor, self.ring)
+        self._interface = interface
+        logger.info(f"Bus tracing started ({', '.join(self._originals)})")
+
+    def uninstall(self):
+        """Put the original interface objects back."""
+        interface = self._interface
+        if interface is None:
+            return
+        for name, original in self._originals.items():
+            if name == "console":
+                if isinstance(interface.console_module, TracingProxy):
+                    interface.console_module = original
+            elif isinstance(interface.sensors.get(name), TracingProxy):
+                interface.sensors[name] = original
+        self._interface = None
+        self._originals = {}
+        logger.info("Bus tracing stopped")
+
+    def summary(self):
+        """Call count, total and worst duration per target/command."""
+        per_command = collections.defaultdict(lambda: {"calls": 0, "errors": 0, "totalMs": 0.0, "maxMs": 0.0})
+        records = self.ring.records()
+        for _, start, end, _, _, target, command, _, error in records:
+            entry = per_command[f"{target}.{command}"]
+            ms = (end - start) / 1e6
+            entry["calls"] += 1
+            entry["errors"] += error is not None
+            entry["totalMs"] += ms
+            entry["maxMs"] = max(entry["maxMs"], ms)
+        issued = records[-1][0] + 1 if records else 0
+        return {
+            "active": self.active,
+            "records": len(records),
+            "dropped": issued - len(records),
+            "commands": dict(sorted(per_command.items(), key=lambda kv: kv[1]["totalMs"], reverse=True)),
+        }
+
+    def export_chrome_trace(self, path):
+        """Write the recorded calls as Chrome Trace Event JSON; returns the path."""
+        records = self.ring.records()
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "OpenMOTION bus"}}]
+        threads = {}
+        for _, start, end, tid, thread, target, command, args, error in records:
+            threads.setdefault(tid, thread)
+            event_args = dict(args)
+            if error is not None:
+                event_args["error"] = error
+            events.append({
+                "name": command,
+                "cat": target,
+                "ph": "X",
+                "ts": (start - self._t0_ns) / 1000.0,
+                "dur": (end - start) / 1000.0,
+                "pid": pid,
+                "tid": tid,
+                "args": event_args,
+            })
+        for tid, thread in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}})
+
+        doc = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "startedAt": self.started_at,
+                "dropped": (records[-1][0] + 1 - len(records)) if records else 0,
+            },
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+        return path
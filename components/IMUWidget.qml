@@ -13,6 +13,31 @@ Rectangle {
     property int yVal: 0
     property int zVal: 0
 
+    // Live feed: with streamSide set ("left"/"right") and startImuStream()
+    // running, the decimated stream replaces xVal/yVal/zVal
+    property string streamSide: ""
+    property var liveValues: null
+    property real liveRate: 0
+    readonly property int shownX: liveValues ? Math.round(liveValues[0]) : xVal
+    readonly property int shownY: liveValues ? Math.round(liveValues[1]) : yVal
+    readonly property int shownZ: liveValues ? Math.round(liveValues[2]) : zVal
+
+    onStreamSideChanged: liveValues = null
+
+    Connections {
+        target: MOTIONInterface
+        enabled: streamSide !== ""
+        function onImuStreamUpdated(side, sample) {
+            if (side !== streamSide)
+                return
+            liveValues = (mode === "Gyro") ? sample.gyro : sample.accel
+            liveRate = sample.rateHz
+        }
+        function onConnectionStatusChanged() {
+            liveValues = null
+        }
+    }
+
     // === Border Circle ===
     Rectangle {
         width: 140
@@ -39,25 +64,33 @@ Rectangle {
         }
 
         Text {
-            text: "X: " + xVal
+            text: "X: " + shownX
             font.pixelSize: 14
             color: "#3498DB"
             anchors.horizontalCenter: parent.horizontalCenter
         }
 
         Text {
-            text: "Y: " + yVal
+            text: "Y: " + shownY
             font.pixelSize: 14
             color: "#27AE60"
             anchors.horizontalCenter: parent.horizontalCenter
         }
 
         Text {
-            text: "Z: " + zVal
+            text: "Z: " + shownZ
             font.pixelSize: 14
             color: "#E67E22"
             anchors.horizontalCenter: parent.horizontalCenter
         }
+
+        Text {
+            visible: liveValues !== null
+            text: "live " + liveRate.toFixed(0) + " Hz"
+            font.pixelSize: 10
+            color: "#7F8C8D"
+            anchors.horizontalCenter: parent.horizontalCenter
+        }
     }
 
     // === Label Below Widget ===
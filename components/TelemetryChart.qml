@@ -0,0 +1,177 @@
+import QtQuick 6.0
+import QtQuick.Controls 6.0
+import QtQuick.Layouts 6.0
+
+Item {
+    id: telemetryChart
+    width: 600
+    height: 260
+
+    property string channel: "tec.voltage"
+    property real windowSeconds: 600
+    property int refreshMs: 1000
+    property var series: ({ t: [], min: [], max: [], mean: [], bucketS: 0 })
+
+    readonly property var windowOptions: [
+        { text: "10 min", seconds: 600 },
+        { text: "1 h", seconds: 3600 },
+        { text: "6 h", seconds: 21600 },
+        { text: "24 h", seconds: 86400 },
+        { text: "7 d", seconds: 604800 }
+    ]
+
+    function refresh() {
+        // One bucket per two pixels; the connector serves it from the pyramid
+        const points = Math.max(2, Math.floor(chartCanvas.width / 2))
+        const s = MOTIONInterface.telemetrySeries(channel, windowSeconds, points)
+        series = (s && s.t) ? s : { t: [], min: [], max: [], mean: [], bucketS: 0 }
+        chartCanvas.requestPaint()
+    }
+
+    function formatAge(seconds) {
+        const s = Math.abs(seconds)
+        if (s >= 86400) return "-" + (s / 86400).toFixed(1) + " d"
+        if (s >= 3600) return "-" + (s / 3600).toFixed(1) + " h"
+        if (s >= 60) return "-" + Math.round(s / 60) + " min"
+        return "-" + Math.round(s) + " s"
+    }
+
+    Timer {
+        interval: telemetryChart.refreshMs
+        running: telemetryChart.visible
+        repeat: true
+        triggeredOnStart: true
+        onTriggered: telemetryChart.refresh()
+    }
+
+    Rectangle {
+        anchors.fill: parent
+        color: "#1E1E20"
+        border.color: "#3E4E6F"
+        radius: 6
+
+        ColumnLayout {
+            anchors.fill: parent
+            anchors.margins: 8
+            spacing: 4
+
+            RowLayout {
+                Layout.fillWidth: true
+                spacing: 10
+
+                ComboBox {
+                    id: channelSelector
+                    Layout.preferredWidth: 160
+                    Layout.preferredHeight: 28
+                    model: [telemetryChart.channel]
+                    onActivated: {
+                        telemetryChart.channel = currentText
+                        telemetryChart.refresh()
+                    }
+                    onPressedChanged: {
+                        if (pressed) {
+                            // Channels appear as their groups are first polled
+                            const names = MOTIONInterface.telemetryChannels()
+                            if (names && names.length > 0) {
+                                model = names
+                                currentIndex = Math.max(0, names.indexOf(telemetryChart.channel))
+                            }
+                        }
+                    }
+                }
+
+                ComboBox {
+                    id: windowSelector
+                    Layout.preferredWidth: 100
+                    Layout.preferredHeight: 28
+                    model: telemetryChart.windowOptions.map(o => o.text)
+                    onActivated: {
+                        telemetryChart.windowSeconds = telemetryChart.windowOptions[currentIndex].seconds
+                        telemetryChart.refresh()
+                    }
+                }
+
+                Text {
+                    Layout.fillWidth: true
+                    horizontalAlignment: Text.AlignRight
+                    color: "#BDC3C7"
+                    font.pixelSize: 12
+                    text: telemetryChart.series.t.length > 0
+                          ? "Last: " + Number(telemetryChart.series.mean[telemetryChart.series.mean.length - 1]).toFixed(3)
+                            + "   bucket " + telemetryChart.series.bucketS + " s"
+                          : "No data"
+                }
+            }
+
+            Item {
+                Layout.fillWidth: true
+                Layout.fillHeight: true
+
+                Canvas {
+                    id: chartCanvas
+                    anchors.fill: parent
+                    onPaint: {
+                        let ctx = getContext("2d")
+                        ctx.clearRect(0, 0, width, height)
+
+                        const padding = 40
+                        const drawWidth = width - 2 * padding
+                        const drawHeight = height - 2 * padding
+                        const s = telemetryChart.series
+                        const n = s.t.length
+
+                        // Axes
+                        ctx.strokeStyle = "#BDC3C7"
+                        ctx.lineWidth = 1
+                        ctx.beginPath()
+                        ctx.moveTo(padding, padding)
+                        ctx.lineTo(padding, height - padding)
+                        ctx.lineTo(width - padding, height - padding)
+                        ctx.stroke()
+
+                        if (n === 0)
+                            return
+
+                        let lo = Math.min(...s.min)
+                        let hi = Math.max(...s.max)
+                        if (hi - lo < 1e-9) { lo -= 0.5; hi += 0.5 }
+                        const span = telemetryChart.windowSeconds
+                        const x = t => padding + (1 + t / span) * drawWidth
+                        const y = v => height - padding - (v - lo) / (hi - lo) * drawHeight
+
+                        // Min/max band
+                        ctx.fillStyle = "rgba(74, 144, 226, 0.25)"
+                        ctx.beginPath()
+                        ctx.moveTo(x(s.t[0]), y(s.max[0]))
+                        for (let i = 1; i < n; i++)
+                            ctx.lineTo(x(s.t[i]), y(s.max[i]))
+                        for (let i = n - 1; i >= 0; i--)
+                            ctx.lineTo(x(s.t[i]), y(s.min[i]))
+                        ctx.closePath()
+                        ctx.fill()
+
+                        // Mean line
+                        ctx.strokeStyle = "#4A90E2"
+                        ctx.lineWidth = 1.5
+                        ctx.beginPath()
+                        ctx.moveTo(x(s.t[0]), y(s.mean[0]))
+                        for (let i = 1; i < n; i++)
+                            ctx.lineTo(x(s.t[i]), y(s.mean[i]))
+                        ctx.stroke()
+
+                        // Labels
+                        ctx.font = "11px sans-serif"
+                        ctx.fillStyle = "#BDC3C7"
+                        ctx.textAlign = "right"
+                        ctx.fillText(hi.toFixed(3), padding - 4, padding + 4)
+                        ctx.fillText(lo.toFixed(3), padding - 4, height - padding)
+                        ctx.textAlign = "left"
+                        ctx.fillText(telemetryChart.formatAge(span), padding, height - padding + 14)
+                        ctx.textAlign = "right"
+                        ctx.fillText("now", width - padding, height - padding + 14)
+                    }
+                }
+            }
+        }
+    }
+}
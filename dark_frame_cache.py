@@ -0,0 +1,199 @@
+"""
+Dark-frame cache and dark-corrected histogram statistics.
+
+Dark histograms are stored per sensor side and camera, keyed by the IMU
+temperature band and the camera gain/exposure they were taken with. A light
+capture looks up the matching dark frame and gets its statistics corrected
+for the dark contribution.
+
+Dark noise is independent of the signal, so its cumulants add to those of
+the light distribution. The corrected mean, variance, skewness and kurtosis
+are obtained by subtracting the dark cumulants from the light ones, which
+works on whole (n, 1024) blocks at once.
+"""
+
+import math
+import threading
+import time
+
+import numpy as np
+
+import histogram_classifier
+from histogram_classifier import block_moments, block_weighted_mean_std
+
+# Defaults: dark frames are reused within a 2 °C IMU band for up to 30 minutes
+DEFAULT_TEMPERATURE_BAND_C = 2.0
+DEFAULT_MAX_AGE_S = 30 * 60
+DEFAULT_MAX_ENTRIES = 64
+
+
+class DarkFrame:
+    """One cached dark histogram and the conditions it was captured under."""
+
+    __slots__ = ("histogram", "temperature", "gain", "exposure", "captured_at")
+
+    def __init__(self, histogram, temperature, gain, exposure, captured_at):
+        self.histogram = histogram
+        self.temperature = temperature
+        self.gain = gain
+        self.exposure = exposure
+        self.captured_at = captured_at
+
+    def age(self, now=None):
+        return (time.time() if now is None else now) - self.captured_at
+
+
+class DarkFrameCache:
+    """Thread-safe cache of dark histograms with age-based eviction."""
+
+    def __init__(self, temperature_band=DEFAULT_TEMPERATURE_BAND_C,
+                 max_age_s=DEFAULT_MAX_AGE_S, max_entries=DEFAULT_MAX_ENTRIES):
+        self.temperature_band = float(temperature_band)
+        self.max_age_s = float(max_age_s)
+        self.max_entries = int(max_entries)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _key(self, side, camera_index, temperature, gain, exposure):
+        band = math.floor(float(temperature) / self.temperature_band)
+        return (side, int(camera_index), int(gain), int(exposure), band)
+
+    def store(self, side, camera_index, histogram, temperature, gain, exposure, captured_at=None):
+        """Cache a dark histogram, replacing any entry for the same key."""
+        frame = DarkFrame(
+            np.array(histogram, dtype=np.float64)[:1024],
+            float(temperature), int(gain), int(exposure),
+            time.time() if captured_at is None else float(captured_at),
+        )
+        key = self._key(side, camera_index, temperature, gain, exposure)
+        with self._lock:
+            self._entries[key] = frame
+            self._evict_locked(frame.captured_at)
+        return frame
+
+    def lookup(self, side, camera_index, temperature, gain, exposure, now=None):
+        """
+        Return the cached dark frame for these conditions.
+
+        Returns:
+            DarkFrame or None if there is no entry in the temperature band,
+            or the entry is older than max_age_s
+        """
+        now = time.time() if now is None else now
+        key = self._key(side, camera_index, temperature, gain, exposure)
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is None:
+                return None
+            if frame.age(now) > self.max_age_s:
+                del self._entries[key]
+                return None
+            return frame
+
+    def needs_refresh(self, side, camera_index, temperature, gain, exposure, now=None):
+        """True if a new dark frame must be captured for these conditions."""
+        return self.lookup(side, camera_index, temperature, gain, exposure, now) is None
+
+    def evict_stale(self, now=None):
+        """Drop expired entries; returns the number removed."""
+        with self._lock:
+            return self._evict_locked(time.time() if now is None else now)
+
+    def clear(self, side=None):
+        with self._lock:
+            if side is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == side]:
+                    del self._entries[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _evict_locked(self, now):
+        stale = [k for k, f in self._entries.items() if f.age(now) > self.max_age_s]
+        for key in stale:
+            del self._entries[key]
+        removed = len(stale)
+        # Over capacity: drop the oldest captures first
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self._entries, key=lambda k: self._entries[k].captured_at)[:overflow]
+            for key in oldest:
+                del self._entries[key]
+            removed += overflow
+        return removed
+
+
+def dark_corrected_stats(light_histograms, dark_histograms, noisy_bin_min=100):
+    """
+    Dark-corrected weighted mean and standard deviation for a block of captures.
+
+    Uses the same noise rules as histogram_weighted_mean_std() on both light
+    and dark frames, then subtracts the dark mean and variance.
+
+    Args:
+        light_histograms (array): (n, 1024) light captures
+        dark_histograms (array): (n, 1024) matching dark frames
+
+    Returns:
+        tuple: (means, stds) arrays of shape (n,)
+    """
+    light_mean, light_std = block_weighted_mean_std(light_histograms, noisy_bin_min)
+    dark_mean, dark_std = block_weighted_mean_std(dark_histograms, noisy_bin_min)
+    variance = np.clip(light_std ** 2 - dark_std ** 2, 0.0, None)
+    return light_mean - dark_mean, np.sqrt(variance)
+
+
+def dark_corrected_moments(light_histograms, dark_histograms):
+    """
+    Dark-corrected mean, variance, skewness and kurtosis for a block of captures.
+
+    Args:
+        light_histograms (array): (n, bins) light captures
+        dark_histograms (array): (n, bins) matching dark frames
+
+    Returns:
+        tuple: (mean, variance, skewness, kurtosis) arrays of shape (n,)
+    """
+    lm, lv, ls, lk = block_moments(light_histograms)
+    dm, dv, ds, dk = block_moments(dark_histograms)
+
+    # Cumulants: k2 = var, k3 = skew * var^1.5, k4 = (kurt - 3) * var^2
+    k2 = lv - dv
+    k3 = ls * lv ** 1.5 - ds * dv ** 1.5
+    k4 = (lk - 3.0) * lv * lv - (dk - 3.0) * dv * dv
+
+    has_spread = k2 > 0
+    safe_k2 = np.where(has_spread, k2, 1.0)
+    skewness = np.where(has_spread, k3 / safe_k2 ** 1.5, 0.0)
+    kurtosis = np.where(has_spread, 3.0 + k4 / (safe_k2 * safe_k2), 3.0)
+    return lm - dm, np.clip(k2, 0.0, None), skewness, kurtosis
+
+
+def dark_corrected_verdict(light_result, light_reasons, skewness, kurtosis):
+    """
+    Re-apply the moment-based classifier criteria to dark-corrected moments.
+
+    Peak and hump findings come from the light histogram shape and are kept;
+    the skewness and kurtosis checks are redone on the corrected values.
+
+    Args:
+        light_result (str): Verdict of the raw light capture
+        light_reasons (list): Reasons reported for the raw light capture
+        skewness, kurtosis (float): Dark-corrected moments
+
+    Returns:
+        tuple: (result: str, reasons: list)
+    """
+    if light_result == "LOW_LIGHT":
+        return light_result, list(light_reasons)
+
+    reasons = [r for r in light_reasons
+               if not r.startswith(("High skewness", "Abnormal kurtosis"))]
+    if abs(skewness) > histogram_classifier.skewness_threshold:
+        reasons.append(f"High skewness ({skewness:.2f})")
+    if abs(kurtosis - 3.0) > histogram_classifier.kurtosis_threshold:
+        reasons.append(f"Abnormal kurtosis ({kurtosis:.2f})")
+    return ("FAIL" if reasons else "PASS"), reasons
@@ -0,0 +1,108 @@
+"""
+TTL cache for device state read over USB.
+
+QML pages poll the same slow device queries (trigger config, fan status,
+firmware/hardware IDs, ...) on timers. DeviceStateCache serves those reads
+from memory for a per-key time-to-live and is invalidated explicitly by the
+setters, connect/disconnect and DFU, so polling does not cost bus time.
+
+Keys are tuples such as ("console", "trigger") or ("sensor", "left", "fan");
+invalidate() drops every key that starts with the given prefix.
+"""
+
+import threading
+import time
+
+# TTL for values that only change on reconnect/DFU: keep until invalidated
+FOREVER = float("inf")
+
+
+class DeviceStateCache:
+    """Thread-safe key/value cache with per-key TTL and prefix invalidation."""
+
+    def __init__(self, default_ttl=1.0, clock=time.monotonic):
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}      # key -> (value, expires_at or None)
+        self._generation = 0    # bumped on every invalidation
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value if still fresh, without fetching."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry):
+                return entry[0]
+            return default
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            self._store_locked(key, value, ttl)
+
+    def get_or_fetch(self, key, fetch, ttl=None):
+        """
+        Return the cached value, or call fetch() and cache its result.
+
+        fetch() runs without the cache lock held. Exceptions propagate and
+        nothing is cached. A value fetched while the key was invalidated is
+        returned but not stored, so it cannot outlive the setter that
+        invalidated it.
+
+        Args:
+            key (tuple): Cache key
+            fetch (callable): Reads the value from the device
+            ttl (float): Seconds to keep the value (default_ttl if omitted,
+                         FOREVER to keep until invalidated)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry):
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self._generation
+
+        value = fetch()
+
+        with self._lock:
+            if generation == self._generation:
+                self._store_locked(key, value, ttl)
+        return value
+
+    def invalidate(self, *prefix):
+        """Drop every key starting with prefix (all keys if no prefix given)."""
+        n = len(prefix)
+        with self._lock:
+            self._generation += 1
+            stale = [k for k in self._entries if k[:n] == prefix]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += 1
+            return len(stale)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": (self.hits / lookups) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+
+    def _expired(self, entry):
+        expires_at = entry[1]
+        return expires_at is not None and self._clock() >= expires_at
+
+    def _store_locked(self, key, value, ttl):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = None if ttl == FOREVER else self._clock() + float(ttl)
+        self._entries[key] = (value, expires_at)
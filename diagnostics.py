@@ -0,0 +1,77 @@
+"""
+Building blocks shared by the diagnostics modules (safety monitor, loop lag
+monitor, lock instrumentation, bus tracer).
+"""
+
+import bisect
+import threading
+
+from PyQt6.QtCore import QThread
+
+
+def current_thread_name():
+    """Name of the calling thread; QThreads are named after their subclass."""
+    name = threading.current_thread().name
+    if name.startswith("Dummy-"):
+        # QThreads are not registered with threading; use the QThread subclass name
+        name = type(QThread.currentThread()).__name__
+    return name
+
+
+class LatencyHistogram:
+    """Log-spaced latency histogram from 50 us to ~13 s, with exact min/max/mean."""
+
+    # Bucket upper edges in seconds: 50 us * 2^k
+    EDGES = tuple(50e-6 * (2 ** k) for k in range(19))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.EDGES) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+
+    def record(self, seconds):
+        seconds = max(0.0, float(seconds))
+        with self._lock:
+            self.counts[bisect.bisect_left(self.EDGES, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self.min = seconds if self.min is None else min(self.min, seconds)
+            self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, q):
+        """Upper bucket edge below which a fraction q of samples fall (seconds)."""
+        with self._lock:
+            if not self.count:
+                return None
+            target = q * self.count
+            running = 0
+            for i, n in enumerate(self.counts):
+                running += n
+                if running >= target:
+                    return self.EDGES[i] if i < len(self.EDGES) else self.max
+            return self.max
+
+    def to_dict(self):
+        p50 = self.percentile(0.5)
+        p99 = self.percentile(0.99)
+        with self._lock:
+            ms = lambda v: None if v is None else v * 1000.0
+            return {
+                "count": self.count,
+                "minMs": ms(self.min),
+                "maxMs": ms(self.max),
+                "meanMs": ms(self.total / self.count) if self.count else None,
+                "p50Ms": ms(p50),
+                "p99Ms": ms(p99),
+                "buckets": [
+                    {"leMs": (self.EDGES[i] * 1000.0 if i < len(self.EDGES) else None), "count": n}
+                    for i, n in enumerate(self.counts) if n
+                ],
+            }
@@ -0,0 +1,360 @@
+"""
+Shared-memory frame bus for analysis processes on the same machine.
+
+The publisher (in the app) owns one multiprocessing.shared_memory segment
+with two rings: histogram frames (uint32 bins) and telemetry snapshots
+(JSON). Every slot starts with a sequence word used as a seqlock: it holds
+2 * seq + 1 while the slot is being written and 2 * seq + 2 once it is
+complete, so a reader can tell a finished slot from a torn or overwritten
+one without any locking.
+
+Subscribers only read the segment. Each keeps its own cursor, so any number
+of them can attach and none of them can slow the publisher down. A reader
+that falls more than a ring behind skips ahead and counts the lost entries
+in `overruns`.
+
+Frames are handed out as zero-copy NumPy views into the ring. A view stays
+valid until the publisher laps it; call FrameBusSubscriber.valid(frame)
+after processing to check that it was not overwritten meanwhile, or pass
+copy=True.
+
+    from frame_bus import FrameBusSubscriber
+
+    with FrameBusSubscriber() as bus:
+        while True:
+            for frame in bus.read_frames():
+                process(frame.side, frame.camera, frame.data)
+            for snapshot in bus.read_telemetry():
+                print(snapshot["group"], snapshot["fields"])
+            time.sleep(0.01)
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_NAME = "openmotion-framebus"
+DEFAULT_FRAME_SLOTS = 1024
+DEFAULT_TELEMETRY_SLOTS = 256
+DEFAULT_TELEMETRY_BYTES = 2048
+HISTOGRAM_BINS = 1024
+
+MAGIC = b"OMFBUS1\0"
+VERSION = 1
+SIDES = ("left", "right")
+_HEADER_SIZE = 64
+
+_HEADER = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("frame_slots", "<u4"),
+    ("bins", "<u4"),
+    ("telemetry_slots", "<u4"),
+    ("telemetry_bytes", "<u4"),
+    ("pid", "<u4"),
+    ("frame_head", "<u8"),          # frames published so far
+    ("telemetry_head", "<u8"),
+    ("open", "<u4"),                # 0 once the publisher closed the bus
+])
+
+Frame = namedtuple("Frame", "seq timestamp side camera data")
+
+
+def _frame_dtype(bins):
+    return np.dtype([
+        ("seq", "<u8"),
+        ("timestamp", "<f8"),
+        ("side", "u1"),
+        ("camera", "u1"),
+        ("_pad", "u1", (6,)),
+        ("data", "<u4", (bins,)),
+    ])
+
+
+def _telemetry_dtype(size):
+    return np.dtype([
+        ("seq", "<u8"),
+        ("timestamp", "<f8"),
+        ("length", "<u4"),
+        ("_pad", "<u4"),
+        ("payload", "u1", (size,)),
+    ])
+
+
+class _Layout:
+    """Typed views of the header and both rings of one segment."""
+
+    def __init__(self, buf, frame_slots, bins, telemetry_slots, telemetry_bytes):
+        self.header = np.ndarray((), dtype=_HEADER, buffer=buf)
+        offset = _HEADER_SIZE
+        frame_dtype = _frame_dtype(bins)
+        self.frames = np.ndarray((frame_slots,), dtype=frame_dtype, buffer=buf, offset=offset)
+        offset += frame_slots * frame_dtype.itemsize
+        self.telemetry = np.ndarray((telemetry_slots,), dtype=_telemetry_dtype(telemetry_bytes),
+                                    buffer=buf, offset=offset)
+
+    @staticmethod
+    def size(frame_slots, bins, telemetry_slots, telemetry_bytes):
+        return (_HEADER_SIZE + frame_slots * _frame_dtype(bins).itemsize
+                + telemetry_slots * _telemetry_dtype(telemetry_bytes).itemsize)
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, create=False, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name, create=False)
+        # Attaching registers the segment with the resource tracker, which would
+        # unlink it when a subscriber exits. Child processes share their
+        # parent's tracker, where the entry may be the publisher's own.
+        if os.name != "nt" and multiprocessing.parent_process() is None:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class FrameBusPublisher:
+    """Writes frames and telemetry into the shared rings; each ring takes one writer at a time."""
+
+    def __init__(self, name=DEFAULT_NAME, frame_slots=DEFAULT_FRAME_SLOTS, bins=HISTOGRAM_BINS,
+                 telemetry_slots=DEFAULT_TELEMETRY_SLOTS, telemetry_bytes=DEFAULT_TELEMETRY_BYTES):
+        size = _Layout.size(frame_slots, bins, telemetry_slots, telemetry_bytes)
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left over from a publisher that did not shut down cleanly
+            stale = _attach(name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = name
+        self.bins = bins
+        self._layout = _Layout(self._shm.buf, frame_slots, bins, telemetry_slots, telemetry_bytes)
+        self._layout.frames["seq"] = 0
+        self._layout.telemetry["seq"] = 0
+        header = self._layout.header
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["frame_slots"] = frame_slots
+        header["bins"] = bins
+        header["telemetry_slots"] = telemetry_slots
+        header["telemetry_bytes"] = telemetry_bytes
+        header["pid"] = os.getpid()
+        header["frame_head"] = 0
+        header["telemetry_head"] = 0
+        header["open"] = 1
+        self._frame_head = 0
+        self._telemetry_head = 0
+        self._frame_lock = threading.Lock()
+        self._telemetry_lock = threading.Lock()
+        self.dropped_telemetry = 0
+
+    def publish_frames(self, side, cameras, frames, timestamp=None):
+        """
+        Append one frame per camera; does nothing once the bus is closed.
+
+        Args:
+            side (str): "left" or "right"
+            cameras (list): Camera index of each frame
+            frames (array): (n, bins) histogram counts
+            timestamp (float): Capture time (defaults to now)
+        """
+        timestamp = time.time() if timestamp is None else float(timestamp)
+        block = np.asarray(frames).reshape(len(cameras), -1)[:, :self.bins]
+        side_id = SIDES.index(side)
+        with self._frame_lock:
+            # close() may run on another thread between the caller's check and here
+            if self._layout is None:
+                return
+            ring = self._layout.frames
+            n_slots = len(ring)
+            for camera, frame in zip(cameras, block):
+                seq = self._frame_head
+                slot = ring[seq % n_slots]
+                slot["seq"] = 2 * seq + 1
+                slot["timestamp"] = timestamp
+                slot["side"] = side_id
+                slot["camera"] = camera
+                slot["data"] = frame
+                slot["seq"] = 2 * seq + 2
+                self._frame_head = seq + 1
+                self._layout.header["frame_head"] = self._frame_head
+
+    def publish_telemetry(self, group, fields, timestamp=None):
+        """
+        Append one telemetry snapshot; snapshots larger than a slot are
+        dropped, and nothing is written once the bus is closed.
+        """
+        timestamp = time.time() if timestamp is None else float(timestamp)
+        payload = json.dumps({"group": group, "fields": fields}, default=str).encode("utf-8")
+        with self._telemetry_lock:
+            if self._layout is None:
+                return
+            ring = self._layout.telemetry
+            if len(payload) > ring.dtype["payload"].shape[0]:
+                self.dropped_telemetry += 1
+                return
+            seq = self._telemetry_head
+            slot = ring[seq % len(ring)]
+            slot["seq"] = 2 * seq + 1
+            slot["timestamp"] = timestamp
+            slot["length"] = len(payload)
+            slot["payload"][:len(payload)] = np.frombuffer(payload, dtype=np.uint8)
+            slot["seq"] = 2 * seq + 2
+            self._telemetry_head = seq + 1
+            self._layout.header["telemetry_head"] = self._telemetry_head
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "frames": self._frame_head,
+            "telemetry": self._telemetry_head,
+            "droppedTelemetry": self.dropped_telemetry,
+            "frameSlots": len(self._layout.frames),
+            "telemetrySlots": len(self._layout.telemetry),
+            "bytes": self._shm.size,
+        }
+
+    def close(self):
+        """Mark the bus closed and remove the segment (attached readers keep their mapping)."""
+        if self._shm is None:
+            return
+        with self._frame_lock, self._telemetry_lock:
+            self._layout.header["open"] = 0
+            self._layout = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+
+class FrameBusSubscriber:
+    """Read-only view of a publisher's rings with its own cursors."""
+
+    def __init__(self, name=DEFAULT_NAME, from_start=False):
+        """
+        Args:
+            name (str): Segment name given to the publisher
+            from_start (bool): Also return entries still in the rings from
+                               before attaching (default: only new ones)
+        """
+        self._shm = _attach(name)
+        header = np.ndarray((), dtype=_HEADER, buffer=self._shm.buf)
+        if header["magic"].item() != MAGIC.rstrip(b"\0") or int(header["version"]) != VERSION:
+            self._shm.close()
+            raise ValueError(f"{name} is not a version {VERSION} frame bus")
+        self.name = name
+        self._layout = _Layout(
+            self._shm.buf, int(header["frame_slots"]), int(header["bins"]),
+            int(header["telemetry_slots"]), int(header["telemetry_bytes"]),
+        )
+        self._frame_next = 0 if from_start else int(header["frame_head"])
+        self._telemetry_next = 0 if from_start else int(header["telemetry_head"])
+        self.overruns = 0
+        self.telemetry_overruns = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def publisher_open(self):
+        return bool(self._layout.header["open"])
+
+    @property
+    def frames_behind(self):
+        return int(self._layout.header["frame_head"]) - self._frame_next
+
+    def _window(self, head, next_seq, n_slots):
+        """First sequence still in the ring, and how many entries were lost."""
+        oldest = max(head - n_slots, 0)
+        if next_seq < oldest:
+            return oldest, oldest - next_seq
+        return next_seq, 0
+
+    def read_frames(self, max_frames=None, copy=False):
+        """
+        Frames published since the last call, oldest first.
+
+        Args:
+            max_frames (int): Return at most this many (the rest stay queued)
+            copy (bool): Return copies instead of views into shared memory
+
+        Returns:
+            list: Frame(seq, timestamp, side, camera, data) tuples
+        """
+        ring = self._layout.frames
+        head = int(self._layout.header["frame_head"])
+        start, lost = self._window(head, self._frame_next, len(ring))
+        self.overruns += lost
+        end = head if max_frames is None else min(head, start + int(max_frames))
+        out = []
+        for seq in range(start, end):
+            slot = ring[seq % len(ring)]
+            if int(slot["seq"]) != 2 * seq + 2:
+                self.overruns += 1      # lapped while we were reading
+                continue
+            data = slot["data"]
+            side, camera, timestamp = SIDES[int(slot["side"])], int(slot["camera"]), float(slot["timestamp"])
+            if copy:
+                data = data.copy()
+                if int(slot["seq"]) != 2 * seq + 2:
+                    self.overruns += 1
+                    continue
+            out.append(Frame(seq, timestamp, side, camera, data))
+        self._frame_next = end
+        return out
+
+    def valid(self, frame):
+        """True if the frame's slot has not been overwritten since it was read."""
+        ring = self._layout.frames
+        return int(ring[frame.seq % len(ring)]["seq"]) == 2 * frame.seq + 2
+
+    def read_telemetry(self):
+        """
+        Telemetry snapshots published since the last call, oldest first.
+
+        Returns:
+            list: dicts with seq, timestamp, group and fields
+        """
+        ring = self._layout.telemetry
+        head = int(self._layout.header["telemetry_head"])
+        start, lost = self._window(head, self._telemetry_next, len(ring))
+        self.telemetry_overruns += lost
+        out = []
+        for seq in range(start, head):
+            slot = ring[seq % len(ring)]
+            expected = 2 * seq + 2
+            if int(slot["seq"]) != expected:
+                self.telemetry_overruns += 1
+                continue
+            timestamp = float(slot["timestamp"])
+            payload = slot["payload"][:int(slot["length"])].tobytes()
+            if int(slot["seq"]) != expected:
+                self.telemetry_overruns += 1
+                continue
+            snapshot = json.loads(payload)
+            snapshot.update(seq=seq, timestamp=timestamp)
+            out.append(snapshot)
+        self._telemetry_next = head
+        return out
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._layout = None
+        try:
+            self._shm.close()
+        except BufferError:
+            pass    # frame views still referenced; the mapping goes with them
+        self._shm = None
@@ -0,0 +1,406 @@
+"""
+Indexed archive of histogram captures.
+
+Every capture taken through the connector is stored in a single SQLite
+database: one row of metadata (serial, sensor side, camera, dark/light,
+temperature, mean/std, classifier verdict and reasons, app/SDK/firmware
+versions) plus the 1024-bin histogram as a compressed blob.
+
+The table is indexed by serial, capture time and result, so looking up the
+history of one camera or all FAILs in a time window does not require parsing
+any CSV files. Existing `{serial}_histogram_{light|dark}[_N].csv` directories
+can be imported with import_csv_directory().
+"""
+
+import csv
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from histogram_classifier import classify_histogram_with_reasons, histogram_weighted_mean_std
+from histogram_codec import decode_frame, encode_frame
+
+logger = logging.getLogger("ow-testapp.archive")
+
+HISTOGRAM_BINS = 1024
+
+# Blob encodings understood by decode_histogram(); new captures use the delta codec
+ENCODING_U32_ZLIB = "u32-zlib"
+ENCODING_DELTA_ZLIB = "delta-zlib"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id               INTEGER PRIMARY KEY,
+    captured_at      REAL    NOT NULL,
+    serial           TEXT    NOT NULL,
+    sensor_side      TEXT,
+    camera_index     INTEGER,
+    is_dark          INTEGER NOT NULL,
+    temperature      REAL,
+    mean             REAL,
+    std              REAL,
+    result           TEXT,
+    reasons          TEXT,
+    app_version      TEXT,
+    sdk_version      TEXT,
+    firmware_version TEXT,
+    source_path      TEXT,
+    encoding         TEXT    NOT NULL,
+    histogram        BLOB    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_captures_serial_time ON captures(serial, captured_at);
+CREATE INDEX IF NOT EXISTS idx_captures_time ON captures(captured_at);
+CREATE INDEX IF NOT EXISTS idx_captures_result_time ON captures(result, captured_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_captures_source ON captures(source_path)
+    WHERE source_path IS NOT NULL;
+"""
+
+# Metadata columns returned by query(); the histogram blob is fetched separately
+_META_COLUMNS = (
+    "id", "captured_at", "serial", "sensor_side", "camera_index", "is_dark",
+    "temperature", "mean", "std", "result", "reasons",
+    "app_version", "sdk_version", "firmware_version", "source_path",
+)
+
+# CSV imports commit (and report progress) every this many files
+IMPORT_BATCH = 200
+
+# {serial}_histogram_light.csv, {serial}_histogram_dark_3.csv, ...
+_CSV_NAME_RE = re.compile(r"^(?P<serial>.*?)_?histogram_(?P<kind>light|dark)(?:_\d+)?\.csv$", re.I)
+
+
+def encode_histogram(histogram_values):
+    """
+    Pack histogram bins into a compact blob.
+
+    Args:
+        histogram_values (array): Histogram bin counts
+
+    Returns:
+        tuple: (encoding: str, blob: bytes)
+    """
+    return ENCODING_DELTA_ZLIB, encode_frame(np.asarray(histogram_values, dtype="<u4"))
+
+
+def decode_histogram(encoding, blob):
+    """
+    Unpack a blob produced by encode_histogram().
+
+    Args:
+        encoding (str): Encoding tag stored next to the blob
+        blob (bytes): Encoded histogram
+
+    Returns:
+        np.ndarray: Histogram bins as uint32
+    """
+    if encoding == ENCODING_DELTA_ZLIB:
+        return decode_frame(bytes(blob))
+    if encoding == ENCODING_U32_ZLIB:
+        return np.frombuffer(zlib.decompress(blob), dtype="<u4").copy()
+    raise ValueError(f"Unknown histogram encoding: {encoding}")
+
+
+class HistogramArchive:
+    """SQLite-backed store of histogram captures, safe to share between threads."""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add_capture(self, histogram_values, serial, sensor_side=None, camera_index=None,
+                    is_dark=False, temperature=None, mean=None, std=None, result=None,
+                    reasons=None, app_version=None, sdk_version=None, firmware_version=None,
+                    source_path=None, captured_at=None):
+        """
+        Store one capture.
+
+        Returns:
+            int: Row id of the new capture (None if source_path was already imported)
+        """
+        row = self._make_row(histogram_values, serial, sensor_side, camera_index, is_dark,
+                             temperature, mean, std, result, reasons, app_version,
+                             sdk_version, firmware_version, source_path, captured_at)
+        with self._lock:
+            cur = self._conn.execute(self._insert_sql(), row)
+            self._conn.commit()
+            return cur.lastrowid if cur.rowcount else None
+
+    def add_captures(self, rows):
+        """
+        Store many captures in a single transaction.
+
+        Args:
+            rows (iterable): dicts with the keyword arguments of add_capture()
+
+        Returns:
+            int: Number of rows inserted
+        """
+        params = [self._make_row(**r) for r in rows]
+        if not params:
+            return 0
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(self._insert_sql(), params)
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def query(self, serial=None, sensor_side=None, camera_index=None, is_dark=None,
+              result=None, since=None, until=None, limit=None, newest_first=True):
+        """
+        Look up capture metadata. All filters are optional and combined with AND.
+
+        Args:
+            serial (str): Camera serial number
+            sensor_side (str): "left" or "right"
+            camera_index (int): Camera index on the sensor (0-7)
+            is_dark (bool): Only dark (True) or light (False) captures
+            result (str): "PASS", "FAIL" or "LOW_LIGHT"
+            since, until (float): Unix timestamps bounding captured_at
+            limit (int): Maximum number of rows
+
+        Returns:
+            list: One dict per capture (without the histogram bins)
+        """
+        where, args = [], []
+        for column, value in (("serial", serial), ("sensor_side", sensor_side),
+                              ("camera_index", camera_index), ("result", result)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        if is_dark is not None:
+            where.append("is_dark = ?")
+            args.append(1 if is_dark else 0)
+        if since is not None:
+            where.append("captured_at >= ?")
+            args.append(float(since))
+        if until is not None:
+            where.append("captured_at < ?")
+            args.append(float(until))
+
+        sql = f"SELECT {', '.join(_META_COLUMNS)} FROM captures"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY captured_at " + ("DESC" if newest_first else "ASC")
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [self._row_to_dict(r) for r in rows]
+
+    def count(self, result=None):
+        """Return the number of stored captures, optionally for one result."""
+        with self._lock:
+            if result is None:
+                return self._conn.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM captures WHERE result = ?", (result,)
+            ).fetchone()[0]
+
+    def get_histogram(self, capture_id):
+        """Return the histogram bins of one capture, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT encoding, histogram FROM captures WHERE id = ?", (int(capture_id),)
+            ).fetchone()
+        if row is None:
+            return None
+        return decode_histogram(row["encoding"], row["histogram"])
+
+    def get_histograms(self, capture_ids):
+        """Return an (n, 1024) uint32 block for the given capture ids, in order."""
+        ids = [int(i) for i in capture_ids]
+        block = np.zeros((len(ids), HISTOGRAM_BINS), dtype=np.uint32)
+        if not ids:
+            return block
+        position = {cid: n for n, cid in enumerate(ids)}
+        with self._lock:
+            rows = []
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(ids), 900):
+                chunk = ids[start:start + 900]
+                rows += self._conn.execute(
+                    f"SELECT id, encoding, histogram FROM captures WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+        for row in rows:
+            bins = decode_histogram(row["encoding"], row["histogram"])[:HISTOGRAM_BINS]
+            block[position[row["id"]], :len(bins)] = bins
+        return block
+
+    def import_csv_directory(self, directory, recursive=True, classify=True,
+                             progress=None, should_stop=None):
+        """
+        Import loose capture CSVs written by MOTIONConnector._save_histogram_csv().
+
+        Files already imported (same path) are skipped, so this can be re-run on
+        a directory that keeps growing.
+
+        Args:
+            directory (str): Directory to scan
+            recursive (bool): Also scan subdirectories
+            classify (bool): Compute mean/std and the classifier verdict for each file
+            progress (callable): progress(done, total) after every batch of new files
+            should_stop (callable): Returns True to stop after the current batch
+
+        Returns:
+            int: Number of captures imported
+        """
+        with self._lock:
+            known = {r[0] for r in self._conn.execute(
+                "SELECT source_path FROM captures WHERE source_path IS NOT NULL")}
+
+        paths = [p for p in iter_capture_csvs(directory, recursive) if p not in known]
+        if progress is not None:
+            progress(0, len(paths))
+
+        rows = []
+        imported = 0
+        stopped = False
+        for done, path in enumerate(paths, 1):
+            row = self._csv_row(path, classify)
+            if row is not None:
+                rows.append(row)
+            # Commit in batches; progress and stop requests are handled between them
+            if done % IMPORT_BATCH == 0:
+                imported += self.add_captures(rows)
+                rows = []
+                if progress is not None:
+                    progress(done, len(paths))
+                if should_stop is not None and should_stop():
+                    logger.info(f"Histogram import from {directory} stopped after {done} of {len(paths)} files")
+                    stopped = True
+                    break
+        imported += self.add_captures(rows)
+        if progress is not None and not stopped:
+            progress(len(paths), len(paths))
+        logger.info(f"Imported {imported} histogram captures from {directory}")
+        return imported
+
+    @staticmethod
+    def _csv_row(path, classify):
+        """add_capture() keyword arguments for one capture CSV, or None if unreadable."""
+        m = _CSV_NAME_RE.match(os.path.basename(path))
+        try:
+            parsed = read_capture_csv(path)
+        except Exception as e:
+            logger.warning(f"Skipping {path}: {e}")
+            return None
+        if parsed is None:
+            return None
+        camera_index, bins, temperature = parsed
+        is_dark = bool(m and m.group("kind").lower() == "dark")
+
+        row = dict(
+            histogram_values=bins,
+            serial=(m.group("serial") if m else ""),
+            camera_index=camera_index,
+            is_dark=is_dark,
+            temperature=temperature,
+            source_path=path,
+            captured_at=os.path.getmtime(path),
+        )
+        if classify:
+            row["mean"], row["std"] = histogram_weighted_mean_std(bins)
+            if not is_dark:
+                row["result"], row["reasons"] = classify_histogram_with_reasons(bins, True)
+        return row
+
+    @staticmethod
+    def _insert_sql():
+        return (
+            "INSERT OR IGNORE INTO captures (captured_at, serial, sensor_side, camera_index, is_dark, "
+            "temperature, mean, std, result, reasons, app_version, sdk_version, firmware_version, "
+            "source_path, encoding, histogram) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+
+    @staticmethod
+    def _make_row(histogram_values, serial, sensor_side=None, camera_index=None, is_dark=False,
+                  temperature=None, mean=None, std=None, result=None, reasons=None,
+                  app_version=None, sdk_version=None, firmware_version=None,
+                  source_path=None, captured_at=None):
+        encoding, blob = encode_histogram(histogram_values)
+        return (
+            float(captured_at if captured_at is not None else time.time()),
+            serial or "",
+            sensor_side,
+            None if camera_index is None else int(camera_index),
+            1 if is_dark else 0,
+            None if temperature is None else float(temperature),
+            None if mean is None else float(mean),
+            None if std is None else float(std),
+            result,
+            json.dumps(list(reasons)) if reasons else None,
+            app_version,
+            sdk_version,
+            firmware_version,
+            source_path,
+            encoding,
+            sqlite3.Binary(blob),
+        )
+
+    @staticmethod
+    def _row_to_dict(row):
+        d = dict(row)
+        d["is_dark"] = bool(d["is_dark"])
+        d["reasons"] = json.loads(d["reasons"]) if d["reasons"] else []
+        return d
+
+
+def read_capture_csv(path):
+    """
+    Read one capture CSV (header: cam_id, frame_id, 0..1023, temperature, sum).
+
+    Returns:
+        tuple: (camera_index: int, bins: np.ndarray, temperature: float) or None if empty
+    """
+    with open(path, "r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        data = next(reader, None)
+    if not header or not data:
+        return None
+    camera_index = int(float(data[0]))
+    bins = np.asarray(data[2:2 + HISTOGRAM_BINS], dtype=float).astype(np.uint32)
+    temperature = float(data[2 + HISTOGRAM_BINS]) if len(data) > 2 + HISTOGRAM_BINS else None
+    return camera_index, bins, temperature
+
+
+def capture_csv_kind(path):
+    """(serial, "light"|"dark") from a capture CSV file name, or None if it does not match."""
+    m = _CSV_NAME_RE.match(os.path.basename(path))
+    return (m.group("serial"), m.group("kind").lower()) if m else None
+
+
+def iter_capture_csvs(directory, recursive=True):
+    """Absolute paths of the capture CSVs in directory."""
+    if recursive:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.lower().endswith(".csv") and "histogram" in name.lower():
+                    yield os.path.abspath(os.path.join(root, name))
+    else:
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.lower().endswith(".csv") and "histogram" in name.lower() and os.path.isfile(path):
+                yield os.path.abspath(path)
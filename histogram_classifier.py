@@ -8,13 +8,24 @@ This module contains functions to classify histograms based on multiple criteria
 - Secondary humps/shoulders
 """
 
+import logging
+
 import numpy as np
 
+logger = logging.getLogger("ow-testapp.classifier")
+
 # Thresholds for classification
 kurtosis_threshold = 1
 skewness_threshold = 0.2
 LOW_LIGHT_MEAN_THRESHOLD = 75  # Light histogram with mean below this is "Low Light" (do not save)
 
+# Peak and secondary-hump detection on the smoothed histogram
+SMOOTHING_WINDOW = 5
+PEAK_HEIGHT_FRACTION = 0.05        # of the smoothed maximum
+PEAK_MIN_DISTANCE = 50             # bins
+PEAK_PROMINENCE_FRACTION = 0.08    # of the smoothed maximum
+HUMP_THRESHOLD_FRACTION = 0.15     # of the smoothed maximum
+
 
 def find_peaks_simple(signal, height=None, distance=None, prominence=None):
     """
@@ -105,6 +116,82 @@ def histogram_weighted_mean(histogram_values):
     return float(np.sum(bins * histogram_values) / total)
 
 
+def histogram_weighted_mean_std(histogram_values, noisy_bin_min=100):
+    """
+    Compute the weighted mean and sample standard deviation of the bin index.
+
+    Applies the capture rules used for the UI readout: the last bin (index 1023)
+    is zeroed and bins with fewer than noisy_bin_min counts are ignored.
+
+    Args:
+        histogram_values (array): Histogram bin counts (length 1024)
+        noisy_bin_min (int): Bins below this count are treated as noise
+
+    Returns:
+        tuple: (mean: float, std: float), (0.0, 0.0) if empty or not 1024 bins
+    """
+    hist = np.asarray(histogram_values)
+    if hist.shape != (1024,):
+        return 0.0, 0.0
+    means, stds = block_weighted_mean_std(hist[np.newaxis, :], noisy_bin_min)
+    return float(means[0]), float(stds[0])
+
+
+def block_weighted_mean_std(histograms, noisy_bin_min=100):
+    """
+    Vectorized histogram_weighted_mean_std() over a block of histograms.
+
+    Args:
+        histograms (array): (n, 1024) bin counts
+        noisy_bin_min (int): Bins below this count are treated as noise
+
+    Returns:
+        tuple: (means: array (n,), stds: array (n,)), zeros for empty rows
+    """
+    hist = np.array(histograms, dtype=np.float64, ndmin=2)
+    hist[:, -1] = 0
+    hist[hist < noisy_bin_min] = 0
+    bins = np.arange(hist.shape[1], dtype=np.float64)
+    total = hist.sum(axis=1)
+    valid = total > 1
+    safe_total = np.where(valid, total, 2.0)
+    means = (hist @ bins) / safe_total
+    variance = ((hist @ (bins * bins)) - means * means * safe_total) / (safe_total - 1)
+    stds = np.sqrt(np.clip(variance, 0.0, None))
+    return np.where(valid, means, 0.0), np.where(valid, stds, 0.0)
+
+
+def block_moments(histograms):
+    """
+    Vectorized weighted moments of the bin index over a block of histograms.
+
+    Uses the same definitions as calculate_skewness() and calculate_kurtosis()
+    (population moments, kurtosis not excess), computed in one pass per block.
+
+    Args:
+        histograms (array): (n, bins) bin counts
+
+    Returns:
+        tuple: (mean, variance, skewness, kurtosis) arrays of shape (n,);
+               empty rows give (0, 0, 0, 3) like the scalar functions
+    """
+    hist = np.array(histograms, dtype=np.float64, ndmin=2)
+    bins = np.arange(hist.shape[1], dtype=np.float64)
+    total = hist.sum(axis=1)
+    safe_total = np.where(total > 0, total, 1.0)
+    mean = (hist @ bins) / safe_total
+    centered = bins[np.newaxis, :] - mean[:, np.newaxis]
+    c2 = centered * centered
+    variance = (hist * c2).sum(axis=1) / safe_total
+    m3 = (hist * c2 * centered).sum(axis=1) / safe_total
+    m4 = (hist * c2 * c2).sum(axis=1) / safe_total
+    has_spread = (total > 0) & (variance > 0)
+    safe_var = np.where(has_spread, variance, 1.0)
+    skewness = np.where(has_spread, m3 / safe_var ** 1.5, 0.0)
+    kurtosis = np.where(has_spread, m4 / (safe_var * safe_var), 3.0)
+    return np.where(total > 0, mean, 0.0), np.where(total > 0, variance, 0.0), skewness, kurtosis
+
+
 def calculate_skewness(histogram_values):
     """
     Calculate skewness of a distribution.
@@ -185,7 +272,7 @@ def detect_secondary_hump(histogram_values, max_position):
         tuple: (has_secondary_hump: bool, hump_position: int or None)
     """
     # Smooth the histogram
-    window_size = 5
+    window_size = SMOOTHING_WINDOW
     if len(histogram_values) > window_size:
         smoothed = np.convolve(histogram_values, np.ones(window_size)/window_size, mode='same')
     else:
@@ -203,8 +290,8 @@ def detect_secondary_hump(histogram_values, max_position):
     left_side = smoothed[:max_position]
     right_side = smoothed[max_position+1:]
     
-    # Threshold for significant elevation: at least 15% of max value
-    threshold = max_value * 0.15
+    # Threshold for significant elevation, relative to the max value
+    threshold = max_value * HUMP_THRESHOLD_FRACTION
     
     # Check left side for secondary hump
     if len(left_side) > 50:
@@ -261,7 +348,7 @@ def check_non_normal(histogram_values):
     reasons = []
     
     # Smooth the histogram slightly to reduce noise
-    window_size = 5
+    window_size = SMOOTHING_WINDOW
     if len(histogram_values) > window_size:
         smoothed = np.convolve(histogram_values, np.ones(window_size)/window_size, mode='same')
     else:
@@ -275,9 +362,9 @@ def check_non_normal(histogram_values):
     
     # 1. Check for multiple peaks (bimodal/multimodal)
     peaks, properties = find_peaks_simple(smoothed, 
-                                         height=max_value * 0.05,  # At least 5% of max
-                                         distance=50,              # At least 50 bins apart
-                                         prominence=max_value * 0.08)  # Lower prominence to catch more cases
+                                         height=max_value * PEAK_HEIGHT_FRACTION,
+                                         distance=PEAK_MIN_DISTANCE,
+                                         prominence=max_value * PEAK_PROMINENCE_FRACTION)
     
     num_peaks = len(peaks)
     peak_positions = peaks.tolist()
@@ -307,7 +394,7 @@ def check_non_normal(histogram_values):
     
     # Consider it non-normal if it fails any criterion
     is_non_normal = len(reasons) > 0
-    print(f"is_non_normal: {is_non_normal}, num_peaks: {num_peaks}, peak_positions: {peak_positions}, reasons: {reasons}, skewness: {skewness}, kurtosis: {kurtosis}")
+    logger.debug(f"is_non_normal: {is_non_normal}, num_peaks: {num_peaks}, peak_positions: {peak_positions}, reasons: {reasons}, skewness: {skewness}, kurtosis: {kurtosis}")
     return is_non_normal, num_peaks, peak_positions, reasons, skewness, kurtosis
 
 
@@ -327,14 +414,26 @@ def classify_histogram(histogram_values, is_light_histogram: bool):
     Returns:
         str: "PASS", "FAIL", or "LOW_LIGHT"
     """
-    if not is_light_histogram:
-        is_non_normal, _, _, _, _, _ = check_non_normal(histogram_values)
-        return "FAIL" if is_non_normal else "PASS"
+    result, _ = classify_histogram_with_reasons(histogram_values, is_light_histogram)
+    return result
 
-    mean = histogram_weighted_mean(histogram_values)
-    if mean < LOW_LIGHT_MEAN_THRESHOLD:
-        return "LOW_LIGHT"
 
-    is_non_normal, _, _, _, _, _ = check_non_normal(histogram_values)
-    return "FAIL" if is_non_normal else "PASS"
+def classify_histogram_with_reasons(histogram_values, is_light_histogram: bool):
+    """
+    Same as classify_histogram(), but also returns the reasons behind the verdict.
+
+    Args:
+        histogram_values (array): Histogram bin counts (e.g. length 1024)
+        is_light_histogram (bool): True if this is an illuminated (light) capture
+
+    Returns:
+        tuple: (result: str, reasons: list of str)
+    """
+    if is_light_histogram:
+        mean = histogram_weighted_mean(histogram_values)
+        if mean < LOW_LIGHT_MEAN_THRESHOLD:
+            return "LOW_LIGHT", [f"Low light (mean {mean:.1f})"]
+
+    is_non_normal, _, _, reasons, _, _ = check_non_normal(histogram_values)
+    return ("FAIL" if is_non_normal else "PASS"), reasons
 
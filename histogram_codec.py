@@ -0,0 +1,102 @@
+"""
+Lossless codec for blocks of histogram frames.
+
+A frame is 1024 uint32 bin counts. Neighbouring bins are strongly
+correlated and most bins outside the peak are zero or small, so a block of
+frames is encoded in four vectorized steps:
+
+1. delta along the bins of each frame (the first bin is kept as is),
+2. zigzag mapping of the signed deltas to unsigned integers,
+3. downcast to the narrowest unsigned integer type that holds them,
+4. byte-plane shuffle (all low bytes, then all next bytes, ...) and zlib.
+
+Steps 1-3 turn a smooth histogram into a run of small numbers; step 4
+groups the mostly-zero high bytes together before compression.
+
+Blob layout: struct "<4sHHB" (MAGIC, frames, bins, item size) followed by
+the zlib stream.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+MAGIC = b"HDZ1"
+DEFAULT_LEVEL = 6
+
+_HEADER = struct.Struct("<4sHHB")
+# Zigzagged deltas of uint32 counts need up to 33 bits, hence the uint64 fallback
+_WIDTHS = ((0xFF, np.uint8), (0xFFFF, np.uint16), (0xFFFFFFFF, np.uint32), (2 ** 64 - 1, np.uint64))
+
+
+def _zigzag(values):
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def _unzigzag(values):
+    values = values.astype(np.int64)
+    return (values >> 1) ^ -(values & 1)
+
+
+def encode_frames(frames, level=DEFAULT_LEVEL):
+    """
+    Encode a block of histogram frames.
+
+    Args:
+        frames (array): (n_frames, n_bins) or (n_bins,) non-negative counts
+                        that fit in uint32
+        level (int): zlib compression level
+
+    Returns:
+        bytes: Encoded blob
+    """
+    block = np.asarray(frames)
+    if block.ndim == 1:
+        block = block[np.newaxis, :]
+    block = block.astype(np.int64, copy=False)
+    if block.size and (block.min() < 0 or block.max() > 0xFFFFFFFF):
+        raise ValueError("Histogram counts must fit in uint32")
+
+    deltas = np.empty_like(block)
+    deltas[:, :1] = block[:, :1]
+    np.subtract(block[:, 1:], block[:, :-1], out=deltas[:, 1:])
+    coded = _zigzag(deltas)
+
+    peak = int(coded.max()) if coded.size else 0
+    dtype = next(t for limit, t in _WIDTHS if peak <= limit)
+    itemsize = np.dtype(dtype).itemsize
+    raw = coded.astype(np.dtype(dtype).newbyteorder("<"))
+    # Byte planes: (n_values, itemsize) -> (itemsize, n_values)
+    planes = raw.view(np.uint8).reshape(-1, itemsize).T.tobytes()
+
+    n_frames, n_bins = block.shape
+    return _HEADER.pack(MAGIC, n_frames, n_bins, itemsize) + zlib.compress(planes, level)
+
+
+def decode_frames(blob):
+    """
+    Decode a blob from encode_frames().
+
+    Returns:
+        np.ndarray: (n_frames, n_bins) uint32 frames
+    """
+    magic, n_frames, n_bins, itemsize = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not an encoded histogram block")
+    planes = np.frombuffer(zlib.decompress(blob[_HEADER.size:]), dtype=np.uint8)
+    if planes.size != n_frames * n_bins * itemsize:
+        raise ValueError("Encoded histogram block is truncated")
+    dtype = np.dtype(f"<u{itemsize}")
+    coded = np.ascontiguousarray(planes.reshape(itemsize, -1).T).view(dtype).reshape(n_frames, n_bins)
+    return np.cumsum(_unzigzag(coded), axis=1).astype(np.uint32)
+
+
+def encode_frame(frame, level=DEFAULT_LEVEL):
+    """Encode a single frame; see encode_frames()."""
+    return encode_frames(np.asarray(frame)[np.newaxis, :], level)
+
+
+def decode_frame(blob):
+    """Decode a single frame from encode_frame() as a (n_bins,) uint32 array."""
+    return decode_frames(blob)[0]
@@ -0,0 +1,479 @@
+"""
+Cached classifier features and vectorized threshold sweeps.
+
+check_non_normal() spends nearly all of its time on work that does not
+depend on the thresholds: smoothing, finding local maxima and their
+prominences, the moments and the secondary-hump search. Only the final
+comparisons use the thresholds. extract_features() does the expensive part
+once per capture and keeps what those comparisons need:
+
+- moments: mean (the low-light check), variance, skewness, kurtosis
+- the smoothed maximum and its position
+- every local maximum of the smoothed histogram at or above
+  MIN_PEAK_HEIGHT_FRACTION of the maximum, with its height and prominence
+  (stored flat, with per-capture offsets)
+- the secondary-hump candidate on each side: position, level and the
+  average level around it
+
+FeatureStore keeps these columns as .npy files in one directory, keyed by
+a hash of the bins, so a capture seen again (from the archive or a CSV) is
+never re-analysed. sweep() evaluates a grid of classifier settings over
+the stored features with array operations and reports the PASS/FAIL/
+LOW_LIGHT counts per setting. A sweep at the current settings gives the same
+verdicts as classify_histogram() for light captures.
+
+The smoothing window is fixed when the features are extracted. A store
+built with a different SMOOTHING_WINDOW is rebuilt.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+
+import numpy as np
+
+import histogram_classifier
+from histogram_classifier import block_moments
+
+logger = logging.getLogger("ow-testapp.features")
+
+FEATURE_VERSION = 1
+# Peak candidates below this fraction of the smoothed maximum are not kept,
+# so a sweep cannot use a lower PEAK_HEIGHT_FRACTION
+MIN_PEAK_HEIGHT_FRACTION = 0.01
+
+# Settings a sweep can vary, in grid order
+SWEEP_SETTINGS = (
+    "LOW_LIGHT_MEAN_THRESHOLD",
+    "kurtosis_threshold",
+    "skewness_threshold",
+    "PEAK_HEIGHT_FRACTION",
+    "PEAK_MIN_DISTANCE",
+    "PEAK_PROMINENCE_FRACTION",
+    "HUMP_THRESHOLD_FRACTION",
+)
+
+# Verdict codes returned by evaluate()
+PASS, FAIL, LOW_LIGHT = 0, 1, 2
+VERDICTS = ("PASS", "FAIL", "LOW_LIGHT")
+
+# One entry per capture
+CAPTURE_COLUMNS = {
+    "hash": (np.uint8, (16,)),
+    "mean": (np.float64, ()),
+    "variance": (np.float64, ()),
+    "skewness": (np.float64, ()),
+    "kurtosis": (np.float64, ()),
+    "smooth_max": (np.float64, ()),
+    "max_position": (np.int32, ()),
+    "hump_left_position": (np.int32, ()),
+    "hump_left_level": (np.float64, ()),
+    "hump_left_region": (np.float64, ()),
+    "hump_right_position": (np.int32, ()),
+    "hump_right_level": (np.float64, ()),
+    "hump_right_region": (np.float64, ()),
+    "peak_count": (np.int32, ()),
+}
+# One entry per peak candidate, grouped by capture in row order
+PEAK_COLUMNS = {
+    "peak_position": (np.int32, ()),
+    "peak_height": (np.float64, ()),
+    "peak_prominence": (np.float64, ()),
+}
+
+# Positions of different captures never mix in the (row, position) sort key
+_KEY_STRIDE = 4096
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def content_hash(histogram):
+    """16-byte hash of a capture's bins, independent of the input dtype."""
+    bins = np.ascontiguousarray(np.asarray(histogram), dtype="<u4")
+    return hashlib.blake2b(bins.tobytes(), digest_size=16).digest()
+
+
+def _smooth(histogram, window):
+    # Same arithmetic as check_non_normal() so comparisons come out identical
+    if len(histogram) > window:
+        return np.convolve(histogram, np.ones(window) / window, mode='same')
+    return np.asarray(histogram, dtype=np.float64)
+
+
+def _hump_side(values):
+    # detect_secondary_hump(): maximum of one half and the average around it
+    if len(values) == 0:
+        return -1, np.nan, np.nan
+    idx = int(np.argmax(values))
+    region = values[max(0, idx - 20):min(len(values), idx + 20)]
+    return idx, float(values[idx]), float(np.mean(region))
+
+
+def extract_features(histograms, smoothing_window=None, min_height_fraction=MIN_PEAK_HEIGHT_FRACTION):
+    """
+    Threshold-independent classifier features of a block of light captures.
+
+    Args:
+        histograms (array): (n, bins) bin counts
+        smoothing_window (int): Default histogram_classifier.SMOOTHING_WINDOW
+        min_height_fraction (float): Lowest peak height kept, as a fraction of the maximum
+
+    Returns:
+        dict: CAPTURE_COLUMNS and PEAK_COLUMNS arrays
+    """
+    window = histogram_classifier.SMOOTHING_WINDOW if smoothing_window is None else int(smoothing_window)
+    block = np.array(histograms, dtype=np.float64, ndmin=2)
+    n, width = block.shape
+    cols = {name: np.zeros((n,) + shape, dtype=dtype) for name, (dtype, shape) in CAPTURE_COLUMNS.items()}
+    cols["mean"], cols["variance"], cols["skewness"], cols["kurtosis"] = block_moments(block)
+    if n == 0:
+        cols.update({name: np.zeros(0, dtype=dtype) for name, (dtype, _) in PEAK_COLUMNS.items()})
+        return cols
+
+    smoothed = np.stack([_smooth(row, window) for row in block])
+    smooth_max = smoothed.max(axis=1)
+    max_position = smoothed.argmax(axis=1)
+
+    # Local maxima and find_peaks_simple()'s prominence: height above the
+    # higher of the minima to the left and to the right of the peak
+    inner = smoothed[:, 1:-1]
+    is_peak = (inner > smoothed[:, :-2]) & (inner > smoothed[:, 2:])
+    is_peak &= inner >= (smooth_max * min_height_fraction)[:, np.newaxis]
+    left_min = np.minimum.accumulate(smoothed, axis=1)[:, 1:-1]
+    right_min = np.minimum.accumulate(smoothed[:, ::-1], axis=1)[:, ::-1][:, 1:-1]
+    rows, cols_idx = np.nonzero(is_peak)
+    heights = inner[rows, cols_idx]
+    cols["peak_position"] = (cols_idx + 1).astype(np.int32)
+    cols["peak_height"] = heights
+    cols["peak_prominence"] = heights - np.maximum(left_min[rows, cols_idx], right_min[rows, cols_idx])
+    cols["peak_count"] = np.bincount(rows, minlength=n).astype(np.int32)
+
+    for i in range(n):
+        s, mp = smoothed[i], int(max_position[i])
+        left = right = (-1, np.nan, np.nan)
+        if mp > 50:
+            left = _hump_side(s[:mp // 2])
+        right_len = width - mp - 1
+        if right_len > 50:
+            idx, level, region = _hump_side(s[mp + 1 + right_len // 2:])
+            right = (mp + 1 + right_len // 2 + idx, level, region)
+        (cols["hump_left_position"][i], cols["hump_left_level"][i], cols["hump_left_region"][i]) = left
+        (cols["hump_right_position"][i], cols["hump_right_level"][i], cols["hump_right_region"][i]) = right
+        cols["hash"][i] = np.frombuffer(content_hash(block[i]), dtype=np.uint8)
+
+    cols["smooth_max"] = smooth_max
+    cols["max_position"] = max_position.astype(np.int32)
+    return cols
+
+
+def _concat(parts):
+    names = list(CAPTURE_COLUMNS) + list(PEAK_COLUMNS)
+    return {name: np.concatenate([p[name] for p in parts]) for name in names}
+
+
+class FeatureStore:
+    """Columnar feature cache in a directory, one .npy file per column."""
+
+    def __init__(self, directory, smoothing_window=None, min_height_fraction=MIN_PEAK_HEIGHT_FRACTION):
+        """
+        Args:
+            directory (str): Created if missing; an incompatible store in it is discarded
+            smoothing_window (int): Default histogram_classifier.SMOOTHING_WINDOW
+            min_height_fraction (float): Lowest peak height kept
+        """
+        self.directory = str(directory)
+        self.smoothing_window = (histogram_classifier.SMOOTHING_WINDOW if smoothing_window is None
+                                 else int(smoothing_window))
+        self.min_height_fraction = float(min_height_fraction)
+        self._cols = extract_features(np.zeros((0, 1024)), self.smoothing_window, self.min_height_fraction)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._index = {}
+        self._dirty = False
+        self._load()
+
+    def __len__(self):
+        return len(self._cols["mean"])
+
+    @property
+    def columns(self):
+        """Per-capture and per-peak columns (read-only views)."""
+        return {name: _readonly(values) for name, values in self._cols.items()}
+
+    @property
+    def peak_offsets(self):
+        """peak_offsets[i]:peak_offsets[i + 1] are the peak candidates of capture i."""
+        return _readonly(self._offsets)
+
+    def _meta(self):
+        return {"version": FEATURE_VERSION, "smoothing_window": self.smoothing_window,
+                "min_height_fraction": self.min_height_fraction}
+
+    def _load(self):
+        meta_path = os.path.join(self.directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            count = meta.pop("count")
+            if meta != self._meta():
+                logger.info(f"Feature store {self.directory} was built with {meta}; rebuilding")
+                return
+            cols = {name: np.load(os.path.join(self.directory, f"{name}.npy"))
+                    for name in list(CAPTURE_COLUMNS) + list(PEAK_COLUMNS)}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load feature store {self.directory}: {e}")
+            return
+        if len(cols["mean"]) != count or int(cols["peak_count"].sum()) != len(cols["peak_position"]):
+            logger.warning(f"Feature store {self.directory} is inconsistent; rebuilding")
+            return
+        self._cols = cols
+        self._reindex()
+
+    def _reindex(self):
+        self._offsets = np.concatenate(([0], np.cumsum(self._cols["peak_count"], dtype=np.int64)))
+        self._index = {h.tobytes(): i for i, h in enumerate(self._cols["hash"])}
+
+    def save(self):
+        """Write the columns if anything was added since the last save."""
+        if not self._dirty:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        meta_path = os.path.join(self.directory, "meta.json")
+        if os.path.exists(meta_path):
+            # Columns and meta would disagree if the write is interrupted
+            os.remove(meta_path)
+        for name, values in self._cols.items():
+            tmp = os.path.join(self.directory, f"{name}.tmp.npy")
+            np.save(tmp, values)
+            os.replace(tmp, os.path.join(self.directory, f"{name}.npy"))
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(dict(self._meta(), count=len(self)), f)
+        self._dirty = False
+
+    def add(self, histograms, batch=4096):
+        """
+        Extract features for captures not yet in the store.
+
+        Args:
+            histograms (array): (n, bins) bin counts
+            batch (int): Captures analysed per block
+
+        Returns:
+            np.ndarray: Store row of each input capture
+        """
+        block = np.array(histograms, ndmin=2)
+        hashes = [content_hash(row) for row in block]
+        pending = {}
+        for i, h in enumerate(hashes):
+            if h not in self._index and h not in pending:
+                pending[h] = i
+        if pending:
+            todo = list(pending.values())
+            parts = [self._cols]
+            for start in range(0, len(todo), batch):
+                parts.append(extract_features(block[todo[start:start + batch]],
+                                              self.smoothing_window, self.min_height_fraction))
+            self._cols = _concat(parts)
+            self._reindex()
+            self._dirty = True
+        return np.array([self._index[h] for h in hashes], dtype=np.int64)
+
+    def rows(self, hashes):
+        """Store rows of the given content hashes; -1 where unknown."""
+        return np.array([self._index.get(bytes(h), -1) for h in hashes], dtype=np.int64)
+
+    def select(self, rows=None):
+        """Features of a subset of captures, in the given order (all if None)."""
+        if rows is None:
+            return self.columns
+        rows = np.asarray(rows, dtype=np.int64)
+        out = {name: self._cols[name][rows] for name in CAPTURE_COLUMNS}
+        starts, counts = self._offsets[rows], self._cols["peak_count"][rows]
+        peak_idx = (np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+                    + np.arange(int(counts.sum())))
+        out.update({name: self._cols[name][peak_idx] for name in PEAK_COLUMNS})
+        return out
+
+
+def _readonly(values):
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+def _columns(features):
+    return features.select() if isinstance(features, FeatureStore) else features
+
+
+def _settings(overrides=None):
+    settings = {name: getattr(histogram_classifier, name) for name in SWEEP_SETTINGS}
+    unknown = set(overrides or ()) - set(settings)
+    if unknown:
+        raise ValueError(f"Not a sweepable classifier setting: {', '.join(sorted(unknown))}")
+    settings.update(overrides or {})
+    return settings
+
+
+class _Components:
+    """Per-criterion failure masks, each computed once per distinct setting."""
+
+    def __init__(self, cols, min_height_fraction):
+        self.cols = cols
+        self.n = len(cols["mean"])
+        self.min_height_fraction = min_height_fraction
+        self.empty = cols["smooth_max"] == 0
+        self.peak_row = np.repeat(np.arange(self.n), cols["peak_count"])
+        self._cache = {}
+
+    def _memo(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def low_light(self, threshold):
+        return self._memo(("low", threshold), lambda: self.cols["mean"] < threshold)
+
+    def skewness(self, threshold):
+        return self._memo(("skew", threshold), lambda: np.abs(self.cols["skewness"]) > threshold)
+
+    def kurtosis(self, threshold):
+        return self._memo(("kurt", threshold), lambda: np.abs(self.cols["kurtosis"] - 3.0) > threshold)
+
+    def hump(self, fraction):
+        def compute():
+            threshold = self.cols["smooth_max"] * fraction
+            fires = np.zeros(self.n, dtype=bool)
+            for side in ("left", "right"):
+                fires |= ((self.cols[f"hump_{side}_level"] >= threshold)
+                          & (self.cols[f"hump_{side}_region"] >= threshold * 0.7))
+            return fires & ~self.empty
+        return self._memo(("hump", fraction), compute)
+
+    def multiple_peaks(self, height, distance, prominence):
+        key = ("peaks", height, distance, prominence)
+        if key not in self._cache:
+            self.prepare_peaks([height], [distance], [prominence])
+        return self._cache[key]
+
+    def prepare_peaks(self, heights, distances, prominences):
+        """Compute all peak masks of a grid, one walk per (height, distance)."""
+        prominences = list(dict.fromkeys(prominences))
+        for h, d in itertools.product(heights, distances):
+            for p, mask in zip(prominences, self._chain(h, d, prominences)):
+                self._cache[("peaks", h, d, p)] = mask
+
+    def _chain(self, height, distance, prominences):
+        # find_peaks_simple(): keep candidates at or above the height, then
+        # walk them left to right keeping those at least `distance` bins
+        # after the last kept one, then count the kept ones that are
+        # prominent enough. The walk advances every capture at once.
+        if height < self.min_height_fraction:
+            raise ValueError(f"PEAK_HEIGHT_FRACTION {height} is below the stored minimum "
+                             f"{self.min_height_fraction}")
+        cols, smooth_max = self.cols, self.cols["smooth_max"]
+        keep = cols["peak_height"] >= smooth_max[self.peak_row] * height
+        cand_row = self.peak_row[keep]
+        cand_pos = cols["peak_position"][keep].astype(np.int64)
+        cand_prom = cols["peak_prominence"][keep]
+        key = cand_row * _KEY_STRIDE + cand_pos
+        step = max(int(math.ceil(distance)), 1)
+
+        counts = np.zeros((len(prominences), self.n), dtype=np.int32)
+        rows = np.arange(self.n)
+        idx = np.searchsorted(key, rows * _KEY_STRIDE)
+        while rows.size:
+            found = idx < key.size
+            found[found] = cand_row[idx[found]] == rows[found]
+            rows, idx = rows[found], idx[found]
+            if not rows.size:
+                break
+            prom = cand_prom[idx]
+            for i, p in enumerate(prominences):
+                counts[i, rows] += prom >= smooth_max[rows] * p
+            idx = np.searchsorted(key, rows * _KEY_STRIDE + cand_pos[idx] + step)
+        return [(c >= 2) & ~self.empty for c in counts]
+
+
+def evaluate(features, settings=None, min_height_fraction=MIN_PEAK_HEIGHT_FRACTION):
+    """
+    Verdicts for stored captures at one setting.
+
+    Args:
+        features (FeatureStore | dict): Store or columns from select()/extract_features()
+        settings (dict): Classifier settings to override (SWEEP_SETTINGS names)
+
+    Returns:
+        np.ndarray: PASS, FAIL or LOW_LIGHT code per capture
+    """
+    if isinstance(features, FeatureStore):
+        min_height_fraction = features.min_height_fraction
+    s = _settings(settings)
+    comp = _Components(_columns(features), min_height_fraction)
+    fail = (comp.multiple_peaks(s["PEAK_HEIGHT_FRACTION"], s["PEAK_MIN_DISTANCE"], s["PEAK_PROMINENCE_FRACTION"])
+            | comp.skewness(s["skewness_threshold"]) | comp.kurtosis(s["kurtosis_threshold"])
+            | comp.hump(s["HUMP_THRESHOLD_FRACTION"]))
+    verdicts = np.where(fail, FAIL, PASS)
+    verdicts[comp.low_light(s["LOW_LIGHT_MEAN_THRESHOLD"])] = LOW_LIGHT
+    return verdicts
+
+
+def sweep(features, grid, min_height_fraction=MIN_PEAK_HEIGHT_FRACTION):
+    """
+    PASS/FAIL/LOW_LIGHT counts for every combination of classifier settings.
+
+    Args:
+        features (FeatureStore | dict): Store or columns from select()/extract_features()
+        grid (dict): Setting name -> list of values; settings not in the grid
+                     keep their current histogram_classifier value
+
+    Returns:
+        list: One dict per combination (SWEEP_SETTINGS order, last setting
+              varying fastest) with the settings, captures, PASS, FAIL,
+              LOW_LIGHT, fail_rate (FAIL / (PASS + FAIL)), low_light_rate and
+              the number of FAILs triggered by each criterion
+    """
+    if isinstance(features, FeatureStore):
+        min_height_fraction = features.min_height_fraction
+    base = _settings({name: values[0] for name, values in grid.items() if len(values)})
+    axes = [list(dict.fromkeys(grid.get(name, [base[name]]))) for name in SWEEP_SETTINGS]
+    comp = _Components(_columns(features), min_height_fraction)
+    n = comp.n
+    comp.prepare_peaks(axes[3], axes[4], axes[5])
+
+    # Bit-packed masks: every combination is a few byte-wise ops and a popcount
+    packed = {}
+
+    def bits(kind, *key):
+        if (kind, key) not in packed:
+            packed[(kind, key)] = np.packbits(getattr(comp, kind)(*key))
+        return packed[(kind, key)]
+
+    def popcount(mask):
+        return int(_POPCOUNT[mask].sum())
+
+    results = []
+    for combo in itertools.product(*axes):
+        s = dict(zip(SWEEP_SETTINGS, combo))
+        not_low = ~bits("low_light", s["LOW_LIGHT_MEAN_THRESHOLD"])
+        reasons = {
+            "multiple_peaks": bits("multiple_peaks", s["PEAK_HEIGHT_FRACTION"], s["PEAK_MIN_DISTANCE"],
+                                   s["PEAK_PROMINENCE_FRACTION"]),
+            "skewness": bits("skewness", s["skewness_threshold"]),
+            "kurtosis": bits("kurtosis", s["kurtosis_threshold"]),
+            "hump": bits("hump", s["HUMP_THRESHOLD_FRACTION"]),
+        }
+        fail = (reasons["multiple_peaks"] | reasons["skewness"] | reasons["kurtosis"] | reasons["hump"]) & not_low
+        # packbits pads the last byte with zeros, which ~ turns into ones
+        low = n - popcount(not_low) + (-n % 8)
+        failed = popcount(fail)
+        passed = n - low - failed
+        row = dict(s, captures=n, PASS=passed, FAIL=failed, LOW_LIGHT=low,
+                   fail_rate=failed / (passed + failed) if passed + failed else 0.0,
+                   low_light_rate=low / n if n else 0.0)
+        for name, mask in reasons.items():
+            row[f"fail_{name}"] = popcount(mask & not_low)
+        results.append(row)
+    return results
@@ -0,0 +1,154 @@
+"""
+Streaming per-bin statistics across histogram frames.
+
+BinStatistics keeps, for every camera and every bin, a running mean and
+variance (Welford) plus an exponentially weighted mean and variance. Updates
+are vectorized over all cameras in a frame block, and memory is fixed at
+O(cameras x bins) no matter how many frames are accumulated.
+"""
+
+import threading
+
+import numpy as np
+
+HISTOGRAM_BINS = 1024
+CAMERAS_PER_SENSOR = 8
+SENSOR_SIDES = ("left", "right")
+N_CAMERAS = CAMERAS_PER_SENSOR * len(SENSOR_SIDES)
+
+
+def camera_slot(sensor_side, camera_index):
+    """Map ("left"|"right", 0-7) to a flat camera slot 0-15."""
+    return SENSOR_SIDES.index(sensor_side) * CAMERAS_PER_SENSOR + int(camera_index)
+
+
+def slot_camera(slot):
+    """Inverse of camera_slot(): return (sensor_side, camera_index)."""
+    return SENSOR_SIDES[slot // CAMERAS_PER_SENSOR], slot % CAMERAS_PER_SENSOR
+
+
+class BinStatistics:
+    """Per-camera, per-bin running mean/variance with an EWMA variant."""
+
+    def __init__(self, n_cameras=N_CAMERAS, n_bins=HISTOGRAM_BINS, ewma_alpha=0.05):
+        self.n_cameras = int(n_cameras)
+        self.n_bins = int(n_bins)
+        self.ewma_alpha = float(ewma_alpha)
+        self._lock = threading.Lock()
+        shape = (self.n_cameras, self.n_bins)
+        self._count = np.zeros(self.n_cameras, dtype=np.int64)
+        self._mean = np.zeros(shape, dtype=np.float64)
+        self._m2 = np.zeros(shape, dtype=np.float64)
+        self._ewma_mean = np.zeros(shape, dtype=np.float64)
+        self._ewma_var = np.zeros(shape, dtype=np.float64)
+
+    def update(self, slots, frames):
+        """
+        Add one frame per listed camera.
+
+        Args:
+            slots (array): (k,) camera slots, see camera_slot()
+            frames (array): (k, n_bins) histogram frames
+        """
+        slots = np.asarray(slots, dtype=np.intp).reshape(-1)
+        frames = np.asarray(frames, dtype=np.float64).reshape(len(slots), -1)[:, :self.n_bins]
+        if len(slots) == 0:
+            return
+
+        # Fancy-index updates need unique slots; split repeated cameras into rounds
+        unique, first = np.unique(slots, return_index=True)
+        if len(unique) != len(slots):
+            rest = np.ones(len(slots), dtype=bool)
+            rest[first] = False
+            self.update(slots[first], frames[first])
+            self.update(slots[rest], frames[rest])
+            return
+
+        with self._lock:
+            n = self._count[slots] + 1
+            mean = self._mean[slots]
+            delta = frames - mean
+            mean += delta / n[:, np.newaxis]
+            self._m2[slots] += delta * (frames - mean)
+            self._mean[slots] = mean
+            self._count[slots] = n
+
+            # EWMA: first frame seeds the mean, later frames use the incremental form
+            alpha = self.ewma_alpha
+            first_frame = n == 1
+            ew_mean = np.where(first_frame[:, np.newaxis], frames, self._ewma_mean[slots])
+            ew_var = np.where(first_frame[:, np.newaxis], 0.0, self._ewma_var[slots])
+            diff = frames - ew_mean
+            incr = alpha * diff
+            self._ewma_mean[slots] = ew_mean + incr
+            self._ewma_var[slots] = (1.0 - alpha) * (ew_var + diff * incr)
+
+    def reset(self, slots=None):
+        """Clear all cameras, or only the given slots."""
+        with self._lock:
+            index = slice(None) if slots is None else np.asarray(slots, dtype=np.intp)
+            self._count[index] = 0
+            for arr in (self._mean, self._m2, self._ewma_mean, self._ewma_var):
+                arr[index] = 0.0
+
+    def counts(self):
+        with self._lock:
+            return self._count.copy()
+
+    def snapshot(self, slots=None):
+        """
+        Copy the current statistics.
+
+        Args:
+            slots (array): Camera slots to include (default: all)
+
+        Returns:
+            dict: count (k,), mean/std/ewma_mean/ewma_std (k, n_bins) arrays;
+                  std is the sample standard deviation (0 until two frames)
+        """
+        with self._lock:
+            index = slice(None) if slots is None else np.asarray(slots, dtype=np.intp)
+            count = self._count[index].copy()
+            mean = self._mean[index].copy()
+            m2 = self._m2[index].copy()
+            ewma_mean = self._ewma_mean[index].copy()
+            ewma_var = self._ewma_var[index].copy()
+        dof = np.maximum(count - 1, 1)[..., np.newaxis]
+        std = np.where((count > 1)[..., np.newaxis], np.sqrt(m2 / dof), 0.0)
+        return {
+            "count": count,
+            "mean": mean,
+            "std": std,
+            "ewma_mean": ewma_mean,
+            "ewma_std": np.sqrt(ewma_var),
+        }
+
+    def summary(self):
+        """
+        One QML-friendly dict per camera that has frames.
+
+        frameNoise is the count-weighted average of the per-bin standard
+        deviation, i.e. the typical frame-to-frame fluctuation of a bin.
+        """
+        snap = self.snapshot()
+        out = []
+        for slot in np.flatnonzero(snap["count"]):
+            side, camera_index = slot_camera(int(slot))
+            mean = snap["mean"][slot]
+            weight = mean.sum()
+            noise = float((snap["std"][slot] * mean).sum() / weight) if weight > 0 else 0.0
+            out.append({
+                "side": side,
+                "camera": camera_index,
+                "frames": int(snap["count"][slot]),
+                "meanCounts": float(weight),
+                "frameNoise": noise,
+                "maxBinStd": float(snap["std"][slot].max()),
+            })
+        return out
+
+    def export(self, path):
+        """Write the snapshot to a compressed .npz file."""
+        snap = self.snapshot()
+        np.savez_compressed(path, ewma_alpha=self.ewma_alpha, **snap)
+        return path
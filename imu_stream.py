@@ -0,0 +1,286 @@
+"""
+Continuous IMU sampling per sensor side.
+
+ImuSampler reads accelerometer and gyroscope at a fixed rate (temperature
+at a lower one) on a worker thread and appends every sample to an ImuRing:
+a fixed-size NumPy ring of (timestamp, ax, ay, az, gx, gy, gz, temp) rows.
+The UI gets decimated updates (the mean of the samples since the last
+update) at a much lower rate, so QML never talks to the bus itself.
+
+Timestamps are wall-clock (time.time(), midpoint of the read) like the
+histogram frame timestamps, so ImuRing.align() can resample the IMU at the
+frame times for motion-artifact analysis.
+"""
+
+import csv
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_RATE_HZ = 100.0
+DEFAULT_UI_RATE_HZ = 10.0
+DEFAULT_TEMP_PERIOD_S = 1.0
+# Ten minutes at the default rate
+DEFAULT_CAPACITY = 60000
+# Aligned values further than this from the nearest IMU sample are NaN
+DEFAULT_MAX_GAP_S = 0.1
+
+FIELDS = ("ax", "ay", "az", "gx", "gy", "gz", "temp")
+
+
+class ImuRing:
+    """Fixed-capacity ring of IMU samples in time order."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = int(capacity)
+        self._lock = threading.Lock()
+        self._t = np.zeros(self.capacity, dtype=np.float64)
+        self._data = np.zeros((self.capacity, len(FIELDS)), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp, accel, gyro, temp):
+        """Add one sample; temp may be NaN when it was not read."""
+        with self._lock:
+            pos = self._head
+            self._t[pos] = timestamp
+            self._data[pos, 0:3] = accel[:3]
+            self._data[pos, 3:6] = gyro[:3]
+            self._data[pos, 6] = temp
+            self._head = (pos + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._size = 0
+
+    def samples(self, since=None, until=None):
+        """
+        Samples in time order, optionally limited to [since, until).
+
+        Returns:
+            tuple: (t: array (n,), data: array (n, len(FIELDS)))
+        """
+        with self._lock:
+            order = np.arange(self._head - self._size, self._head) % self.capacity
+            t, data = self._t[order], self._data[order]
+        lo = 0 if since is None else int(np.searchsorted(t, since))
+        hi = len(t) if until is None else int(np.searchsorted(t, until))
+        return t[lo:hi], data[lo:hi]
+
+    def latest(self):
+        """Most recent sample as a dict, or None if the ring is empty."""
+        with self._lock:
+            if not self._size:
+                return None
+            pos = (self._head - 1) % self.capacity
+            row = dict(zip(FIELDS, self._data[pos].tolist()))
+            row["t"] = float(self._t[pos])
+        return row
+
+    def decimated(self, max_points=500, since=None):
+        """
+        Reduce the ring to at most max_points buckets for plotting.
+
+        Returns:
+            dict: t (bucket start times) and, per field, {min, max, mean} lists
+        """
+        t, data = self.samples(since)
+        n = len(t)
+        if n <= max_points:
+            columns = {f: {"min": data[:, i].tolist(), "max": data[:, i].tolist(), "mean": data[:, i].tolist()}
+                       for i, f in enumerate(FIELDS)}
+            return dict(columns, t=t.tolist())
+        edges = np.linspace(0, n, int(max_points) + 1).astype(np.intp)[:-1]
+        counts = np.diff(np.append(edges, n))[:, np.newaxis]
+        lo, hi = np.minimum.reduceat(data, edges), np.maximum.reduceat(data, edges)
+        mean = np.add.reduceat(data, edges) / counts
+        out = {f: {"min": lo[:, i].tolist(), "max": hi[:, i].tolist(), "mean": mean[:, i].tolist()}
+               for i, f in enumerate(FIELDS)}
+        out["t"] = t[edges].tolist()
+        return out
+
+    def align(self, timestamps, max_gap=DEFAULT_MAX_GAP_S):
+        """
+        IMU values linearly interpolated at the given times.
+
+        Temperature is only read now and then; it is interpolated between the
+        samples that have it and is not subject to max_gap.
+
+        Args:
+            timestamps (array): Frame times (time.time() seconds)
+            max_gap (float): Times further than this from an IMU sample give NaN
+
+        Returns:
+            tuple: (values: array (n, len(FIELDS)), gap: array (n,) seconds to
+                   the nearest IMU sample, inf if the ring is empty)
+        """
+        ts = np.asarray(timestamps, dtype=np.float64)
+        t, data = self.samples()
+        values = np.full((len(ts), len(FIELDS)), np.nan)
+        if not len(t):
+            return values, np.full(len(ts), np.inf)
+        right = np.clip(np.searchsorted(t, ts), 0, len(t) - 1)
+        left = np.clip(right - 1, 0, len(t) - 1)
+        gap = np.minimum(np.abs(ts - t[left]), np.abs(ts - t[right]))
+        inside = (ts >= t[0]) & (ts <= t[-1]) & (gap <= max_gap)
+        for i in range(len(FIELDS) - 1):
+            values[inside, i] = np.interp(ts[inside], t, data[:, i])
+        has_temp = ~np.isnan(data[:, -1])
+        if has_temp.any():
+            tt = t[has_temp]
+            in_temp = (ts >= tt[0]) & (ts <= tt[-1])
+            values[in_temp, -1] = np.interp(ts[in_temp], tt, data[has_temp, -1])
+        return values, gap
+
+
+class ImuSampler:
+    """Fixed-rate read loop feeding an ImuRing and a decimated update callback."""
+
+    def __init__(self, read, ring, rate_hz=DEFAULT_RATE_HZ, ui_rate_hz=DEFAULT_UI_RATE_HZ,
+                 temp_period_s=DEFAULT_TEMP_PERIOD_S, on_update=None):
+        """
+        Args:
+            read (callable): read(with_temp) -> (accel, gyro, temp or None), or
+                             None to skip this sample (e.g. the bus is busy)
+            ring (ImuRing): Receives every sample
+            rate_hz (float): Sample rate
+            ui_rate_hz (float): Rate of on_update calls
+            temp_period_s (float): Temperature is read at most this often
+            on_update (callable): on_update(dict) with the mean of the samples
+                                  since the last update
+        """
+        self.read = read
+        self.ring = ring
+        self.period = 1.0 / max(float(rate_hz), 0.1)
+        self.ui_period = 1.0 / max(float(ui_rate_hz), 0.1)
+        self.temp_period = float(temp_period_s)
+        self.on_update = on_update
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {"samples": 0, "skipped": 0, "errors": 0, "late": 0}
+        self.started_at = None
+        self.last_error = None
+
+    @property
+    def rate_hz(self):
+        return 1.0 / self.period
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        with self._stats_lock:
+            out = dict(self._stats)
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        out.update(rateHz=self.rate_hz, achievedHz=out["samples"] / elapsed if elapsed > 0 else 0.0,
+                   lastError=self.last_error)
+        return out
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def run(self):
+        """Sample until stop() is called."""
+        self.started_at = time.monotonic()
+        next_due = self.started_at
+        next_ui = self.started_at + self.ui_period
+        next_temp = self.started_at
+        last_ui = self.started_at
+        temp = float("nan")
+        pending = []
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now < next_due:
+                self._stop.wait(next_due - now)
+                continue
+            # Missed slots are dropped rather than read back to back
+            missed = int((now - next_due) / self.period)
+            if missed:
+                with self._stats_lock:
+                    self._stats["late"] += missed
+            next_due += (missed + 1) * self.period
+
+            with_temp = now >= next_temp
+            t0 = time.time()
+            try:
+                sample = self.read(with_temp)
+            except Exception as e:
+                self.last_error = str(e)
+                self._count("errors")
+                # Do not spin on a failing bus
+                self._stop.wait(max(self.period, 0.5))
+                next_due = time.monotonic()
+                continue
+            if sample is None:
+                self._count("skipped")
+                continue
+            timestamp = (t0 + time.time()) / 2
+            accel, gyro, new_temp = sample
+            if with_temp and new_temp is not None:
+                temp = float(new_temp)
+                next_temp = now + self.temp_period
+            self.ring.append(timestamp, accel, gyro, temp)
+            self._count("samples")
+            pending.append((timestamp, accel[:3], gyro[:3]))
+
+            if self.on_update is not None and now >= next_ui and pending:
+                elapsed, last_ui = now - last_ui, now
+                next_ui = now + self.ui_period
+                self.on_update({
+                    "t": pending[-1][0],
+                    "accel": np.mean([p[1] for p in pending], axis=0).tolist(),
+                    "gyro": np.mean([p[2] for p in pending], axis=0).tolist(),
+                    "temp": temp,
+                    "samples": len(pending),
+                    "rateHz": len(pending) / elapsed if elapsed > 0 else 0.0,
+                })
+                pending = []
+
+
+def write_samples_csv(path, t, data):
+    """Write raw IMU samples (t, FIELDS...) to a CSV file."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["t"] + list(FIELDS))
+        for ts, row in zip(t, data):
+            writer.writerow([f"{ts:.6f}"] + ["" if v != v else f"{v:g}" for v in row])
+
+
+def write_aligned_csv(path, ring, frames, max_gap=DEFAULT_MAX_GAP_S):
+    """
+    Write histogram frame statistics with the IMU values at each frame time.
+
+    Args:
+        path (str): Output CSV
+        ring (ImuRing): IMU samples of the same sensor side
+        frames (dict): camera label -> {"t": frame times, <column>: values, ...};
+                       every camera must have the same columns
+        max_gap (float): See ImuRing.align()
+
+    Returns:
+        int: Number of frame rows written
+    """
+    columns = []
+    for series in frames.values():
+        columns = [c for c in series if c != "t"]
+        break
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["t", "camera"] + columns + list(FIELDS) + ["imu_gap_s"])
+        for camera, series in frames.items():
+            values, gap = ring.align(series["t"], max_gap)
+            for i, ts in enumerate(series["t"]):
+                writer.writerow([f"{ts:.6f}", camera]
+                                + [f"{series[c][i]:g}" for c in columns]
+                                + ["" if v != v else f"{v:g}" for v in values[i]]
+                                + [f"{gap[i]:.4f}"])
+                rows += 1
+    return rows
@@ -0,0 +1,198 @@
+"""
+Drop-in instrumented replacement for QMutex / QRecursiveMutex.
+
+InstrumentedMutex keeps the lock() / unlock() / tryLock() API (and works as
+a context manager) and records, per call site:
+
+- acquisitions and how many of them had to wait (contended)
+- wait time and hold time histograms
+- the longest hold, and holds beyond the lock's warning threshold
+
+A call site is "caller > function:line" of the code that took the lock, so
+acquisitions made through small helpers stay distinguishable. Hold time is
+measured from the outermost acquisition to the matching unlock and charged
+to that outermost site; nested re-entry of a recursive mutex costs nothing.
+
+Every mutex registers itself so all_lock_stats() can export the whole set.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
+
+from PyQt6.QtCore import QMutex, QRecursiveMutex
+
+from diagnostics import LatencyHistogram, current_thread_name
+
+logger = logging.getLogger("ow-testapp.locks")
+
+DEFAULT_HOLD_WARN_S = 0.5
+
+_registry = weakref.WeakValueDictionary()
+
+
+def _call_site(depth):
+    """Label of the frame `depth` levels above the caller, with its own caller."""
+    frame = sys._getframe(depth + 1)
+    parent = frame.f_back
+    inner = f"{frame.f_code.co_name}:{frame.f_lineno}"
+    return f"{parent.f_code.co_name} > {inner}" if parent is not None else inner
+
+
+class _SiteStats:
+    __slots__ = ("acquisitions", "contended", "wait", "hold", "max_hold_s", "long_holds")
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait = LatencyHistogram()
+        self.hold = LatencyHistogram()
+        self.max_hold_s = 0.0
+        self.long_holds = 0
+
+    def to_dict(self):
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "wait": self.wait.to_dict(),
+            "hold": self.hold.to_dict(),
+            "maxHoldMs": self.max_hold_s * 1000.0,
+            "longHolds": self.long_holds,
+        }
+
+
+class InstrumentedMutex:
+    """QMutex / QRecursiveMutex with per-call-site wait and hold statistics."""
+
+    def __init__(self, name, recursive=False, hold_warn_s=DEFAULT_HOLD_WARN_S):
+        """
+        Args:
+            name (str): Name used in statistics and warnings
+            recursive (bool): Wrap a QRecursiveMutex instead of a QMutex
+            hold_warn_s (float): Holds longer than this are logged and counted
+        """
+        self.name = name
+        self.recursive = recursive
+        self.hold_warn_s = float(hold_warn_s)
+        self._mutex = QRecursiveMutex() if recursive else QMutex()
+        self._sites = {}
+        self._sites_lock = threading.Lock()
+        # Owner state is only written by the thread holding the mutex
+        self._owner_ident = None
+        self._owner = None          # (thread name, call site, acquired_at)
+        self._depth = 0
+        self.max_holder = None      # (call site, thread name, hold seconds)
+        _registry[id(self)] = self
+
+    def _site(self, label):
+        stats = self._sites.get(label)
+        if stats is None:
+            with self._sites_lock:
+                stats = self._sites.setdefault(label, _SiteStats())
+        return stats
+
+    def lock(self):
+        site = _call_site(1)
+        start = time.perf_counter()
+        contended = not self._mutex.tryLock()
+        if contended:
+            self._mutex.lock()
+        self._acquired(site, start, contended)
+
+    def tryLock(self, timeout=0):
+        site = _call_site(1)
+        start = time.perf_counter()
+        if not self._mutex.tryLock(timeout):
+            self._site(site).contended += 1
+            return False
+        self._acquired(site, start, False)
+        return True
+
+    def _acquired(self, site, start, contended):
+        now = time.perf_counter()
+        if self._depth == 0:
+            stats = self._site(site)
+            stats.acquisitions += 1
+            stats.contended += contended
+            stats.wait.record(now - start)
+            self._owner_ident = threading.get_ident()
+            self._owner = (current_thread_name(), site, now)
+        self._depth += 1
+
+    def unlock(self):
+        self._depth -= 1
+        if self._depth == 0:
+            thread_name, site, acquired_at = self._owner
+            hold = time.perf_counter() - acquired_at
+            stats = self._site(site)
+            stats.hold.record(hold)
+            if hold > stats.max_hold_s:
+                stats.max_hold_s = hold
+            if self.max_holder is None or hold > self.max_holder[2]:
+                self.max_holder = (site, thread_name, hold)
+            if hold > self.hold_warn_s:
+                stats.long_holds += 1
+                logger.warning(f"Lock '{self.name}' held {hold * 1000:.0f} ms by {site} ({thread_name})")
+            self._owner_ident = None
+            self._owner = None
+        self._mutex.unlock()
+
+    def __enter__(self):
+        site = _call_site(1)
+        start = time.perf_counter()
+        contended = not self._mutex.tryLock()
+        if contended:
+            self._mutex.lock()
+        self._acquired(site, start, contended)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.unlock()
+        return False
+
+    def owner(self):
+        """Current holder as a dict, or None if the mutex is free."""
+        owner = self._owner
+        if owner is None:
+            return None
+        thread_name, site, acquired_at = owner
+        return {"thread": thread_name, "site": site, "heldForMs": (time.perf_counter() - acquired_at) * 1000.0}
+
+    def stats(self):
+        with self._sites_lock:
+            sites = dict(self._sites)
+        max_holder = self.max_holder
+        return {
+            "name": self.name,
+            "recursive": self.recursive,
+            "holdWarnMs": self.hold_warn_s * 1000.0,
+            "acquisitions": sum(s.acquisitions for s in sites.values()),
+            "contended": sum(s.contended for s in sites.values()),
+            "owner": self.owner(),
+            "maxHolder": None if max_holder is None else {
+                "site": max_holder[0], "thread": max_holder[1], "holdMs": max_holder[2] * 1000.0,
+            },
+            "sites": {label: s.to_dict() for label, s in sorted(sites.items())},
+        }
+
+    def reset_stats(self):
+        with self._sites_lock:
+            self._sites = {}
+        self.max_holder = None
+
+
+def all_lock_stats():
+    """Statistics of every live InstrumentedMutex, keyed by name."""
+    return {m.name: m.stats() for m in list(_registry.values())}
+
+
+def export_lock_stats(path):
+    """Write all_lock_stats() as JSON; returns the path."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(all_lock_stats(), f, indent=2)
+    return path
@@ -0,0 +1,186 @@
+"""
+GUI event-loop responsiveness monitor.
+
+A QTimer heartbeat runs on the GUI thread. A watchdog thread checks how long
+ago the last heartbeat ran; while it is overdue the GUI thread is blocked,
+and the watchdog samples the GUI thread's Python stack. When the heartbeat
+finally runs, the stall is attributed to the call site seen most often in
+those samples.
+
+A call site is the outermost frame from this application's own modules,
+which for a QML-invoked slot is the slot itself (e.g.
+MOTIONConnector.queryTriggerConfig), together with the innermost frame where
+it was blocked. Lag of every heartbeat goes into a latency histogram.
+"""
+
+import collections
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSlot
+
+from diagnostics import LatencyHistogram
+
+logger = logging.getLogger("ow-testapp.loopmon")
+
+HEARTBEAT_MS = 50
+STALL_THRESHOLD_S = 0.1
+WATCHDOG_POLL_S = 0.02
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Event-loop plumbing, never the cause of a stall
+_LOOP_FILES = {"main.py", "loop_monitor.py"}
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    name = code.co_qualname if hasattr(code, "co_qualname") else code.co_name
+    return f"{name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def attribute_stack(frame):
+    """
+    Find the call site responsible for a blocked stack.
+
+    Returns:
+        tuple: (call_site, leaf) labels; call_site is the outermost frame in
+               this application's modules (excluding the event loop setup)
+    """
+    leaf = _frame_label(frame) if frame is not None else "<no python frame>"
+    call_site = None
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if (os.path.dirname(filename) == _APP_DIR
+                and os.path.basename(filename) not in _LOOP_FILES):
+            call_site = frame   # keep walking outwards
+        frame = frame.f_back
+    return (_frame_label(call_site) if call_site is not None else leaf), leaf
+
+
+class LoopLagMonitor(QObject):
+    """Heartbeat on the GUI loop plus a stack-sampling watchdog thread."""
+
+    def __init__(self, heartbeat_ms=HEARTBEAT_MS, stall_threshold=STALL_THRESHOLD_S, parent=None):
+        super().__init__(parent)
+        self.heartbeat = heartbeat_ms / 1000.0
+        self.stall_threshold = float(stall_threshold)
+        self.lag = LatencyHistogram()
+        self.beats = 0
+        self.stalls = 0
+        self.recent_stalls = collections.deque(maxlen=50)
+        self._sites = {}    # call site -> {"count", "totalS", "maxS", "leaves": Counter}
+        self._lock = threading.Lock()
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stall_samples = []
+        self._running = False
+        self._watchdog = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._on_heartbeat)
+
+    def start(self):
+        """Start the heartbeat (call on the GUI thread) and the watchdog."""
+        if self._running:
+            return
+        self._gui_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._running = True
+        self._timer.start()
+        self._watchdog = threading.Thread(target=self._watch, name="LoopLagWatchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._running = False
+        self._timer.stop()
+        if self._watchdog is not None:
+            self._watchdog.join(1.0)
+            self._watchdog = None
+
+    @pyqtSlot()
+    def _on_heartbeat(self):
+        now = time.perf_counter()
+        with self._lock:
+            lag = max(0.0, now - self._last_beat - self.heartbeat)
+            self._last_beat = now
+            samples, self._stall_samples = self._stall_samples, []
+        self.beats += 1
+        self.lag.record(lag)
+        if lag >= self.stall_threshold:
+            self._record_stall(lag, samples)
+
+    def _watch(self):
+        while self._running:
+            time.sleep(WATCHDOG_POLL_S)
+            with self._lock:
+                overdue = time.perf_counter() - self._last_beat - self.heartbeat
+            if overdue < self.stall_threshold:
+                continue
+            frame = sys._current_frames().get(self._gui_ident)
+            site = attribute_stack(frame)
+            del frame
+            with self._lock:
+                self._stall_samples.append(site)
+
+    def _record_stall(self, lag, samples):
+        if samples:
+            call_site = collections.Counter(s[0] for s in samples).most_common(1)[0][0]
+            leaves = collections.Counter(s[1] for s in samples if s[0] == call_site)
+        else:
+            # Stall shorter than a watchdog poll, or spent outside Python code
+            call_site, leaves = "<unattributed>", collections.Counter()
+
+        self.stalls += 1
+        with self._lock:
+            site = self._sites.setdefault(
+                call_site, {"count": 0, "totalS": 0.0, "maxS": 0.0, "leaves": collections.Counter()}
+            )
+            site["count"] += 1
+            site["totalS"] += lag
+            site["maxS"] = max(site["maxS"], lag)
+            site["leaves"].update(leaves)
+        self.recent_stalls.append({
+            "time": time.time(),
+            "lagMs": lag * 1000.0,
+            "callSite": call_site,
+            "leaf": leaves.most_common(1)[0][0] if leaves else None,
+        })
+        if lag >= 1.0:
+            logger.warning(f"GUI loop blocked {lag * 1000:.0f} ms in {call_site}")
+
+    def top_sites(self, n=10):
+        """Call sites ordered by total stalled time."""
+        with self._lock:
+            ranked = sorted(self._sites.items(), key=lambda kv: kv[1]["totalS"], reverse=True)[:n]
+            return [
+                {
+                    "callSite": name,
+                    "stalls": s["count"],
+                    "totalMs": s["totalS"] * 1000.0,
+                    "maxMs": s["maxS"] * 1000.0,
+                    "blockedIn": [leaf for leaf, _ in s["leaves"].most_common(3)],
+                }
+                for name, s in ranked
+            ]
+
+    def report(self):
+        return {
+            "heartbeatMs": self.heartbeat * 1000.0,
+            "stallThresholdMs": self.stall_threshold * 1000.0,
+            "beats": self.beats,
+            "stalls": self.stalls,
+            "lag": self.lag.to_dict(),
+            "topCallSites": self.top_sites(),
+            "recentStalls": list(self.recent_stalls),
+        }
+
+    def write_report(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
@@ -31,6 +31,13 @@ def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='OpenMOTION Test Application')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging and console output')
+    parser.add_argument('--profile', nargs='?', const='manual', choices=['startup', 'trigger', 'manual'],
+                        help='Enable the sampling profiler: startup window, every trigger run, or manual (Settings page)')
+    parser.add_argument('--profile-seconds', type=float, default=30.0, help='Length of the startup profiling window')
+    parser.add_argument('--profile-interval-ms', type=float, default=10.0, help='Profiler sampling interval')
+    parser.add_argument('--profile-dir', default=None, help='Profile output directory (default ./profiles)')
+    parser.add_argument('--frame-bus', nargs='?', const='', default=None, metavar='NAME',
+                        help='Publish frames and telemetry to shared memory for external analysis processes')
     args = parser.parse_args()
 
     # Configure logging based on debug flag
@@ -62,12 +69,21 @@ def main():
     # Expose to QML
     log_level = logging.DEBUG if args.debug else logging.INFO
     connector = MOTIONConnector(log_level=log_level)
+    if args.profile:
+        connector.configureProfiling(
+            args.profile, args.profile_seconds, args.profile_interval_ms / 1000.0, args.profile_dir
+        )
+    if args.frame_bus is not None:
+        connector.startFrameBus(args.frame_bus)
     qmlRegisterSingletonInstance("OpenMotion", 1, 0, "MOTIONInterface", connector)
     engine.rootContext().setContextProperty("appVersion", APP_VERSION)
     # Also expose app version on the QGuiApplication instance so Python
     # modules (not just QML) can read it via QGuiApplication.instance().property()
     app.setProperty("appVersion", APP_VERSION)
 
+    # Watch the GUI loop for stalls caused by blocking slots
+    connector.startLoopMonitor()
+
     # Load the QML file
     engine.load(resource_path("main.qml"))
 
@@ -1,7 +1,6 @@
 from PyQt6.QtCore import ( 
     QObject, pyqtSignal, pyqtProperty, pyqtSlot, 
-    QVariant, QThread, QWaitCondition, QMutex, QMutexLocker,
-    QRecursiveMutex,
+    QVariant, QThread, QWaitCondition, QMutex,
 )
 from PyQt6.QtGui import QGuiApplication
 import sys
@@ -9,9 +8,12 @@ import logging
 import base58
 import json
 import csv
+import collections
 import os
 import datetime
 import time
+import math
+import threading
 import uuid
 import numpy as np
 import pandas as pd
@@ -19,7 +21,37 @@ from pathlib import Path
 
 from utils.resource_path import resource_path
 from motion_singleton import motion_interface  
-from histogram_classifier import classify_histogram
+from histogram_classifier import classify_histogram_with_reasons, histogram_weighted_mean_std
+from dark_frame_cache import (
+    DarkFrameCache, dark_corrected_stats, dark_corrected_moments, dark_corrected_verdict,
+)
+from histogram_archive import HistogramArchive
+from histogram_stats import BinStatistics, camera_slot, slot_camera
+from speckle_analysis import SpeckleContrastStage
+from telemetry_scheduler import PollScheduler
+from safety_monitor import (
+    SafetyMonitorThread, SimulatedFaultSource, safety_ok, safety_status_text,
+    SAFETY_MUX_IDX, SAFETY_I2C_ADDR, SAFETY_OFFSET, SAFETY_CHANNELS,
+)
+from diagnostics import LatencyHistogram
+from telemetry_model import TelemetryModel, PduChannelModel
+from telemetry_pyramid import TelemetryPyramid
+from streaming_summary import RunSummary
+from anomaly_detector import AnomalyDetector
+from thermal_settle import SettleDetector
+from auto_exposure import (
+    ExposureSearch, ExposureCache, measure as measure_exposure, DEFAULT_TARGET_MEAN as AUTO_EXPOSURE_TARGET_MEAN,
+)
+from device_state_cache import DeviceStateCache, FOREVER
+from reconnect_manager import ReconnectManager, device_key, power_mask
+from sampling_profiler import SamplingProfiler, DEFAULT_INTERVAL_S as PROFILE_INTERVAL_S
+from loop_monitor import LoopLagMonitor
+from instrumented_lock import InstrumentedMutex, all_lock_stats, export_lock_stats
+from bus_tracer import BusTracer
+from session_replay import SessionRecorder, SessionReplayThread
+from frame_bus import FrameBusPublisher, DEFAULT_NAME as FRAME_BUS_NAME
+from imu_stream import ImuRing, ImuSampler, write_aligned_csv, write_samples_csv
+from storage_manager import StorageManager
 
 try:
     from omotion.DFUProgrammer import DFUProgrammer, DFUProgress
@@ -43,6 +75,115 @@ R230 = 300E3
 R234 = 300E3
 R_s = 0.020 #(R217)
 
+# Interlock (SE/SO) poll rate of the safety monitor while a trigger runs
+SAFETY_MONITOR_RATE_HZ = 20.0
+
+# Telemetry is pushed to QML at most this often, and only on real changes
+TELEMETRY_UI_RATE_HZ = 10.0
+# Changes smaller than these are not published ((group, field): deadband)
+TELEMETRY_DEADBANDS = {
+    ("tec", "monC"): 0.002,   # A
+    ("tec", "monV"): 0.005,   # V
+    ("pdu", "vals"): 0.002,   # V, per channel
+}
+
+# Telemetry fields kept in the long-run min/max/mean pyramid, per group.
+# List fields become one channel per element ("pdu.vals3").
+TELEMETRY_HISTORY_FIELDS = {
+    "tec": ("voltage", "temp", "monC", "monV"),
+    "analog": ("tcm", "tcl", "pdc"),
+    "pdu": ("vals",),
+}
+
+# Pass/fail limits of the end-of-run report: metric -> (low, high) applied to
+# its min/max over the run, or (low, high, (low_stat, high_stat)) to use other
+# tracked statistics; event counters -> (None, max count).
+RUN_REPORT_LIMITS = {
+    # measured - setpoint, C; the approach to setpoint and short transients
+    # would fail a min/max check, so the 1st/99th percentiles must stay in band
+    "tec.error": (-0.5, 0.5, ("p1", "p99")),
+    "safety_faults": (None, 0),
+}
+# Names in RUN_REPORT_LIMITS counted with RunSummary.count_event (0 if never counted)
+RUN_REPORT_EVENTS = ("safety_faults",)
+
+# Online drift/anomaly detection on the polled telemetry: channel or channel
+# prefix -> overrides of anomaly_detector.DEFAULTS, None disables a channel.
+# Baselines are re-learned when a run starts and, for "tec.", when the
+# setpoint changes.
+TELEMETRY_ANOMALY_CONFIG = {
+    "tec.voltage": None,                # follows the setpoint; tec.error is watched
+    "tec.temp": None,                   # setpoint
+    "tec.error": {"min_std": 0.005},    # C
+    "tec.monC": {"min_std": 0.002},     # A
+    "tec.monV": {"min_std": 0.005},     # V
+    "pdu.": {"min_std": 0.002},         # V
+    "analog.tcm": None,                 # counters
+    "analog.tcl": None,
+    "analog.pdc": {"min_std": 0.01},
+}
+# Most recent anomaly events kept for telemetryAnomalies()
+TELEMETRY_ANOMALY_HISTORY = 200
+
+# Channels that must settle before a capture (awaitStable): channel -> target
+# (None: settled when flat). IMU channels only count for connected sensors.
+SETTLE_CHANNELS = {
+    "tec.error": 0.0,                   # measured - setpoint, C
+    "imu.left.temp": None,              # C
+    "imu.right.temp": None,
+}
+SETTLE_POLL_S = 1.0         # TEC/IMU temperature read / progress period while waiting
+# Between waits the same channels are sampled at this period, so a system that
+# has already settled does not first have to fill the window
+SETTLE_BACKGROUND_POLL_S = 5.0
+SETTLE_TIMEOUT_S = 1800.0
+
+# Continuous IMU sampling per sensor side (startImuStream). A read that cannot
+# get the sensor lock within IMU_LOCK_TIMEOUT_MS (e.g. during a capture) is
+# skipped, not queued.
+IMU_STREAM_RATE_HZ = 100.0
+IMU_STREAM_UI_RATE_HZ = 10.0
+IMU_STREAM_CAPACITY = 60000         # samples per side
+IMU_LOCK_TIMEOUT_MS = 5
+
+# Live histogram stream of one camera (startCameraStream), polled through the
+# single-frame upload, so the achieved rate is bounded by the upload time. A
+# read that cannot get the sensor lock in time (e.g. during a capture) is
+# skipped; CAMERA_STREAM_MAX_ERRORS failed reads in a row end the stream.
+CAMERA_STREAM_FPS = 10.0
+CAMERA_STREAM_LOCK_TIMEOUT_MS = 50
+CAMERA_STREAM_MAX_ERRORS = 5
+
+# Retention of the app's output directories (see storage_manager): directory
+# -> size/age/count quotas and the closed files that are gzipped. Checked 30 s
+# after startup, then every STORAGE_SWEEP_INTERVAL_S.
+STORAGE_POLICIES = {
+    "app-logs": {"max_mb": 1024, "max_age_days": 90, "compress": ("*.log", "*.json")},
+    "run-logs": {"max_mb": 4096, "max_age_days": 365, "compress": ("*.log", "*.csv")},
+    "downloads": {"max_mb": 1024, "max_age_days": 180, "max_files": 50},   # firmware binaries
+}
+STORAGE_SWEEP_INTERVAL_S = 6 * 3600
+
+# How long polled device state is served from memory (seconds). Entries are
+# also invalidated by the matching setters, connect/disconnect and DFU.
+DEVICE_CACHE_TTL_S = {
+    "trigger": 2.0,
+    "fan_control": 5.0,
+    "fans": 5.0,
+    "rgb": 10.0,
+    "info": FOREVER,    # firmware version / hardware ID
+}
+
+# Lock holds longer than these are flagged (seconds). Sensor locks cover FPGA
+# programming, which legitimately takes a few seconds per camera.
+CONSOLE_LOCK_HOLD_WARN_S = 0.5
+SENSOR_LOCK_HOLD_WARN_S = 5.0
+
+# Camera settings applied by configureCamera unless the camera has an
+# auto-exposure result (autoExposure)
+DEFAULT_CAMERA_GAIN = 16
+DEFAULT_CAMERA_EXPOSURE_US = 600
+
 # Global loggers - will be configured by _configure_logging method
 logger = None
 run_logger = None
@@ -489,6 +630,7 @@ class MOTIONConnector(QObject):
 
     cameraConfigUpdated = pyqtSignal(int, bool)  # camera_mask, passed=True/False
     histogramCaptureCompleted = pyqtSignal(int, float, float, str)  # (camera_index, weighted_mean, std_dev, result: "PASS"|"FAIL"|"LOW_LIGHT")
+    histogramDarkCorrected = pyqtSignal(int, float, float, str)  # (camera_index, mean, std_dev, result) after dark subtraction
     cameraPowerStatusUpdated = pyqtSignal(list)  # (power_status_list)
     csvOutputDirectoryChanged = pyqtSignal(str)  # (directory_path)
 
@@ -533,6 +675,23 @@ class MOTIONConnector(QObject):
     taGainValueChanged = pyqtSignal()
     taGainSetFailed = pyqtSignal(str)
 
+    # Emits: descriptor, identity_ok, restored action names, seconds
+    deviceStateRestored = pyqtSignal(str, bool, 'QVariant', float)
+
+    profilingStateChanged = pyqtSignal()
+    profileWritten = pyqtSignal(str)  # speedscope file path
+    sessionReplayFinished = pyqtSignal('QVariant')  # replay statistics
+    runReportWritten = pyqtSignal(str, str)  # (report JSON path, "PASS"|"FAIL"|"NO DATA")
+    # channel, kind, time, value, baseline, score, threshold; emitted from the polling thread
+    telemetryAnomalyDetected = pyqtSignal('QVariantMap')
+    stabilityProgress = pyqtSignal('QVariant')  # assessment while awaitStable() waits
+    stabilityReached = pyqtSignal(bool, 'QVariant')  # (stable, last assessment)
+    autoExposureStep = pyqtSignal(str, int, int, int, float, float)  # side, camera, gain, exposure, mean, saturation
+    autoExposureFinished = pyqtSignal('QVariant')  # "side:camera" -> result
+    imuStreamUpdated = pyqtSignal(str, 'QVariantMap')  # (side, mean of the samples since the last update)
+    histogramImportProgress = pyqtSignal(int, int)  # (files done, files to import)
+    histogramImportFinished = pyqtSignal(int)  # captures imported, -1 on error
+
     def __init__(self, config_dir="config", log_level=logging.INFO):
         super().__init__()
         self._interface = motion_interface
@@ -546,6 +705,36 @@ class MOTIONConnector(QObject):
         import os
         self._csv_output_directory = os.path.expanduser("~")
 
+        # Indexed archive of every histogram capture (metadata + compressed bins)
+        try:
+            self._archive = HistogramArchive(os.path.join(os.getcwd(), "archive", "histograms.db"))
+            logger.info(f"Histogram archive: {self._archive.db_path}")
+        except Exception as e:
+            self._archive = None
+            logger.error(f"Failed to open histogram archive: {e}")
+        self._archive_import_thread = None
+
+        # Last firmware version reported by each sensor ("left"/"right"), for archive metadata
+        self._sensor_fw_versions = {}
+
+        # (side, camera_index) -> (gain, exposure_us) last applied by configureCamera
+        self._camera_settings = {}
+        # Dark frames per side/camera, keyed by IMU temperature band and gain/exposure
+        self._dark_cache = DarkFrameCache()
+        # Converged auto-exposure settings per camera, reused for the next unit
+        self._exposure_cache = ExposureCache()
+        self._auto_exposure_threads = {}
+        self._auto_exposure_results = {}
+        # Per-camera, per-bin running statistics over captured/streamed light frames
+        self._bin_stats = BinStatistics()
+        # Per-frame mean/std/speckle contrast time series for every camera
+        self._speckle = SpeckleContrastStage()
+
+        # Session record/replay (see startSessionRecording / startSessionReplay)
+        self._session_recorder = None
+        self._replay_thread = None
+        self._replay_processing = LatencyHistogram()
+
         # Check if console and sensor are connected
         console_connected, left_sensor_connected, right_sensor_connected = motion_interface.is_device_connected()
 
@@ -557,8 +746,9 @@ class MOTIONConnector(QObject):
         self._running = False
         self._trigger_state = "OFF"
         self._state = DISCONNECTED
-        self._i2c_mutex = QMutex()
+        self._i2c_mutex = InstrumentedMutex("i2c", hold_warn_s=CONSOLE_LOCK_HOLD_WARN_S)
         self._is_streaming = False
+        self._camera_stream = None
         self._capture_thread = None
         self._console_status_thread = None
 
@@ -584,7 +774,66 @@ class MOTIONConnector(QObject):
         self._pdu_raws = [0] * 16
         self._pdu_vals = [0.0] * 16
 
-        self._console_mutex = QRecursiveMutex()
+        # Worker threads submit telemetry here; QML is notified in batches
+        self._telemetry = TelemetryModel(TELEMETRY_DEADBANDS, TELEMETRY_UI_RATE_HZ, parent=self)
+        self._telemetry.updated.connect(self._on_telemetry_updated)
+        # Every polled sample (before deadbands) for the trend chart
+        self._telemetry_history = TelemetryPyramid()
+        # Streaming statistics of the current trigger run (see _start_runlog)
+        self._run_summary = None
+        # Per-channel EWMA/CUSUM detectors on the same samples
+        self._anomaly_detector = AnomalyDetector(TELEMETRY_ANOMALY_CONFIG)
+        self._anomaly_events = collections.deque(maxlen=TELEMETRY_ANOMALY_HISTORY)
+        # Recent TEC error / IMU temperatures for awaitStable()
+        self._settle = SettleDetector()
+        self._settle_thread = None
+        self._settle_sampler = _SettleSamplerThread(self, parent=self)
+        # Shared-memory publisher for external analysis processes (startFrameBus)
+        self._frame_bus = None
+        # Continuous IMU samples per side (startImuStream)
+        self._imu_rings = {side: ImuRing(IMU_STREAM_CAPACITY) for side in ("left", "right")}
+        self._imu_threads = {}
+        # Quotas and compression for app-logs/, run-logs/ and downloads/ (background thread)
+        self._storage = StorageManager(
+            {self._storage_dir(name): policy for name, policy in STORAGE_POLICIES.items()},
+            in_use=self._storage_in_use,
+        )
+        self._pdu_channels = PduChannelModel(len(self._pdu_vals), parent=self)
+
+        # Polled device state (trigger config, fan status, IDs) served from memory
+        self._device_cache = DeviceStateCache()
+
+        # Last applied configuration per device, restored after a hot-plug
+        self._reconnect = ReconnectManager()
+        self._restore_threads = {}
+
+        # Sampling profiler (see configureProfiling / startProfiling)
+        self._profiler = None
+        self._profiling = False
+        self._profile_interval = PROFILE_INTERVAL_S
+        self._profile_dir = os.path.join(os.getcwd(), "profiles")
+        self._profile_outputs = {}
+
+        # GUI event-loop lag monitor; started from main.py once the loop exists
+        self._loop_monitor = LoopLagMonitor(parent=self)
+
+        # USB/I2C call tracer; proxies the interface objects while active
+        self._bus_tracer = BusTracer()
+
+        self._console_mutex = InstrumentedMutex("console", recursive=True, hold_warn_s=CONSOLE_LOCK_HOLD_WARN_S)
+
+        # Dedicated interlock watchdog; runs while the trigger is on. Faults
+        # can be injected through the simulated source for latency testing.
+        self._safety_source = SimulatedFaultSource(self._read_safety_registers)
+        self._safety_monitor = SafetyMonitorThread(
+            self._safety_source,
+            self._stop_console_trigger,
+            rate_hz=SAFETY_MONITOR_RATE_HZ,
+            status_log=lambda text: run_logger.info(f"Safety Status - {text}"),
+        )
+        self._safety_monitor.faultDetected.connect(self._on_safety_fault)
+        self._safety_monitor.faultCleared.connect(self._on_safety_cleared)
+        self._safety_monitor.readError.connect(self._on_safety_read_error)
 
         # Console firmware update state
         self._console_fw_busy = False
@@ -594,11 +843,14 @@ class MOTIONConnector(QObject):
         self._fw_flash_thread: _ConsoleFirmwareFlashThread | None = None
         
         # Sensor mutexes for left and right sensors (following console mutex pattern)
-        self._left_sensor_mutex = QRecursiveMutex()
-        self._right_sensor_mutex = QRecursiveMutex()
+        self._left_sensor_mutex = InstrumentedMutex("sensor_left", recursive=True, hold_warn_s=SENSOR_LOCK_HOLD_WARN_S)
+        self._right_sensor_mutex = InstrumentedMutex("sensor_right", recursive=True, hold_warn_s=SENSOR_LOCK_HOLD_WARN_S)
         
         self.connect_signals()
 
+        self._storage.start(STORAGE_SWEEP_INTERVAL_S)
+        self._settle_sampler.start()
+
     @pyqtProperty(bool, notify=consoleFirmwareUpdateBusyChanged)
     def consoleFirmwareUpdateBusy(self) -> bool:
         return bool(getattr(self, "_console_fw_busy", False))
@@ -739,6 +991,8 @@ class MOTIONConnector(QObject):
             self.consoleFirmwareUpdateError.emit("CONSOLE", "Firmware flashing is already in progress.")
             return
         _, bin_path, _, target = self._fw_temp_files[token]
+        # Firmware version and state change across DFU
+        self._invalidate_device_cache(target)
         if not os.path.exists(bin_path):
             self.consoleFirmwareUpdateError.emit(target, "Downloaded firmware file is missing.")
             self._cleanup_fw_token(token)
@@ -754,6 +1008,7 @@ class MOTIONConnector(QObject):
         self._fw_flash_thread.start()
 
     def _on_console_fw_finished(self, token: str, success: bool, message: str, target: str = "CONSOLE") -> None:
+        self._invalidate_device_cache(target)
         self._cleanup_fw_token(token)
         self.consoleFirmwareUpdateFinished.emit(target, bool(success), str(message))
         self._set_console_fw_busy(False)
@@ -895,7 +1150,7 @@ class MOTIONConnector(QObject):
             logging.debug(f"Failed to read FPGA model scale for {label}/{name}: {e}")
             return None
 
-    def _get_sensor_mutex(self, sensor_tag: str) -> QRecursiveMutex:
+    def _get_sensor_mutex(self, sensor_tag: str) -> InstrumentedMutex:
         """Get the appropriate mutex for the given sensor."""
         if sensor_tag == "SENSOR_LEFT":
             return self._left_sensor_mutex
@@ -948,6 +1203,9 @@ class MOTIONConnector(QObject):
         # Save so we can remove/close it later
         self._runlog_handler = run_handler
         self._runlog_active = True
+        self._run_summary = RunSummary(RUN_REPORT_LIMITS, events=RUN_REPORT_EVENTS)
+        # The trigger changes rail loads and currents; learn this run's baselines
+        self._anomaly_detector.reset()
 
         # --- Gather version info for header ---
         # SDK version (MOTION SDK / sensor SDK)
@@ -967,7 +1225,7 @@ class MOTIONConnector(QObject):
 
         # Console firmware version (from console module) :contentReference[oaicite:5]{index=5}
         try:
-            # _console_mutex is a QRecursiveMutex so re-locking is safe if we're already in startTrigger
+            # _console_mutex is recursive so re-locking is safe if we're already in startTrigger
             self._console_mutex.lock()
             try:
                 fw_ver = motion_interface.console_module.get_version()
@@ -995,6 +1253,29 @@ class MOTIONConnector(QObject):
         if not self._runlog_active or self._runlog_handler is None:
             return
 
+        # Summary report next to the run log, from the statistics kept during the run
+        summary, self._run_summary = self._run_summary, None
+        report_path = None
+        if summary is not None:
+            try:
+                base = os.path.splitext(self._runlog_path)[0]
+                report = summary.write(base, run_log=self._runlog_path)
+                report_path = f"{base}.summary.json"
+                failed = [c["name"] for c in report["checks"] if not c["ok"]]
+                run_logger.info(f"Run Report - {report['result']}" + (f" ({', '.join(failed)})" if failed else ""))
+            except Exception as e:
+                logger.error(f"Error writing run report: {e}")
+
+        # IMU samples of the run next to the run log, aligned with the frames
+        if summary is not None:
+            for side in list(self._imu_threads):
+                try:
+                    path = self._export_imu(side, os.path.splitext(self._runlog_path)[0],
+                                            since=summary.started_at.timestamp())
+                    run_logger.info(f"IMU Export - {side}: {path}")
+                except Exception as e:
+                    logger.error(f"Error exporting {side} IMU data: {e}")
+
         # Mark end of run in the run log
         run_logger.info(f"[RUNLOG] Trigger run logging stopped -> {self._runlog_path}")
         run_logger.info("========== RUN END ==========")
@@ -1019,6 +1300,9 @@ class MOTIONConnector(QObject):
         self._runlog_path = None
         self._runlog_active = False
 
+        if report_path is not None:
+            self.runReportWritten.emit(report_path, report["result"])
+
     @pyqtSlot(result=bool)
     def setLaserPowerFromConfig(self) -> bool:
         """Apply laser power parameters loaded at startup."""
@@ -1031,29 +1315,38 @@ class MOTIONConnector(QObject):
     def set_laser_power_from_config(self, interface):
         logger.info("[Connector] Setting laser power from config...")
         self._console_mutex.lock()
-        for idx, laser_param in enumerate(self.laser_params, start=1):
-            muxIdx = laser_param["muxIdx"]
-            channel = laser_param["channel"]
-            i2cAddr = laser_param["i2cAddr"]
-            offset = laser_param["offset"]
-            dataToSend = bytearray(laser_param["dataToSend"])
+        try:
+            for idx, laser_param in enumerate(self.laser_params, start=1):
+                if not self._write_laser_param(interface, laser_param, f"({idx}/{len(self.laser_params)}) "):
+                    return False
+        finally:
+            self._console_mutex.unlock()
+        self._reconnect.update("console", laser_params=list(self.laser_params))
+        logger.info("Laser power set successfully.")
+        return True
 
-            logger.debug(
-                f"[Connector] ({idx}/{len(self.laser_params)}) "
-                f"Writing I2C: muxIdx={muxIdx}, channel={channel}, "
-                f"i2cAddr=0x{i2cAddr:02X}, offset=0x{offset:02X}, "
-                f"data={list(dataToSend)}"
-            )
+    def _write_laser_param(self, interface, laser_param, label=""):
+        """Write one laser_params entry over the console I2C bus. Caller holds the console mutex."""
+        muxIdx = laser_param["muxIdx"]
+        channel = laser_param["channel"]
+        i2cAddr = laser_param["i2cAddr"]
+        offset = laser_param["offset"]
+        dataToSend = bytearray(laser_param["dataToSend"])
+
+        logger.debug(
+            f"[Connector] {label}"
+            f"Writing I2C: muxIdx={muxIdx}, channel={channel}, "
+            f"i2cAddr=0x{i2cAddr:02X}, offset=0x{offset:02X}, "
+            f"data={list(dataToSend)}"
+        )
 
-            if not interface.console_module.write_i2c_packet(
-                mux_index=muxIdx, channel=channel,
-                device_addr=i2cAddr, reg_addr=offset,
-                data=dataToSend
-            ):
-                logger.error(f"Failed to set laser power (muxIdx={muxIdx}, channel={channel})")
-                return False
-        logger.info("Laser power set successfully.")
-        self._console_mutex.unlock()
+        if not interface.console_module.write_i2c_packet(
+            mux_index=muxIdx, channel=channel,
+            device_addr=i2cAddr, reg_addr=offset,
+            data=dataToSend
+        ):
+            logger.error(f"Failed to set laser power (muxIdx={muxIdx}, channel={channel})")
+            return False
         return True
     
     @pyqtProperty(str, notify=csvOutputDirectoryChanged)
@@ -1195,6 +1488,16 @@ class MOTIONConnector(QObject):
     @pyqtProperty(QVariant, notify=pduMonChanged)
     def adc1Vals(self):
         return self._pdu_vals[8:]
+
+    @pyqtProperty(QObject, constant=True)
+    def pduChannels(self):
+        """PDU monitor channels as a list model (roles: channel, adc, raw, value)."""
+        return self._pdu_channels
+
+    @pyqtProperty(QObject, constant=True)
+    def telemetry(self):
+        """Batched telemetry notifications: connect to its updated(changes) signal."""
+        return self._telemetry
     
     @pyqtSlot(str)
     def powerCamerasOn(self, target: str):
@@ -1205,6 +1508,7 @@ class MOTIONConnector(QObject):
 
             ok = motion_interface.sensors[target].enable_camera_power(MASK_ALL)
             if ok:
+                self._reconnect.update(target, camera_power_mask=MASK_ALL)
                 logger.info(f"{target.capitalize()}: Power enabled")
             else:
                 logger.error(f"{target.capitalize()}: Failed to enable power")
@@ -1221,6 +1525,8 @@ class MOTIONConnector(QObject):
 
             ok = motion_interface.sensors[target].disable_camera_power(MASK_ALL)
             if ok:
+                self._reconnect.update(target, camera_power_mask=0)
+                self._reconnect.drop_cameras(target, MASK_ALL)
                 logger.info(f"{target.capitalize()}: Power disabled")
             else:
                 logger.error(f"{target.capitalize()}: Failed to disable power")
@@ -1258,7 +1564,7 @@ class MOTIONConnector(QObject):
                         logger.info(f"Camera temperature: {temperature}°C")
                     except Exception as e:
                         logger.error(f"Failed to get camera temperature: {e}")
-                        temperature = 0.0  # Fallback to 0 if temperature retrieval fails
+                        temperature = None  # Dark frames are matched by temperature; never guess one
                     
                     # Calculate weighted mean
                     weighted_mean, std_dev = self._calculate_weighted_mean_std_dev(bins[:1024])
@@ -1267,11 +1573,12 @@ class MOTIONConnector(QObject):
                     
                     # Classify histogram (light: PASS/FAIL/LOW_LIGHT; dark: PASS only, not saved as "result")
                     result = "PASS"  # Default for dark or on error
+                    reasons = []
                     if not is_dark:
                         try:
                             histogram_bins = bins[:1024]
                             if histogram_bins and len(histogram_bins) == 1024:
-                                result = classify_histogram(histogram_bins, is_light_histogram=True)
+                                result, reasons = classify_histogram_with_reasons(histogram_bins, is_light_histogram=True)
                                 if result == "LOW_LIGHT":
                                     logger.warning(f"Light histogram mean {weighted_mean:.1f} < 75 for camera {camera_index + 1}: Low Light — not saving.")
                                 elif result == "FAIL":
@@ -1282,9 +1589,27 @@ class MOTIONConnector(QObject):
                             logger.error(f"Error classifying histogram: {e}")
                             result = "PASS"
 
+                    csv_path = None
+                    gain, exposure = self._camera_setting(sensor_side, camera_index)
+                    if temperature is None:
+                        logger.warning(f"No temperature for {sensor_side} camera {camera_index + 1}; "
+                                       f"dark frame cache not used")
+                    elif is_dark:
+                        self._dark_cache.store(sensor_side, camera_index, bins[:1024], temperature, gain, exposure)
+                    else:
+                        corrected = self._apply_dark_correction(sensor_side, camera_index, bins[:1024], temperature,
+                                                                gain, exposure, result, reasons)
+                        if corrected is not None:
+                            result, reasons = corrected
+                    if not is_dark:
+                        self._ingest_frames(sensor_side, [camera_index], [bins[:1024]])
+
                     if result != "LOW_LIGHT":
-                        self._save_histogram_csv(bins, filename, temperature, camera_index)
+                        csv_path = self._save_histogram_csv(bins, filename, 0.0 if temperature is None else temperature,
+                                                            camera_index)
                         logger.info(f"Saved {capture_type} to {filename}")
+                    self._archive_capture(bins[:1024], serial_number, sensor_side, camera_index, is_dark,
+                                          temperature, weighted_mean, std_dev, result, reasons, csv_path)
                     # Emit signal with weighted mean and classification result for async UI update
                     self.histogramCaptureCompleted.emit(camera_index, weighted_mean, std_dev, result)
                 else:
@@ -1320,7 +1645,10 @@ class MOTIONConnector(QObject):
 
 
     def _save_histogram_csv(self, bins, filename, temperature=0.0, camera_index=0):
-        """Helper method to save histogram data to CSV file with incremental counter to prevent overwriting."""
+        """Helper method to save histogram data to CSV file with incremental counter to prevent overwriting.
+
+        Returns the path of the written file, or None on failure.
+        """
         try:
             import os
             import csv
@@ -1371,61 +1699,195 @@ class MOTIONConnector(QObject):
                 writer.writerow(data_row)
             
             logger.info(f"Histogram saved to {filepath}")
+            return filepath
             
         except Exception as e:
             logger.error(f"Failed to save histogram CSV: {e}")
+            return None
+
+    def _archive_capture(self, bins, serial_number, sensor_side, camera_index, is_dark,
+                         temperature, weighted_mean, std_dev, result, reasons, csv_path=None):
+        """Record a capture in the histogram archive (never raises)."""
+        if self._archive is None:
+            return
+        try:
+            app = QGuiApplication.instance()
+            app_ver = app.property("appVersion") if app is not None else None
+            try:
+                sdk_ver = self._interface.get_sdk_version()
+            except Exception:
+                sdk_ver = None
+            self._archive.add_capture(
+                bins,
+                serial=serial_number,
+                sensor_side=sensor_side,
+                camera_index=camera_index,
+                is_dark=is_dark,
+                temperature=temperature,
+                mean=weighted_mean,
+                std=std_dev,
+                result=None if is_dark else result,
+                reasons=reasons,
+                app_version=app_ver,
+                sdk_version=sdk_ver,
+                firmware_version=self._sensor_fw_versions.get(sensor_side),
+                source_path=os.path.abspath(csv_path) if csv_path else None,
+            )
+        except Exception as e:
+            logger.error(f"Failed to archive histogram capture: {e}")
+
+    @pyqtSlot(str, str, int, result=QVariant)
+    def queryHistogramArchive(self, serial_number: str, result: str = "", limit: int = 100):
+        """Return archived capture metadata (newest first) for a serial and/or result."""
+        if self._archive is None:
+            return []
+        try:
+            return self._archive.query(
+                serial=serial_number or None,
+                result=result or None,
+                limit=limit if limit > 0 else None,
+            )
+        except Exception as e:
+            logger.error(f"Histogram archive query failed: {e}")
+            return []
+
+    @pyqtSlot(str, result=bool)
+    def importHistogramDirectory(self, directory: str) -> bool:
+        """
+        Import existing histogram CSVs from a directory into the archive in the
+        background; reports histogramImportProgress and histogramImportFinished.
+
+        Returns:
+            bool: False if there is no archive or an import is already running
+        """
+        if self._archive is None:
+            return False
+        if self._archive_import_thread is not None:
+            logger.warning("importHistogramDirectory: an import is already running")
+            return False
+        thread = _HistogramImportThread(self._archive, directory)
+        thread.progress.connect(self.histogramImportProgress)
+        thread.done.connect(self._on_histogram_import_done)
+        self._archive_import_thread = thread
+        thread.start()
+        return True
+
+    @pyqtSlot(int)
+    def _on_histogram_import_done(self, imported):
+        thread, self._archive_import_thread = self._archive_import_thread, None
+        if thread is not None:
+            thread.wait()
+        self.histogramImportFinished.emit(imported)
 
     def _calculate_weighted_mean_std_dev(self, histogram_data):
         """Calculate the weighted mean and standard deviation of histogram data using numpy algorithm."""
         try:
             if not histogram_data or len(histogram_data) == 0 or len(histogram_data) != 1024:
                 return 0.0, 0.0
-            
-            # Create a copy to avoid modifying the original data
-            hist = histogram_data.copy()
-            
-            # Rule 1: zero out the 1024th bin (index 1023)
-            hist[1023] = 0
 
-            # Rule 2: if a bin has less than 100 in it, set it to 0 (equivalent to noisyBinMin = 100)
-            noisyBinMin = 100
-            for i in range(len(hist)):
-                if hist[i] < noisyBinMin:
-                    hist[i] = 0
+            # Zeroes bin 1023 and ignores bins below 100 counts (noisyBinMin)
+            return histogram_weighted_mean_std(histogram_data, noisy_bin_min=100)
 
-            # Create bin indices array (0 to 1023)
-            bins = list(range(len(hist)))
-            
-            # Calculate weighted mean: np.dot(hist,bins)/np.sum(hist)
-            weighted_sum = sum(hist[i] * bins[i] for i in range(len(hist)))
-            total_count = sum(hist)
-            
-            if total_count == 0:
-                return 0.0, 0.0
-            
-            mean = weighted_sum / total_count
-            
-            # Calculate bins squared: np.multiply(bins,bins)
-            bins_sq = [bins[i] * bins[i] for i in range(len(bins))]
-            
-            # Calculate variance using sample formula: 
-            # var = (np.dot(hist,binsSq)-mean*mean*np.sum(hist))/(np.sum(hist)-1)
-            hist_dot_bins_sq = sum(hist[i] * bins_sq[i] for i in range(len(hist)))
-            variance = (hist_dot_bins_sq - mean * mean * total_count) / (total_count - 1)
-            
-            # Calculate standard deviation: np.sqrt(var)
-            std = variance ** 0.5 if variance >= 0 else 0.0
-
-            return mean, std
-            
         except Exception as e:
             logger.error(f"Error calculating weighted mean: {e}")
             return 0.0, 0.0
-    
+
+    def _camera_setting(self, sensor_side: str, camera_index: int):
+        """Return (gain, exposure_us) last applied to a camera, or the defaults."""
+        return self._camera_settings.get(
+            (sensor_side, camera_index), (DEFAULT_CAMERA_GAIN, DEFAULT_CAMERA_EXPOSURE_US)
+        )
+
+    def _apply_dark_correction(self, sensor_side, camera_index, bins, temperature,
+                               gain, exposure, result, reasons):
+        """
+        Re-classify a light capture against the cached dark frame, if one is current.
+
+        Returns:
+            tuple: (result, reasons) after dark correction, or None to keep the raw verdict
+        """
+        try:
+            dark = self._dark_cache.lookup(sensor_side, camera_index, temperature, gain, exposure)
+            if dark is None:
+                logger.info(f"No current dark frame for {sensor_side} camera {camera_index + 1} "
+                            f"at {temperature:.1f}°C (gain {gain}, exposure {exposure}); skipping dark correction")
+                return None
+
+            light = np.asarray(bins, dtype=np.float64)[np.newaxis, :]
+            means, stds = dark_corrected_stats(light, dark.histogram[np.newaxis, :])
+            _, _, skewness, kurtosis = dark_corrected_moments(light, dark.histogram[np.newaxis, :])
+            corrected_result, corrected_reasons = dark_corrected_verdict(
+                result, reasons, float(skewness[0]), float(kurtosis[0])
+            )
+            logger.info(
+                f"Dark-corrected {sensor_side} camera {camera_index + 1}: mean {means[0]:.2f}, "
+                f"std {stds[0]:.2f}, skew {skewness[0]:.2f}, kurt {kurtosis[0]:.2f} -> {corrected_result} "
+                f"(dark age {dark.age():.0f} s)"
+            )
+            self.histogramDarkCorrected.emit(camera_index, float(means[0]), float(stds[0]), corrected_result)
+            return corrected_result, corrected_reasons
+        except Exception as e:
+            logger.error(f"Error applying dark correction: {e}")
+            return None
+
+    @pyqtSlot(str, int, result=bool)
+    def isDarkFrameCurrent(self, sensor_tag: str, camera_index: int) -> bool:
+        """True if a cached dark frame matches the camera's current temperature band and settings."""
+        try:
+            sensor_side = self._get_sensor_side(sensor_tag)
+            mutex = self._get_sensor_mutex(sensor_tag)
+            mutex.lock()
+            try:
+                temperature = self._interface.sensors[sensor_side].imu_get_temperature()
+            finally:
+                mutex.unlock()
+            gain, exposure = self._camera_setting(sensor_side, camera_index)
+            return not self._dark_cache.needs_refresh(sensor_side, camera_index, temperature, gain, exposure)
+        except Exception as e:
+            logger.error(f"Error checking dark frame cache: {e}")
+            return False
+
+    @pyqtSlot(str, 'QStringList', result=int)
+    def refreshDarkFrames(self, sensor_tag: str, serial_numbers: list = None) -> int:
+        """Capture dark histograms only for cameras whose cached dark frame is stale or out of band.
+
+        Returns the number of cameras that were re-captured.
+        """
+        try:
+            sensor_side = self._get_sensor_side(sensor_tag)
+            mutex = self._get_sensor_mutex(sensor_tag)
+            mutex.lock()
+            try:
+                try:
+                    temperature = self._interface.sensors[sensor_side].imu_get_temperature()
+                except Exception as e:
+                    # Without a temperature no cached frame can be trusted; capture them all
+                    logger.error(f"Failed to get camera temperature: {e}")
+                    temperature = None
+                camera_mapping = [0, 7, 1, 6, 2, 5, 3, 4]  # Same display order as captureAllCamerasHistogramToCSV
+                captured = 0
+                for display_idx, camera_idx in enumerate(camera_mapping):
+                    gain, exposure = self._camera_setting(sensor_side, camera_idx)
+                    if (temperature is not None
+                            and not self._dark_cache.needs_refresh(sensor_side, camera_idx, temperature, gain, exposure)):
+                        continue
+                    serial = serial_numbers[display_idx] if serial_numbers and display_idx < len(serial_numbers) else ""
+                    self.captureHistogramToCSV(sensor_tag, camera_idx, serial, True)
+                    captured += 1
+                logger.info(f"Dark frame refresh on {sensor_side}: {captured} of {len(camera_mapping)} cameras re-captured")
+                return captured
+            finally:
+                mutex.unlock()
+        except Exception as e:
+            logger.error(f"Error refreshing dark frames: {e}")
+            return 0
+
     @pyqtSlot(str, str)
     def on_connected(self, descriptor, port):
         """Handle device connection."""
         print(f"Device connected: {descriptor} on port {port}")
+        self._invalidate_device_cache(descriptor)
+        self._start_device_restore(descriptor)
         if descriptor.upper() == "SENSOR_LEFT":
             self._leftSensorConnected = True
         if descriptor.upper() == "SENSOR_RIGHT":
@@ -1440,10 +1902,16 @@ class MOTIONConnector(QObject):
     @pyqtSlot(str, str)
     def on_disconnected(self, descriptor, port):
         """Handle device disconnection."""
+        self._invalidate_device_cache(descriptor)
+        self._reconnect.mark_disconnected(device_key(descriptor))
         if descriptor.upper() == "SENSOR_LEFT":
             self._leftSensorConnected = False
+            self._stop_imu_stream("left")
+            self._stop_camera_stream_on("left")
         elif descriptor.upper() == "SENSOR_RIGHT":
             self._rightSensorConnected = False
+            self._stop_imu_stream("right")
+            self._stop_camera_stream_on("right")
         elif descriptor.upper() == "CONSOLE":
             self._consoleConnected = False
 
@@ -1451,6 +1919,7 @@ class MOTIONConnector(QObject):
             if self._console_status_thread:
                 self._console_status_thread.stop()
                 self._console_status_thread = None
+            self._safety_monitor.stop()
 
         self.signalDisconnected.emit(descriptor, port)
         self.connectionStatusChanged.emit() 
@@ -1469,19 +1938,27 @@ class MOTIONConnector(QObject):
             if target == "SENSOR_LEFT" or target == "SENSOR_RIGHT":                
                 sensor_tag = "left" if target == "SENSOR_LEFT" else "right"
                 mutex = self._get_sensor_mutex(target)
-                
-                mutex.lock()
-                try:
-                    fw_version = motion_interface.sensors[sensor_tag].get_version()
-                    logger.info(f"Version: {fw_version}")
-                    hw_id = motion_interface.sensors[sensor_tag].get_hardware_id()
-                    device_id = base58.b58encode(bytes.fromhex(hw_id)).decode()
-                    # Emit signal for async UI update
-                    self.sensorDeviceInfoReceived.emit(fw_version, device_id)
-                    self.sensorDeviceInfoReceivedEx.emit(target, fw_version, device_id)
-                    logger.info(f"Sensor Device Info - Firmware: {fw_version}, Device ID: {device_id}")
-                finally:
-                    mutex.unlock()
+
+                def fetch():
+                    mutex.lock()
+                    try:
+                        fw_version = motion_interface.sensors[sensor_tag].get_version()
+                        logger.info(f"Version: {fw_version}")
+                        hw_id = motion_interface.sensors[sensor_tag].get_hardware_id()
+                        device_id = base58.b58encode(bytes.fromhex(hw_id)).decode()
+                        self._reconnect.update(sensor_tag, hardware_id=hw_id, firmware_version=fw_version)
+                        logger.info(f"Sensor Device Info - Firmware: {fw_version}, Device ID: {device_id}")
+                        return fw_version, device_id
+                    finally:
+                        mutex.unlock()
+
+                fw_version, device_id = self._device_cache.get_or_fetch(
+                    ("sensor", sensor_tag, "info"), fetch, DEVICE_CACHE_TTL_S["info"]
+                )
+                self._sensor_fw_versions[sensor_tag] = fw_version
+                # Emit signal for async UI update
+                self.sensorDeviceInfoReceived.emit(fw_version, device_id)
+                self.sensorDeviceInfoReceivedEx.emit(target, fw_version, device_id)
             else:
                 logger.error(f"Invalid target for sensor info query: {target}")
                 return
@@ -1491,19 +1968,27 @@ class MOTIONConnector(QObject):
     @pyqtSlot()
     def queryConsoleInfo(self):
         """Fetch and emit device information."""        
-        self._console_mutex.lock()
+        def fetch():
+            self._console_mutex.lock()
+            try:
+                fw_version = motion_interface.console_module.get_version()
+                logger.info(f"Version: {fw_version}")
+                hw_id = motion_interface.console_module.get_hardware_id()
+                device_id = base58.b58encode(bytes.fromhex(hw_id)).decode()
+                board_id = motion_interface.console_module.read_board_id()
+                self._reconnect.update("console", hardware_id=hw_id, firmware_version=fw_version)
+                logger.info(f"Console Device Info - Firmware: {fw_version}, Device ID: {device_id}, Board ID: {board_id}")
+                return fw_version, device_id, str(board_id)
+            finally:
+                self._console_mutex.unlock()
+
         try:
-            fw_version = motion_interface.console_module.get_version()
-            logger.info(f"Version: {fw_version}")
-            hw_id = motion_interface.console_module.get_hardware_id()
-            device_id = base58.b58encode(bytes.fromhex(hw_id)).decode()
-            board_id = motion_interface.console_module.read_board_id()
-            self.consoleDeviceInfoReceived.emit(fw_version, device_id, str(board_id))
-            logger.info(f"Console Device Info - Firmware: {fw_version}, Device ID: {device_id}, Board ID: {board_id}")
+            fw_version, device_id, board_id = self._device_cache.get_or_fetch(
+                ("console", "info"), fetch, DEVICE_CACHE_TTL_S["info"]
+            )
+            self.consoleDeviceInfoReceived.emit(fw_version, device_id, board_id)
         except Exception as e:
             logger.error(f"Error querying device info: {e}")
-        finally:
-            self._console_mutex.unlock()
 
     @pyqtSlot()
     def queryConsoleLatestVersionInfo(self):
@@ -1566,6 +2051,7 @@ class MOTIONConnector(QObject):
                 try:
                     imu_temp = motion_interface.sensors[sensor_tag].imu_get_temperature()  
                     logger.info(f"Temperature Data - IMU Temp: {imu_temp}")
+                    self._settle.add(f"imu.{sensor_tag}.temp", time.time(), imu_temp)
                     # Emit signal for async UI update
                     self.temperatureSensorUpdated.emit(imu_temp)
                 finally:
@@ -1586,6 +2072,7 @@ class MOTIONConnector(QObject):
                 logger.error(f"Invalid RGB state value: {state}")
                 return
 
+            self._device_cache.invalidate("console", "rgb")
             if motion_interface.console_module.set_rgb_led(state) == state:
                 logger.info(f"RGB state set to: {state}")
             else:
@@ -1598,42 +2085,44 @@ class MOTIONConnector(QObject):
     @pyqtSlot()
     def queryRGBState(self):
         """Fetch and emit RGB state."""
-        self._console_mutex.lock()
         try:
-            state = motion_interface.console_module.get_rgb_led()
+            state = self._device_cache.get_or_fetch(
+                ("console", "rgb"), lambda: self._console_call("get_rgb_led"), DEVICE_CACHE_TTL_S["rgb"]
+            )
             state_text = {0: "Off", 1: "IND1", 2: "IND2", 3: "IND3"}.get(state, "Unknown")
 
             logger.info(f"RGB State: {state_text}")
             self.rgbStateReceived.emit(state, state_text)  # Emit both values
         except Exception as e:
             logger.error(f"Error querying RGB state: {e}")
-        finally:
-            self._console_mutex.unlock()
 
     @pyqtSlot()
     def queryFans(self):
         """Fetch and emit Fan Speed."""
-        self._console_mutex.lock()
         try:
-            fan_speed = motion_interface.console_module.get_fan_speed()
+            fan_speed = self._device_cache.get_or_fetch(
+                ("console", "fans"), lambda: self._console_call("get_fan_speed"), DEVICE_CACHE_TTL_S["fans"]
+            )
 
             logger.info(f"Fan Speed: {fan_speed}")
             self.fanSpeedsReceived.emit(fan_speed)  # Emit both values
         except Exception as e:
             logger.error(f"Error querying Fan Speeds: {e}")
-        finally:
-            self._console_mutex.unlock()
 
     @pyqtSlot(result=QVariant)
     def queryTriggerConfig(self):
-        self._console_mutex.lock()
+        def fetch():
+            trigger_setting = self._console_call("get_trigger_json")
+            # Parse once per fetch, not once per poll
+            if isinstance(trigger_setting, str) and trigger_setting:
+                return trigger_setting, json.loads(trigger_setting)
+            return trigger_setting, trigger_setting
+
         try:
-            trigger_setting = motion_interface.console_module.get_trigger_json()
+            trigger_setting, updateTrigger = self._device_cache.get_or_fetch(
+                ("console", "trigger"), fetch, DEVICE_CACHE_TTL_S["trigger"]
+            )
             if trigger_setting:
-                if isinstance(trigger_setting, str):
-                    updateTrigger = json.loads(trigger_setting)
-                else:
-                    updateTrigger = trigger_setting
                 if updateTrigger["TriggerStatus"] == 2:               
                     self._trigger_state = "ON"
                     self.triggerStateChanged.emit("ON")            
@@ -1645,8 +2134,291 @@ class MOTIONConnector(QObject):
             return trigger_setting or {}
         except Exception as e:
             logger.error(f"Error querying trigger configuration: {e}")
+
+    def _console_call(self, method, *args, **kwargs):
+        """Call a console_module method under the console mutex."""
+        self._console_mutex.lock()
+        try:
+            return getattr(motion_interface.console_module, method)(*args, **kwargs)
         finally:
             self._console_mutex.unlock()
+
+    def _invalidate_device_cache(self, target):
+        """Drop cached state of "CONSOLE", "SENSOR_LEFT" or "SENSOR_RIGHT"."""
+        target = target.upper()
+        if target == "CONSOLE":
+            self._device_cache.invalidate("console")
+        elif target in ("SENSOR_LEFT", "SENSOR_RIGHT"):
+            self._device_cache.invalidate("sensor", "left" if target == "SENSOR_LEFT" else "right")
+
+    @pyqtSlot(result=QVariant)
+    def deviceCacheStats(self):
+        """Hit/miss counts and hit rate of the device-state cache."""
+        return self._device_cache.stats()
+
+    def _start_device_restore(self, descriptor):
+        """Re-apply lost configuration to a re-enumerated device in the background."""
+        device = device_key(descriptor)
+        snap = self._reconnect.snapshot(device) if device else None
+        if snap is None or snap.hardware_id is None:
+            return  # first connection: normal bring-up
+        if device in self._restore_threads:
+            return
+
+        thread = _DeviceRestoreThread(self, descriptor)
+        thread.restored.connect(self._on_device_restored)
+        thread.finished.connect(lambda: self._restore_threads.pop(device, None))
+        self._restore_threads[device] = thread
+        thread.start()
+
+    def _read_live_state(self, device):
+        """Read back what plan_restore() compares against. Also refreshes the device cache."""
+        live = {}
+        if device == "console":
+            self._console_mutex.lock()
+            try:
+                console = motion_interface.console_module
+                hw_id = console.get_hardware_id()
+                fw_version = console.get_version()
+                board_id = console.read_board_id()
+                trigger = console.get_trigger_json()
+                live["trigger_config"] = json.loads(trigger) if isinstance(trigger, str) and trigger else (trigger or {})
+                live["fan_level"] = console.get_fan_speed()
+
+                snap = self._reconnect.snapshot(device)
+                readback = []
+                for param in (snap.laser_params or []) if snap else []:
+                    data, data_len = console.read_i2c_packet(
+                        mux_index=param["muxIdx"], channel=param["channel"], device_addr=param["i2cAddr"],
+                        reg_addr=param["offset"], read_len=len(param["dataToSend"])
+                    )
+                    readback.append(bytes(data[:data_len]) if data is not None and data_len else None)
+                live["laser_readback"] = readback
+            finally:
+                self._console_mutex.unlock()
+            device_id = base58.b58encode(bytes.fromhex(hw_id)).decode()
+            self._device_cache.put(("console", "info"), (fw_version, device_id, str(board_id)), DEVICE_CACHE_TTL_S["info"])
+        else:
+            mutex = self._get_sensor_mutex("SENSOR_LEFT" if device == "left" else "SENSOR_RIGHT")
+            mutex.lock()
+            try:
+                sensor = motion_interface.sensors[device]
+                hw_id = sensor.get_hardware_id()
+                fw_version = sensor.get_version()
+                live["camera_power_status"] = list(sensor.get_camera_power_status() or [])
+                live["fan_control"] = sensor.get_fan_control_status()
+            finally:
+                mutex.unlock()
+            device_id = base58.b58encode(bytes.fromhex(hw_id)).decode()
+            self._device_cache.put(("sensor", device, "info"), (fw_version, device_id), DEVICE_CACHE_TTL_S["info"])
+            self._sensor_fw_versions[device] = fw_version
+        live["hardware_id"] = hw_id
+        return live
+
+    def _apply_restore_action(self, device, action):
+        """Apply one action from plan_restore(); returns True on success."""
+        kind = action[0]
+        if device == "console":
+            self._console_mutex.lock()
+            try:
+                console = motion_interface.console_module
+                if kind == "trigger":
+                    self._device_cache.invalidate("console", "trigger")
+                    return bool(console.set_trigger_json(data=action[1]))
+                if kind == "fan_level":
+                    self._device_cache.invalidate("console", "fans")
+                    return console.set_fan_speed(fan_speed=action[1]) == action[1]
+                if kind == "laser":
+                    return self._write_laser_param(motion_interface, action[1])
+            finally:
+                self._console_mutex.unlock()
+        else:
+            mutex = self._get_sensor_mutex("SENSOR_LEFT" if device == "left" else "SENSOR_RIGHT")
+            mutex.lock()
+            try:
+                sensor = motion_interface.sensors[device]
+                if kind == "camera_power":
+                    return bool(sensor.enable_camera_power(action[1]))
+                if kind == "configure_camera":
+                    _, cam_idx, gain, exposure = action
+                    passed = self._configure_camera_locked(device, 1 << cam_idx, gain, exposure)
+                    self.cameraConfigUpdated.emit(1 << cam_idx, passed)
+                    return passed
+                if kind == "fan_control":
+                    self._device_cache.invalidate("sensor", device, "fan_control")
+                    return bool(sensor.set_fan_control(action[1]))
+            finally:
+                mutex.unlock()
+        raise ValueError(f"Unknown restore action for {device}: {kind}")
+
+    @pyqtSlot(str, bool, 'QVariant', float)
+    def _on_device_restored(self, descriptor, identity_ok, actions, seconds):
+        if not identity_ok:
+            logger.warning(f"{descriptor}: different hardware ID after reconnect, doing a full bring-up")
+        elif actions:
+            logger.info(f"{descriptor}: restored {', '.join(actions)} in {seconds * 1000:.0f} ms")
+        else:
+            logger.info(f"{descriptor}: reconnected with state intact ({seconds * 1000:.0f} ms)")
+        self.deviceStateRestored.emit(descriptor, identity_ok, actions, seconds)
+
+    def configureProfiling(self, mode, seconds=None, interval=None, out_dir=None):
+        """
+        Set up profiling from the command line.
+
+        Args:
+            mode (str): "startup" (profile the first `seconds`), "trigger" (profile
+                        every trigger run) or "manual" (Settings page only)
+            seconds (float): Window length for "startup" (default 30 s)
+            interval (float): Sampling interval in seconds
+            out_dir (str): Output directory (default ./profiles)
+        """
+        if interval:
+            self._profile_interval = float(interval)
+        if out_dir:
+            self._profile_dir = out_dir
+        if mode == "startup":
+            self.startProfiling(float(seconds or 30.0))
+        elif mode == "trigger":
+            self.triggerStateChanged.connect(self._on_trigger_state_for_profiling)
+        logger.info(f"Profiling mode '{mode}', output in {self._profile_dir}")
+
+    def _on_trigger_state_for_profiling(self, state):
+        if state == "ON" and not self.profilingActive:
+            self.startProfiling(0)
+        elif state == "OFF" and self.profilingActive:
+            self.stopProfiling()
+
+    @pyqtProperty(bool, notify=profilingStateChanged)
+    def profilingActive(self):
+        return self._profiling
+
+    @pyqtSlot(float, result=bool)
+    def startProfiling(self, seconds: float = 0):
+        """Sample all threads; stops after `seconds` (0 = until stopProfiling)."""
+        try:
+            if self.profilingActive:
+                return False
+            self._profiler = SamplingProfiler(self._profile_interval)
+            self._profile_outputs = {}
+            self._profiling = True
+            self._profiler.start(duration=seconds or None, on_finished=self._on_profile_finished)
+            window = f"{seconds:.0f} s" if seconds else "until stopped"
+            logger.info(f"Profiling started ({window}, {self._profile_interval * 1000:.0f} ms interval)")
+            self.profilingStateChanged.emit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to start profiler: {e}")
+            return False
+
+    @pyqtSlot()
+    def stopProfiling(self):
+        """Stop sampling without waiting; profileWritten carries the file path."""
+        if self._profiler is not None:
+            # The sampler thread writes the files; joining it would stall the GUI
+            self._profiler.stop(wait=False)
+
+    def _on_profile_finished(self, profiler):
+        # Runs in the sampler thread, so file writing stays off the GUI thread
+        self._profiling = False
+        try:
+            self._profile_outputs = profiler.write(self._profile_dir)
+            summary = profiler.summary()
+            logger.info(
+                f"Profile written: {self._profile_outputs['speedscope']} "
+                f"({summary['samples']} samples, {summary['overheadPct']:.2f}% sampler overhead)"
+            )
+            self.profileWritten.emit(self._profile_outputs["speedscope"])
+        except Exception as e:
+            logger.error(f"Failed to write profile: {e}")
+        self.profilingStateChanged.emit()
+
+    @pyqtSlot(result=QVariant)
+    def profilingSummary(self):
+        """Hottest leaf functions per thread of the current or last profile."""
+        return self._profiler.summary() if self._profiler is not None else {}
+
+    def startLoopMonitor(self):
+        """Start the GUI heartbeat and watchdog (call on the GUI thread)."""
+        self._loop_monitor.start()
+
+    @pyqtSlot(result=QVariant)
+    def loopLagReport(self):
+        """Heartbeat lag histogram, stall count and top blocking call sites."""
+        return self._loop_monitor.report()
+
+    @pyqtSlot(result=str)
+    def exportLoopLagReport(self):
+        """Write the loop lag report to app-logs/ and return its path."""
+        try:
+            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(os.getcwd(), "app-logs", f"loop-lag-{ts}.json")
+            self._loop_monitor.write_report(path)
+            logger.info(f"Loop lag report written: {path}")
+            return path
+        except Exception as e:
+            logger.error(f"Failed to write loop lag report: {e}")
+            return ""
+
+    @pyqtSlot(result=QVariant)
+    def lockStats(self):
+        """Per-lock, per-call-site acquisition, wait and hold statistics."""
+        return all_lock_stats()
+
+    @pyqtSlot(result=str)
+    def exportLockStats(self):
+        """Write lock statistics to app-logs/ and return the path."""
+        try:
+            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = export_lock_stats(os.path.join(os.getcwd(), "app-logs", f"lock-stats-{ts}.json"))
+            logger.info(f"Lock statistics written: {path}")
+            return path
+        except Exception as e:
+            logger.error(f"Failed to write lock statistics: {e}")
+            return ""
+
+    @pyqtSlot()
+    def resetLockStats(self):
+        for mutex in (self._console_mutex, self._i2c_mutex, self._left_sensor_mutex, self._right_sensor_mutex):
+            mutex.reset_stats()
+
+    @pyqtSlot()
+    def startBusTrace(self):
+        """Record every console/sensor call until stopBusTrace()."""
+        try:
+            self._bus_tracer.install(motion_interface)
+        except Exception as e:
+            logger.error(f"Failed to start bus trace: {e}")
+
+    @pyqtSlot(result=str)
+    def stopBusTrace(self):
+        """Remove the tracing proxies and export the trace; returns its path."""
+        if not self._bus_tracer.active:
+            return ""
+        self._bus_tracer.uninstall()
+        return self.exportBusTrace()
+
+    @pyqtSlot(result=str)
+    def exportBusTrace(self):
+        """Write the recorded calls to app-logs/ as Chrome trace JSON and return the path."""
+        try:
+            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(os.getcwd(), "app-logs", f"bus-trace-{ts}.json")
+            self._bus_tracer.export_chrome_trace(path)
+            logger.info(f"Bus trace written: {path} (open in chrome://tracing or ui.perfetto.dev)")
+            return path
+        except Exception as e:
+            logger.error(f"Failed to write bus trace: {e}")
+            return ""
+
+    @pyqtSlot(result=QVariant)
+    def busTraceSummary(self):
+        """Calls, errors, total and worst duration per traced command."""
+        return self._bus_tracer.summary()
+
+    @pyqtSlot(result=QVariant)
+    def reconnectReport(self):
+        """Cached per-device configuration and the recent restore history."""
+        return self._reconnect.report()
     
     @pyqtSlot(str, result=bool)
     def setTrigger(self, triggerjson):
@@ -1654,8 +2426,10 @@ class MOTIONConnector(QObject):
         try:
             json_trigger_data = json.loads(triggerjson)
             
+            self._device_cache.invalidate("console", "trigger")
             trigger_setting = motion_interface.console_module.set_trigger_json(data=json_trigger_data)
             if trigger_setting:
+                self._reconnect.update("console", trigger_config=json_trigger_data)
                 logger.info(f"Trigger Setting: {trigger_setting}")
                 return True
             else:
@@ -1679,8 +2453,13 @@ class MOTIONConnector(QObject):
     @pyqtSlot(result=bool)
     @pyqtSlot(str, result=bool)
     def startTrigger(self, triggerjson = None):
+        if self._safetyFailure:
+            # The latch only clears on a clean interlock read
+            logger.error("Trigger not started: safety failure still latched")
+            return False
         self._console_mutex.lock()
         try:
+            self._device_cache.invalidate("console", "trigger")
             if triggerjson:
                 json_trigger_data = json.loads(triggerjson)
                 
@@ -1689,6 +2468,7 @@ class MOTIONConnector(QObject):
                     logger.error("Error while setting trigger trigger not started")
                     return False
                 
+                self._reconnect.update("console", trigger_config=json_trigger_data)
                 logger.info(f"Trigger Setting: {trigger_setting}")
 
             success = motion_interface.console_module.start_trigger()
@@ -1704,6 +2484,9 @@ class MOTIONConnector(QObject):
                     self._console_status_thread.statusUpdate.connect(self.handleUpdateCapStatus)  # Or define a dedicated signal
                     self._console_status_thread.start()
 
+                # Start the interlock watchdog at high priority
+                self._safety_monitor.start_monitoring()
+
                 self._trigger_state = "ON"
                 self.triggerStateChanged.emit("ON")
             return success
@@ -1717,62 +2500,149 @@ class MOTIONConnector(QObject):
     @pyqtSlot()
     def stopTrigger(self): 
         try:
-            # (1) Figure out if we're being called from inside the status thread
-            current_thread = QThread.currentThread()
-            called_from_status_thread = (
-                self._console_status_thread is not None
-                and current_thread is self._console_status_thread
-            )
-
-            # (2) Stop the polling thread
-            if self._console_status_thread:
-                # If we're in the SAME thread, don't self.join().
-                if called_from_status_thread:
-                    # Just tell the thread loop to exit after this iteration
-                    self._console_status_thread._running = False
-                    self._console_status_thread._wait_condition.wakeAll()
-                    # Do NOT .wait() here
-                else:
-                    # Safe to fully stop/join from another thread (e.g. UI button)
-                    self._console_status_thread.stop()
-                    self._console_status_thread = None
-
-            # (3) Close out the run log
-            self._stop_runlog()
-
-            # (4) Tell console to stop firing
-            self._console_mutex.lock()
-            try:
-                motion_interface.console_module.stop_trigger()
-            finally:
-                self._console_mutex.unlock()
+            # (1) Tell console to stop firing first; bookkeeping can wait
+            self._stop_console_trigger()
 
-            # (5) Update state
-            self._trigger_state = "OFF"
-            self.triggerStateChanged.emit("OFF")
+            # (2) Stop polling threads, close the run log and update state
+            self._finish_trigger_stop()
 
             return True
 
         except Exception as e:
             logger.error(f"Unexpected error while stopping trigger: {e}")
             return False
-    
-    @pyqtSlot(str)
-    def querySensorAccelerometer (self, target: str):
-        """Fetch and emit Accelerometer data with mutex protection and event-based UI updates."""
+
+    def _stop_console_trigger(self):
+        """Stop the console trigger immediately. Safe to call from any thread."""
+        self._console_mutex.lock()
         try:
-            if target == "SENSOR_LEFT" or target == "SENSOR_RIGHT":                
-                sensor_tag = "left" if target == "SENSOR_LEFT" else "right"
-                mutex = self._get_sensor_mutex(target)
-                
-                mutex.lock()
-                try:
-                    accel = motion_interface.sensors[sensor_tag].imu_get_accelerometer()
-                    logger.info(f"Accel (raw): X={accel[0]}, Y={accel[1]}, Z={accel[2]}")
-                    # Emit signal for async UI update
-                    self.accelerometerSensorUpdated.emit(accel[0], accel[1], accel[2])
-                finally:
-                    mutex.unlock()
+            motion_interface.console_module.stop_trigger()
+        finally:
+            self._console_mutex.unlock()
+            self._device_cache.invalidate("console", "trigger")
+
+    def _finish_trigger_stop(self):
+        """Bookkeeping after the console trigger was stopped."""
+        # (1) Figure out if we're being called from inside the status thread
+        current_thread = QThread.currentThread()
+        called_from_status_thread = (
+            self._console_status_thread is not None
+            and current_thread is self._console_status_thread
+        )
+
+        # (2) Stop the polling thread
+        if self._console_status_thread:
+            # If we're in the SAME thread, don't self.join().
+            if called_from_status_thread:
+                # Just tell the thread loop to exit after this iteration
+                self._console_status_thread._running = False
+                self._console_status_thread._wait_condition.wakeAll()
+                # Do NOT .wait() here
+            else:
+                # Safe to fully stop/join from another thread (e.g. UI button)
+                self._console_status_thread.stop()
+                self._console_status_thread = None
+
+        # (3) Stop the interlock watchdog (does not join when called from it)
+        self._safety_monitor.stop()
+
+        # (4) Close out the run log
+        self._stop_runlog()
+
+        # (5) Update state
+        self._trigger_state = "OFF"
+        self.triggerStateChanged.emit("OFF")
+
+    def _read_safety_registers(self):
+        """Read the SE/SO interlock status bytes from the console."""
+        statuses = {}
+        self._console_mutex.lock()
+        try:
+            for label, channel in SAFETY_CHANNELS.items():
+                data, data_len = motion_interface.console_module.read_i2c_packet(
+                    mux_index=SAFETY_MUX_IDX, channel=channel, device_addr=SAFETY_I2C_ADDR,
+                    reg_addr=SAFETY_OFFSET, read_len=1
+                )
+                if data is None or data_len == 0:
+                    raise Exception(f"{label} I2C read error")
+                statuses[label] = data[0]
+        finally:
+            self._console_mutex.unlock()
+        return statuses
+
+    @pyqtSlot(str)
+    def _on_safety_fault(self, status_text: str):
+        """Runs in the GUI thread after the trigger has already been stopped."""
+        # Log and count a latched fault once, but always finish a running trigger
+        first = not self._safetyFailure
+        if first:
+            self._safetyFailure = True
+            if self._run_summary is not None:
+                self._run_summary.count_event("safety_faults")
+            logger.error(f"Failure Detected: {status_text}")
+            run_logger.error(f"Safety Failure - {status_text}")
+        if self._trigger_state == "ON":
+            self._finish_trigger_stop()
+            self.laserStateChanged.emit(False)
+        if first:
+            self.safetyFailureStateChanged.emit(True)
+
+    @pyqtSlot()
+    def _on_safety_cleared(self):
+        if self._safetyFailure:
+            self._safetyFailure = False
+            self.safetyFailureStateChanged.emit(False)
+
+    @pyqtSlot(str)
+    def _on_safety_read_error(self, message: str):
+        if self._run_summary is not None:
+            self._run_summary.count_event("safety_read_errors")
+        logger.error(f"Safety monitor read failed: {message}")
+        self.handleUpdateCapStatus("Safety Disconnected")
+
+    @pyqtSlot(result=QVariant)
+    def safetyLatencyReport(self):
+        """Detection/stop/read latency histograms of the safety monitor."""
+        return self._safety_monitor.report()
+
+    @pyqtSlot()
+    def resetSafetyLatency(self):
+        for hist in (self._safety_monitor.detection_latency,
+                     self._safety_monitor.stop_latency,
+                     self._safety_monitor.read_latency):
+            hist.reset()
+
+    @pyqtSlot(int, int)
+    def simulateSafetyFault(self, se: int = 0x01, so: int = 0x00):
+        """Inject an SE/SO fault into the safety monitor's register source."""
+        logger.warning(f"Simulated safety fault injected (SE: 0x{se:02X}, SO: 0x{so:02X})")
+        self._safety_source.inject(se, so)
+
+    @pyqtSlot()
+    def clearSimulatedSafetyFault(self):
+        self._safety_source.clear()
+
+    @pyqtSlot(str)
+    def querySensorAccelerometer (self, target: str):
+        """Fetch and emit Accelerometer data with mutex protection and event-based UI updates."""
+        try:
+            if target == "SENSOR_LEFT" or target == "SENSOR_RIGHT":                
+                sensor_tag = "left" if target == "SENSOR_LEFT" else "right"
+                latest = self._imu_stream_latest(sensor_tag)
+                if latest is not None:
+                    # Streaming: answer from the ring instead of another bus read
+                    self.accelerometerSensorUpdated.emit(int(latest["ax"]), int(latest["ay"]), int(latest["az"]))
+                    return
+                mutex = self._get_sensor_mutex(target)
+                
+                mutex.lock()
+                try:
+                    accel = motion_interface.sensors[sensor_tag].imu_get_accelerometer()
+                    logger.info(f"Accel (raw): X={accel[0]}, Y={accel[1]}, Z={accel[2]}")
+                    # Emit signal for async UI update
+                    self.accelerometerSensorUpdated.emit(accel[0], accel[1], accel[2])
+                finally:
+                    mutex.unlock()
             else:
                 logger.error(f"Invalid target for sensor info query: {target}")
                 return
@@ -1780,15 +2650,171 @@ class MOTIONConnector(QObject):
             logger.error(f"Error querying Accelerometer data: {e}")
 
     @pyqtSlot()
-    def querySensorGyroscope (self):
-        """Fetch and emit Gyroscope data."""
+    @pyqtSlot(str)
+    def querySensorGyroscope (self, target: str = "SENSOR_LEFT"):
+        """Fetch and emit Gyroscope data with mutex protection and event-based UI updates."""
         try:
-            gyro  = motion_interface.sensors["left"].imu_get_gyroscope()
-            logger.info(f"Gyro  (raw): X={gyro[0]}, Y={gyro[1]}, Z={gyro[2]}")
-            self.gyroscopeSensorUpdated.emit(gyro[0], gyro[1], gyro[2])
+            if target == "SENSOR_LEFT" or target == "SENSOR_RIGHT":
+                sensor_tag = "left" if target == "SENSOR_LEFT" else "right"
+                latest = self._imu_stream_latest(sensor_tag)
+                if latest is not None:
+                    self.gyroscopeSensorUpdated.emit(int(latest["gx"]), int(latest["gy"]), int(latest["gz"]))
+                    return
+                mutex = self._get_sensor_mutex(target)
+
+                mutex.lock()
+                try:
+                    gyro = motion_interface.sensors[sensor_tag].imu_get_gyroscope()
+                    logger.info(f"Gyro  (raw): X={gyro[0]}, Y={gyro[1]}, Z={gyro[2]}")
+                    self.gyroscopeSensorUpdated.emit(gyro[0], gyro[1], gyro[2])
+                finally:
+                    mutex.unlock()
+            else:
+                logger.error(f"Invalid target for sensor info query: {target}")
+                return
         except Exception as e:
             logger.error(f"Error querying Gyroscope data: {e}")
 
+    def _imu_stream_latest(self, side):
+        """Latest streamed IMU sample of a side if it is fresh, else None."""
+        thread = self._imu_threads.get(side)
+        if thread is None:
+            return None
+        latest = self._imu_rings[side].latest()
+        if latest is None or time.time() - latest["t"] > 2.0 / IMU_STREAM_UI_RATE_HZ:
+            return None
+        return latest
+
+    def _read_imu_sample(self, side, with_temp):
+        """One accelerometer/gyroscope (and temperature) read for the IMU stream thread."""
+        mutex = self._get_sensor_mutex("SENSOR_LEFT" if side == "left" else "SENSOR_RIGHT")
+        if not mutex.tryLock(IMU_LOCK_TIMEOUT_MS):
+            return None
+        try:
+            sensor = motion_interface.sensors[side]
+            accel = sensor.imu_get_accelerometer()
+            gyro = sensor.imu_get_gyroscope()
+            temp = sensor.imu_get_temperature() if with_temp else None
+        finally:
+            mutex.unlock()
+        if temp is not None:
+            self._settle.add(f"imu.{side}.temp", time.time(), temp)
+        return accel, gyro, temp
+
+    @pyqtSlot(str, result=bool)
+    @pyqtSlot(str, float, result=bool)
+    def startImuStream(self, target: str, rate_hz: float = 0.0):
+        """
+        Sample accelerometer, gyroscope and temperature of one sensor
+        continuously; the UI gets imuStreamUpdated at IMU_STREAM_UI_RATE_HZ.
+
+        Args:
+            target (str): "SENSOR_LEFT" or "SENSOR_RIGHT"
+            rate_hz (float): Sample rate (0: IMU_STREAM_RATE_HZ)
+
+        Returns:
+            bool: True if the stream is running
+        """
+        try:
+            side = self._get_sensor_side(target)
+        except ValueError as e:
+            logger.error(str(e))
+            return False
+        if side in self._imu_threads:
+            return True
+        connected = self._leftSensorConnected if side == "left" else self._rightSensorConnected
+        if not connected:
+            logger.error(f"Cannot stream IMU: {side} sensor not connected")
+            return False
+        ring = self._imu_rings[side]
+        ring.clear()
+        # Parented so a read still hanging at stop cannot take the thread down with it
+        thread = _ImuStreamThread(self, side, ring, rate_hz or IMU_STREAM_RATE_HZ, parent=self)
+        thread.updated.connect(self.imuStreamUpdated)
+        thread.finished.connect(thread.deleteLater)
+        self._imu_threads[side] = thread
+        thread.start()
+        logger.info(f"IMU stream started on {side} sensor at {thread.sampler.rate_hz:.0f} Hz")
+        return True
+
+    @pyqtSlot(str)
+    def stopImuStream(self, target: str):
+        try:
+            self._stop_imu_stream(self._get_sensor_side(target))
+        except ValueError as e:
+            logger.error(str(e))
+
+    def _stop_imu_stream(self, side):
+        thread = self._imu_threads.pop(side, None)
+        if thread is not None:
+            thread.stop()
+            thread.wait(2000)
+            stats = thread.sampler.stats()
+            logger.info(f"IMU stream stopped on {side} sensor: {stats['samples']} samples "
+                        f"({stats['achievedHz']:.1f} Hz), {stats['skipped']} skipped, {stats['errors']} errors")
+
+    @pyqtSlot(result=QVariant)
+    def imuStreamStats(self):
+        """Per running side: samples, skipped (sensor busy), errors, late, rateHz, achievedHz."""
+        return {side: thread.sampler.stats() for side, thread in self._imu_threads.items()}
+
+    @pyqtSlot(str, float, int, result=QVariant)
+    def imuSeries(self, target: str, seconds: float, max_points: int):
+        """
+        Min/max/mean buckets of one side's IMU samples over the last `seconds`.
+
+        Returns:
+            dict: t (seconds relative to now, negative) and per field {min, max, mean}
+        """
+        try:
+            now = time.time()
+            series = self._imu_rings[self._get_sensor_side(target)].decimated(max(2, max_points), now - seconds)
+            series["t"] = [t - now for t in series["t"]]
+            return series
+        except Exception as e:
+            logger.error(f"Error reading IMU series: {e}")
+            return {}
+
+    @pyqtSlot(str, result=str)
+    @pyqtSlot(str, str, result=str)
+    def exportImuAligned(self, target: str, base_path: str = ""):
+        """
+        Write one side's streamed IMU samples and its histogram frame
+        statistics with the IMU values at each frame time.
+
+        Args:
+            target (str): "SENSOR_LEFT" or "SENSOR_RIGHT"
+            base_path (str): Files are <base>.imu-<side>.csv and
+                             <base>.imu-<side>-frames.csv (default: run-logs/imu-<timestamp>)
+
+        Returns:
+            str: Path of the frame table, or "" on error
+        """
+        try:
+            side = self._get_sensor_side(target)
+            if not base_path:
+                run_dir = os.path.join(os.getcwd(), "run-logs")
+                os.makedirs(run_dir, exist_ok=True)
+                base_path = os.path.join(run_dir, datetime.datetime.now().strftime("imu-%Y%m%d_%H%M%S"))
+            return self._export_imu(side, base_path)
+        except Exception as e:
+            logger.error(f"Error exporting IMU data: {e}")
+            return ""
+
+    def _export_imu(self, side, base_path, since=None):
+        ring = self._imu_rings[side]
+        t, data = ring.samples(since)
+        write_samples_csv(f"{base_path}.imu-{side}.csv", t, data)
+        frames = {}
+        for camera_index in range(8):
+            series = self._speckle.buffer.series(camera_slot(side, camera_index), since)
+            if len(series["t"]):
+                frames[camera_index + 1] = {"t": series["t"], "mean": series["mean"], "contrast": series["contrast"]}
+        frames_path = f"{base_path}.imu-{side}-frames.csv"
+        rows = write_aligned_csv(frames_path, ring, frames)
+        logger.info(f"IMU export ({side}): {len(t)} samples, {rows} frames -> {frames_path}")
+        return frames_path
+
     @pyqtSlot(str, int)
     def configureCamera(self, target:str, cam_mask: int):
         """Configure camera with mutex protection and event-based UI updates."""
@@ -1797,27 +2823,12 @@ class MOTIONConnector(QObject):
                 sensor_tag = "left" if target == "SENSOR_LEFT" else "right"
                 mutex = self._get_sensor_mutex(target)
                 
+                gain, exposure = self._exposure_cache.get(sensor_tag, cam_mask.bit_length() - 1) or (
+                    DEFAULT_CAMERA_GAIN, DEFAULT_CAMERA_EXPOSURE_US
+                )
                 mutex.lock()
                 try:
-                    passed_flash = motion_interface.sensors[sensor_tag].program_fpga(camera_position=cam_mask, manual_process=False)
-                    passed_configure =  motion_interface.sensors[sensor_tag].camera_configure_registers(camera_position=cam_mask)
-
-                    if not passed_flash or not passed_configure:
-                        logger.error(f"Failed to configure camera {sensor_tag} with mask {cam_mask}")
-                        self.cameraConfigUpdated.emit(cam_mask, False)
-                        return
-
-                    gain = 16
-                    exposure = 600
-                    print(f"Switching camera to {cam_mask}")
-                    cam_position = cam_mask.bit_length() - 1
-                    passed_sw = motion_interface.sensors[sensor_tag].switch_camera(cam_position)
-                    print(f"Setting gain to {gain}")
-                    passed_gain= motion_interface.sensors[sensor_tag].camera_set_gain(gain)
-                    print(f"Setting exposure to {exposure}")
-                    passed_exposure = motion_interface.sensors[sensor_tag].camera_set_exposure(0,us=exposure)
-                    print(f"Camera {sensor_tag} with mask {cam_mask} configured with gain {gain} and exposure {exposure}")
-                    passed = passed_flash and passed_configure and passed_sw and passed_gain and passed_exposure
+                    passed = self._configure_camera_locked(sensor_tag, cam_mask, gain, exposure)
                     self.cameraConfigUpdated.emit(cam_mask, passed)
                 finally:
                     mutex.unlock()
@@ -1828,6 +2839,130 @@ class MOTIONConnector(QObject):
             logger.error(f"Error configuring Camera {cam_mask}: {e}")
             self.cameraConfigUpdated.emit(cam_mask, False)
         
+    def _configure_camera_locked(self, sensor_tag, cam_mask, gain, exposure):
+        """Program the FPGA and registers of one camera, then set gain/exposure. Caller holds the sensor mutex."""
+        passed_flash = motion_interface.sensors[sensor_tag].program_fpga(camera_position=cam_mask, manual_process=False)
+        passed_configure =  motion_interface.sensors[sensor_tag].camera_configure_registers(camera_position=cam_mask)
+
+        if not passed_flash or not passed_configure:
+            logger.error(f"Failed to configure camera {sensor_tag} with mask {cam_mask}")
+            return False
+
+        print(f"Switching camera to {cam_mask}")
+        cam_position = cam_mask.bit_length() - 1
+        passed_sw = motion_interface.sensors[sensor_tag].switch_camera(cam_position)
+        print(f"Setting gain to {gain}")
+        passed_gain= motion_interface.sensors[sensor_tag].camera_set_gain(gain)
+        print(f"Setting exposure to {exposure}")
+        passed_exposure = motion_interface.sensors[sensor_tag].camera_set_exposure(0,us=exposure)
+        print(f"Camera {sensor_tag} with mask {cam_mask} configured with gain {gain} and exposure {exposure}")
+        if passed_gain and passed_exposure:
+            self._camera_settings[(sensor_tag, cam_position)] = (gain, exposure)
+            self._reconnect.record_camera(sensor_tag, cam_position, gain, exposure)
+        return bool(passed_sw and passed_gain and passed_exposure)
+
+    @pyqtSlot(str, int, result=bool)
+    @pyqtSlot(str, int, float, result=bool)
+    def autoExposure(self, target: str, cam_mask: int, target_mean: float = AUTO_EXPOSURE_TARGET_MEAN):
+        """
+        Search gain/exposure per camera until light histograms reach target_mean.
+
+        Cameras must be configured. Cameras of one sensor share its USB link and
+        are searched one after another; the left and right sensors run in parallel.
+
+        Args:
+            target: "SENSOR_LEFT", "SENSOR_RIGHT" or "ALL"
+            cam_mask: Cameras to search (bit i = camera i)
+            target_mean: Weighted mean bin to aim for
+
+        Returns:
+            bool: False if a search is already running or the target is invalid
+        """
+        if self._auto_exposure_threads:
+            logger.warning("autoExposure: a search is already running")
+            return False
+        if target == "ALL":
+            sides = [s for s, ok in (("left", self._leftSensorConnected), ("right", self._rightSensorConnected)) if ok]
+        elif target in ("SENSOR_LEFT", "SENSOR_RIGHT"):
+            sides = [self._get_sensor_side(target)]
+        else:
+            logger.error(f"Invalid target for auto-exposure: {target}")
+            return False
+        cameras = [i for i in range(8) if (cam_mask >> i) & 1]
+        if not sides or not cameras:
+            return False
+
+        self._auto_exposure_results = {}
+        search = ExposureSearch(target_mean=target_mean)
+        for side in sides:
+            thread = _AutoExposureThread(self, side, cameras, search)
+            thread.step.connect(self.autoExposureStep)
+            thread.done.connect(self._on_auto_exposure_done)
+            self._auto_exposure_threads[side] = thread
+        logger.info(f"Auto-exposure on {', '.join(sides)} cameras {[c + 1 for c in cameras]}, target mean {target_mean:.0f}")
+        for thread in list(self._auto_exposure_threads.values()):
+            thread.start()
+        return True
+
+    def _auto_exposure_capture(self, side, camera_index, gain, exposure):
+        """Apply gain/exposure and capture one light histogram (auto-exposure thread)."""
+        mutex = self._get_sensor_mutex("SENSOR_LEFT" if side == "left" else "SENSOR_RIGHT")
+        mutex.lock()
+        try:
+            sensor = motion_interface.sensors[side]
+            if not (sensor.switch_camera(camera_index) and sensor.camera_set_gain(gain)
+                    and sensor.camera_set_exposure(0, us=exposure)):
+                logger.error(f"Auto-exposure: could not set gain {gain} / exposure {exposure} on {side} camera {camera_index + 1}")
+                return None
+            self._camera_settings[(side, camera_index)] = (gain, exposure)
+            bins, _ = self._interface.get_camera_histogram(
+                sensor_side=side,
+                camera_id=camera_index,
+                test_pattern_id=4,
+                auto_upload=True
+            )
+        finally:
+            mutex.unlock()
+        if not bins:
+            return None
+        bins[0] = bins[0] - 6  # delete the sentinel value from the histogram
+        return bins[:1024]
+
+    def _finish_auto_exposure(self, side, camera_index, result):
+        """Keep the searched setting on the camera and remember it (auto-exposure thread)."""
+        if not result["captures"]:
+            logger.error(f"Auto-exposure on {side} camera {camera_index + 1}: {result['reason']}")
+            return
+        gain, exposure = result["gain"], result["exposure"]
+        if (gain, exposure) != self._camera_settings.get((side, camera_index)):
+            # The last capture was not the best one; go back to the best setting
+            self._auto_exposure_capture(side, camera_index, gain, exposure)
+        self._reconnect.record_camera(side, camera_index, gain, exposure)
+        if result["converged"]:
+            self._exposure_cache.store(side, camera_index, gain, exposure, result["mean"])
+        run_logger.info(
+            f"Auto Exposure - {side} camera {camera_index + 1}: gain {gain}, exposure {exposure} us, "
+            f"mean {result['mean']:.1f} after {result['captures']} captures ({result['reason']})"
+        )
+
+    @pyqtSlot(str, 'QVariant')
+    def _on_auto_exposure_done(self, side, results):
+        thread = self._auto_exposure_threads.pop(side, None)
+        if thread is not None:
+            thread.wait()
+        self._auto_exposure_results.update(results)
+        if not self._auto_exposure_threads:
+            self.autoExposureFinished.emit(dict(self._auto_exposure_results))
+
+    @pyqtSlot(result=QVariant)
+    def autoExposureCache(self):
+        """Converged gain/exposure per "side:camera" used by configureCamera."""
+        return self._exposure_cache.to_dict()
+
+    @pyqtSlot()
+    def clearAutoExposureCache(self):
+        self._exposure_cache.clear()
+
     @pyqtSlot(str)
     def configureAllCameras(self, target: str):
         for i in range(8):
@@ -1989,7 +3124,11 @@ class MOTIONConnector(QObject):
     @pyqtSlot(str, int, int, int, int, list, result=bool)
     def i2cWriteBytes(self, target: str, mux_idx: int, channel: int, i2c_addr: int, offset: int, data: list[int]) -> bool:
         """Send i2c write to device"""
-        QMutexLocker(self._i2c_mutex)  # Lock auto-released at function exit
+        with self._i2c_mutex:
+            return self._i2c_write_bytes(target, mux_idx, channel, i2c_addr, offset, data)
+
+    def _i2c_write_bytes(self, target, mux_idx, channel, i2c_addr, offset, data):
+        console_locked = False
         try:
             logger.debug(
                 f"I2C Write Request -> target={target}, mux_idx={mux_idx}, channel={channel}, "
@@ -2009,6 +3148,7 @@ class MOTIONConnector(QObject):
 
             if target == "CONSOLE":
                 self._console_mutex.lock()
+                console_locked = True
                 if motion_interface.console_module.write_i2c_packet(mux_index=mux_idx, channel=channel, device_addr=i2c_addr, reg_addr=offset, data=byte_data):
                     logger.debug("Write I2C Success")
                     return True
@@ -2022,7 +3162,7 @@ class MOTIONConnector(QObject):
             logger.error(f"Error sending i2c write command: {e}")
             return False
         finally:
-            if target == "CONSOLE":
+            if console_locked:
                 self._console_mutex.unlock()      
         
     @pyqtSlot(str)
@@ -2030,6 +3170,7 @@ class MOTIONConnector(QObject):
         """reset hardware Sensor device."""
         self._console_mutex.lock()
         try:
+            self._invalidate_device_cache(target)
             
             if target == "CONSOLE":
                 if motion_interface.console_module.soft_reset():
@@ -2079,8 +3220,9 @@ class MOTIONConnector(QObject):
         """Set Fan Level to device."""
         self._console_mutex.lock()
         try:
-            
+            self._device_cache.invalidate("console", "fans")
             if motion_interface.console_module.set_fan_speed(fan_speed=speed) == speed:
+                self._reconnect.update("console", fan_level=speed)
                 logger.info("Fan set successfully")
                 return True
             else:   
@@ -2162,9 +3304,252 @@ class MOTIONConnector(QObject):
         except Exception as e:
             logger.error(f"Failed to save histogram: {e}")
 
+    def _ingest_frames(self, sensor_side, camera_indices, frames, timestamp=None):
+        """Feed a block of light histogram frames (one per camera) to the streaming analysis."""
+        try:
+            timestamp = time.time() if timestamp is None else timestamp
+            block = np.asarray(frames, dtype=np.float64).reshape(len(camera_indices), -1)[:, :1024]
+            if block.shape[1] != 1024:
+                return
+            recorder = self._session_recorder
+            if recorder is not None and self._replay_thread is None:
+                recorder.record_frames(sensor_side, camera_indices, block, timestamp)
+            bus = self._frame_bus
+            if bus is not None:
+                # A bus problem must not cost the local statistics
+                try:
+                    bus.publish_frames(sensor_side, camera_indices, block, timestamp)
+                except Exception as e:
+                    logger.error(f"Error publishing frames to the frame bus: {e}")
+            slots = [camera_slot(sensor_side, idx) for idx in camera_indices]
+            self._bin_stats.update(slots, block)
+            self._speckle.process(timestamp, slots, block)
+        except Exception as e:
+            logger.error(f"Error updating frame statistics: {e}")
+
+    @pyqtSlot(result=str)
+    @pyqtSlot(str, result=str)
+    def startFrameBus(self, name: str = ""):
+        """
+        Publish frames and telemetry to a shared-memory ring for other local
+        processes (see frame_bus.FrameBusSubscriber).
+
+        Returns:
+            str: The segment name, or "" on error
+        """
+        if self._frame_bus is not None:
+            return self._frame_bus.name
+        try:
+            self._frame_bus = FrameBusPublisher(name or FRAME_BUS_NAME)
+            logger.info(f"Frame bus started: {self._frame_bus.name} ({self._frame_bus.stats()['bytes'] / 1e6:.1f} MB)")
+            return self._frame_bus.name
+        except Exception as e:
+            logger.error(f"Error starting frame bus: {e}")
+            return ""
+
+    @pyqtSlot()
+    def stopFrameBus(self):
+        bus, self._frame_bus = self._frame_bus, None
+        if bus is not None:
+            stats = bus.stats()
+            bus.close()
+            logger.info(f"Frame bus stopped after {stats['frames']} frames, {stats['telemetry']} telemetry snapshots")
+
+    @pyqtSlot(result=QVariant)
+    def frameBusStats(self):
+        """Published counts and ring sizes, or {} when the bus is off."""
+        bus = self._frame_bus
+        return bus.stats() if bus is not None else {}
+
+    @pyqtSlot(result=QVariant)
+    def speckleLatest(self):
+        """Latest (t, mean, std, contrast) of every camera that has streamed frames."""
+        out = self._speckle.buffer.latest()
+        for row in out:
+            row["side"], row["camera"] = slot_camera(row["channel"])
+        return out
+
+    @pyqtSlot(str, int, int, str, result=QVariant)
+    def speckleSeries(self, sensor_side: str, camera_index: int, max_points: int = 500, field: str = "contrast"):
+        """Downsampled (t, min, max, mean) series of one camera's mean/std/contrast for plotting."""
+        try:
+            return self._speckle.buffer.downsampled(
+                camera_slot(sensor_side, camera_index), max(2, max_points), field or "contrast"
+            )
+        except Exception as e:
+            logger.error(f"Error reading speckle series: {e}")
+            return {}
+
+    @pyqtSlot()
+    def resetSpeckleSeries(self):
+        self._speckle.buffer.clear()
+
+    @pyqtSlot(result=QVariant)
+    def frameStatisticsSummary(self):
+        """Per-camera frame count and frame-to-frame noise from the running statistics."""
+        return self._bin_stats.summary()
+
+    @pyqtSlot(str, int, result=QVariant)
+    def frameStatisticsBins(self, sensor_side: str, camera_index: int):
+        """Per-bin running mean/std (and EWMA variants) for one camera, as lists for plotting."""
+        try:
+            snap = self._bin_stats.snapshot([camera_slot(sensor_side, camera_index)])
+            return {
+                "frames": int(snap["count"][0]),
+                "mean": snap["mean"][0].tolist(),
+                "std": snap["std"][0].tolist(),
+                "ewmaMean": snap["ewma_mean"][0].tolist(),
+                "ewmaStd": snap["ewma_std"][0].tolist(),
+            }
+        except Exception as e:
+            logger.error(f"Error reading frame statistics: {e}")
+            return {}
+
+    @pyqtSlot(str, result=bool)
+    def exportFrameStatistics(self, path: str) -> bool:
+        """Export the running statistics of all cameras to a .npz file."""
+        try:
+            if not path:
+                ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                path = os.path.join(self._csv_output_directory, f"frame_statistics_{ts}.npz")
+            self._bin_stats.export(path)
+            logger.info(f"Frame statistics exported to {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to export frame statistics: {e}")
+            return False
+
+    @pyqtSlot()
+    def resetFrameStatistics(self):
+        self._bin_stats.reset()
+        logger.info("Frame statistics reset")
+
+    @pyqtSlot(str, result=str)
+    def startSessionRecording(self, path: str = ""):
+        """Record frames and telemetry to a session file for later replay; returns its path."""
+        try:
+            if self._session_recorder is not None:
+                return self._session_recorder.path
+            if not path:
+                ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                path = os.path.join(os.getcwd(), "sessions", f"session-{ts}.omsession")
+            self._session_recorder = SessionRecorder(path)
+            logger.info(f"Recording session to {path}")
+            return path
+        except Exception as e:
+            logger.error(f"Failed to start session recording: {e}")
+            return ""
+
+    @pyqtSlot(result=QVariant)
+    def stopSessionRecording(self):
+        """Close the session file; returns its path and record counts."""
+        recorder, self._session_recorder = self._session_recorder, None
+        if recorder is None:
+            return {}
+        stats = recorder.close()
+        logger.info(f"Session recorded: {stats['path']} ({stats['frames']} frames, {stats['telemetry']} telemetry)")
+        return stats
+
+    @staticmethod
+    def _storage_dir(name):
+        if name == "downloads":
+            return str(_downloads_dir())
+        return os.path.join(os.getcwd(), name)
+
+    def _storage_in_use(self):
+        """Files the storage manager must leave alone (storage thread)."""
+        paths = [self._runlog_path]
+        for name in ("ow-testapp", "runlog", ""):
+            paths += [h.baseFilename for h in logging.getLogger(name).handlers
+                      if isinstance(h, logging.FileHandler)]
+        paths += [bin_path for _, bin_path, _, _ in list(self._fw_temp_files.values())]
+        recorder = self._session_recorder
+        if recorder is not None:
+            paths.append(recorder.path)
+        return paths
+
+    @pyqtSlot(result=QVariant)
+    def storageStatus(self):
+        """Last storage sweep per directory: files, bytes, compressed, deleted, freedBytes, savedBytes."""
+        return {os.path.basename(d): r for d, r in self._storage.last_sweep().items()}
+
+    @pyqtSlot(str, result=QVariant)
+    def storageIndex(self, name: str):
+        """Files of a managed directory ("app-logs", "run-logs", "downloads") as of the last sweep."""
+        if name not in STORAGE_POLICIES:
+            logger.error(f"Not a managed directory: {name}")
+            return []
+        return self._storage.index(self._storage_dir(name))
+
+    @pyqtSlot()
+    def runStorageMaintenance(self):
+        """Compress and prune now instead of at the next interval (runs in the background)."""
+        self._storage.request_sweep()
+
+    @pyqtSlot(str, float, result=bool)
+    def startSessionReplay(self, path: str, speed: float = 1.0):
+        """
+        Replay a recorded session into the analysis pipeline and telemetry bindings.
+
+        Args:
+            path (str): Session file
+            speed (float): 1.0 for real time, N for N times faster, 0 for as fast as possible
+        """
+        if self._replay_thread is not None:
+            logger.warning("Session replay already running")
+            return False
+        if not os.path.isfile(path):
+            logger.error(f"Session file not found: {path}")
+            return False
+        self._replay_processing.reset()
+        thread = SessionReplayThread(path, speed, parent=self)
+        thread.framesReplayed.connect(self._on_replay_frames)
+        thread.telemetryReplayed.connect(self._publish_replayed_telemetry)
+        thread.replayFinished.connect(self._on_replay_finished)
+        self._replay_thread = thread
+        thread.start()
+        logger.info(f"Replaying session {path} at {'max' if speed <= 0 else f'{speed:g}x'} speed")
+        return True
+
+    @pyqtSlot()
+    def stopSessionReplay(self):
+        if self._replay_thread is not None:
+            self._replay_thread.stop()
+
+    @pyqtSlot(str, list, object, float)
+    def _on_replay_frames(self, sensor_side, camera_indices, frames, timestamp):
+        t0 = time.perf_counter()
+        try:
+            self._ingest_frames(sensor_side, camera_indices, frames, timestamp)
+            self.histogramReady.emit(frames[-1].tolist())
+        finally:
+            self._replay_processing.record(time.perf_counter() - t0)
+            thread = self._replay_thread
+            if thread is not None:
+                thread.release()
+
+    @pyqtSlot('QVariant')
+    def _on_replay_finished(self, stats):
+        thread, self._replay_thread = self._replay_thread, None
+        if thread is not None:
+            thread.wait()
+            thread.deleteLater()
+        stats = dict(stats)
+        stats["processing"] = self._replay_processing.to_dict()
+        logger.info(
+            f"Session replay {'stopped' if stats['stopped'] else 'finished'}: {stats['frames']} frames "
+            f"in {stats['elapsedS']:.2f} s ({stats['framesPerSecond']:.0f} frames/s, "
+            f"{stats['achievedSpeed']:.1f}x)"
+        )
+        self.sessionReplayFinished.emit(stats)
+
     @pyqtSlot(list)
     def on_new_histogram(self, bins):
         if bins:
+            # CaptureThread uses 1-based camera numbers (9 = all cameras) on the left sensor
+            cam_num = self._capture_thread.camera_index if self._capture_thread is not None else 0
+            if 1 <= cam_num <= 8:
+                self._ingest_frames("left", [cam_num - 1], [bins[:1024]])
             self.histogramReady.emit(bins)
         else:
             logger.error("Capture thread failed to retrieve histogram.")
@@ -2176,27 +3561,78 @@ class MOTIONConnector(QObject):
         logger.info(f"Capture Status: {status}")
         self.updateCapStatus.emit(status)
 
-    @pyqtSlot(int)
-    def startCameraStream(self, camera_index: int):
-        logger.info(f"Starting camera stream for camera {camera_index + 1}")
-        logger.error("Camera streaming is not implemented yet.")
-        # if self._capture_thread is None or not self._capture_thread.isRunning():
-        #     self._capture_thread = CaptureThread(camera_index)
-        #     self._capture_thread.new_histogram.connect(self.on_new_histogram)
-        #     self._capture_thread.update_status.connect(self.handleUpdateCapStatus)
-        #     self._capture_thread.start()
-        #     self._is_streaming = True
-        #     self.isStreamingChanged.emit()
-        
-    @pyqtSlot(int)
-    def stopCameraStream(self, cam_num):
-        logger.error("Camera streaming is not implemented yet.")
-        # if self._is_streaming and self._capture_thread:
-        #     logger.info(f"Stopping camera stream for cam {cam_num}")
-        #     self._capture_thread.stop()
-        #     self._capture_thread = None
-        #     self._is_streaming = False
-        #     self.isStreamingChanged.emit()
+    @pyqtSlot(str, int, result=bool)
+    def startCameraStream(self, target: str, camera_index: int):
+        """
+        Stream live histograms of one camera to histogramReady and the frame
+        statistics (bin statistics, speckle contrast) until stopCameraStream.
+
+        Args:
+            target (str): "left" or "right"
+            camera_index (int): Camera 0-7
+
+        Returns:
+            bool: True if the stream is running
+        """
+        if self._camera_stream is not None:
+            return True
+        connected = {"left": self._leftSensorConnected, "right": self._rightSensorConnected}.get(target)
+        if not connected:
+            logger.error(f"Cannot stream camera {camera_index + 1}: {target} sensor not connected")
+            return False
+        thread = _HistogramStreamThread(self, target, camera_index, CAMERA_STREAM_FPS, parent=self)
+        thread.frame.connect(self.histogramReady)
+        thread.failed.connect(self._on_camera_stream_failed)
+        thread.finished.connect(thread.deleteLater)
+        self._camera_stream = thread
+        thread.start()
+        logger.info(f"Camera stream started on {target} camera {camera_index + 1} at up to {CAMERA_STREAM_FPS:.0f} fps")
+        self._is_streaming = True
+        self.isStreamingChanged.emit()
+        return True
+
+    @pyqtSlot()
+    def stopCameraStream(self):
+        thread, self._camera_stream = self._camera_stream, None
+        if thread is None:
+            return
+        thread.stop()
+        thread.wait(2000)
+        stats = thread.stats()
+        logger.info(f"Camera stream stopped on {thread.side} camera {thread.camera_index + 1}: "
+                    f"{stats['frames']} frames ({stats['achievedHz']:.1f} fps), "
+                    f"{stats['skipped']} skipped, {stats['errors']} errors")
+        self._is_streaming = False
+        self.isStreamingChanged.emit()
+
+    def _stop_camera_stream_on(self, side):
+        if self._camera_stream is not None and self._camera_stream.side == side:
+            self.stopCameraStream()
+
+    @pyqtSlot(str)
+    def _on_camera_stream_failed(self, message: str):
+        logger.error(f"Camera stream failed: {message}")
+        self.stopCameraStream()
+
+    def _read_stream_histogram(self, side, camera_index):
+        """One live histogram for the camera stream thread; None while the sensor is busy."""
+        mutex = self._get_sensor_mutex("SENSOR_LEFT" if side == "left" else "SENSOR_RIGHT")
+        if not mutex.tryLock(CAMERA_STREAM_LOCK_TIMEOUT_MS):
+            return None
+        try:
+            bins, _ = motion_interface.get_camera_histogram(
+                sensor_side=side,
+                camera_id=camera_index,
+                test_pattern_id=4,
+                auto_upload=True
+            )
+        finally:
+            mutex.unlock()
+        if not bins:
+            raise Exception("no histogram returned")
+        bins[0] = bins[0] - 6  # delete the sentinel value from the histogram
+        self._ingest_frames(side, [camera_index], [bins[:1024]])
+        return bins
 
     @pyqtSlot(str, int, int)
     def getCameraHistogram(self, target:str, camera_index: int, test_pattern_id: int = 4):
@@ -2209,6 +3645,11 @@ class MOTIONConnector(QObject):
         )
 
         if bins:
+            if test_pattern_id == 4:  # live sensor data, not a test pattern
+                # Same correction as the capture paths, without touching the plotted bins
+                frame = list(bins[:1024])
+                frame[0] = frame[0] - 6  # delete the sentinel value from the histogram
+                self._ingest_frames(target, [camera_index], [frame])
             self.histogramReady.emit(bins)
         else:
             logger.error("Failed to retrieve histogram.")
@@ -2216,49 +3657,20 @@ class MOTIONConnector(QObject):
 
     @pyqtSlot()
     def readSafetyStatus(self):
-        # Replace this with your actual console status check
-        self._console_mutex.lock()
         try:
-            muxIdx = 1
-            i2cAddr = 0x41
-            offset = 0x24  
-            data_len = 1  # Number of bytes to read
+            statuses = self._safety_source.read()
+            status_text = safety_status_text(statuses)
 
-            channels = {
-                "SE": 6,
-                "SO": 7
-            }
-            statuses = {}
+            if safety_ok(statuses):
+                self._on_safety_cleared()
+            elif self._trigger_state == "ON" or not self._safetyFailure:
+                self._stop_console_trigger()
+                self._on_safety_fault(status_text)
 
-            for label, channel in channels.items():
-                status = self.i2cReadBytes("CONSOLE", muxIdx, channel, i2cAddr, offset, data_len)
-                if status:
-                    statuses[label] = status[0]                
-                else:
-                    raise Exception("I2C read error")
-                
-            status_text = f"SE: 0x{statuses['SE']:02X}, SO: 0x{statuses['SO']:02X}"
-            
-            if (statuses["SE"] & 0x0F) == 0 and (statuses["SO"] & 0x0F) == 0:
-                if self._safetyFailure:
-                    self._safetyFailure = False
-                    self.safetyFailureStateChanged.emit(False)
-            else:
-                if not self._safetyFailure:
-                    self._safetyFailure = True
-                    self.stopTrigger()
-                    self.laserStateChanged.emit(False)
-                    self.safetyFailureStateChanged.emit(True)  
-                    logging.error(f"Failure Detected: {status_text}")
-
-            # Emit combined status if needed
-            
             logging.info(f"Status QUERY: {status_text}")
 
         except Exception as e:
             logging.error(f"Console status query failed: {e}")
-        finally:
-            self._console_mutex.unlock()
 
     @pyqtSlot(str)
     def queryCameraPowerStatus(self, target: str):
@@ -2279,6 +3691,7 @@ class MOTIONConnector(QObject):
                     if power_status is not None:
                         # Convert to list of booleans for QML
                         power_status_list = list(power_status)
+                        self._reconnect.update(sensor_tag, camera_power_mask=power_mask(power_status_list))
                         logger.info(f"Camera power status: {power_status_list}")
                         logger.info(f"Power status list type: {type(power_status_list)}, length: {len(power_status_list)}")
                         
@@ -2313,10 +3726,12 @@ class MOTIONConnector(QObject):
                     logger.info(f"Setting fan control to {'ON' if fan_on else 'OFF'} on {sensor_tag} sensor")
                     
                     # Set fan control state
+                    self._device_cache.invalidate("sensor", sensor_tag, "fan_control")
                     sensor = motion_interface.sensors[sensor_tag]
                     result = sensor.set_fan_control(fan_on)
                     
                     if result:
+                        self._reconnect.update(sensor_tag, fan_control=bool(fan_on))
                         logger.info(f"Fan control set to {'ON' if fan_on else 'OFF'} successfully")
                     else:
                         logger.error(f"Failed to set fan control to {'ON' if fan_on else 'OFF'}")
@@ -2339,16 +3754,18 @@ class MOTIONConnector(QObject):
             if target == "SENSOR_LEFT" or target == "SENSOR_RIGHT":
                 sensor_tag = "left" if target == "SENSOR_LEFT" else "right"
                 mutex = self._get_sensor_mutex(target)
-                
-                mutex.lock()
-                try:
-                    # Get fan control status
-                    sensor = motion_interface.sensors[sensor_tag]
-                    status = sensor.get_fan_control_status()
-                    
-                    return status
-                finally:
-                    mutex.unlock()
+
+                def fetch():
+                    mutex.lock()
+                    try:
+                        # Get fan control status
+                        return motion_interface.sensors[sensor_tag].get_fan_control_status()
+                    finally:
+                        mutex.unlock()
+
+                return self._device_cache.get_or_fetch(
+                    ("sensor", sensor_tag, "fan_control"), fetch, DEVICE_CACHE_TTL_S["fan_control"]
+                )
             else:
                 logger.error(f"Invalid target for fan control status: {target}")
                 return False
@@ -2373,6 +3790,7 @@ class MOTIONConnector(QObject):
                 motion_interface.console_module.tec_voltage(value)
                 logger.debug(f"TEC voltage set to: {value}")
                 self._tec_dac = value
+                self._anomaly_detector.reset("tec.")
                 run_logger.info("TEC Setpoint Voltage - volt: %.6f ", float(self._tec_dac))
             
             self.tecDacChanged.emit()
@@ -2400,20 +3818,23 @@ class MOTIONConnector(QObject):
             R_SET = 1/((float(i) / (V_REF/2*R_3)) - 1/R_3 + 1/R_1) - R_2 # i = IN2P, TEMPSET from ADC
             SET_Temp = np.interp(R_SET, self._data_RT[:,1][::-1], self._data_RT[:,0][::-1])
 
-            self._tec_voltage   = round(float(Thermistor_Temp), 2) # Measured thermistor temperature
-            self._tec_temp      = round(float(SET_Temp), 2) # Measured target setpiont
-            self._tec_monC      = round((float(p) - 0.5*V_REF) / (25*R_s), 3) # p = V_itec
-            self._tec_monV      = round((float(t) - 0.5*V_REF) * 4, 3) # t = V_vtec
-            self._tec_good      = bool(ok) # TMPGD pin (abs(OUT1-IN2P) < 100mV)
+            status = {
+                "voltage": round(float(Thermistor_Temp), 2), # Measured thermistor temperature
+                "temp": round(float(SET_Temp), 2), # Measured target setpiont
+                "monC": round((float(p) - 0.5*V_REF) / (25*R_s), 3), # p = V_itec
+                "monV": round((float(t) - 0.5*V_REF) * 4, 3), # t = V_vtec
+                "good": bool(ok), # TMPGD pin (abs(OUT1-IN2P) < 100mV)
+            }
 
             # Long-run health sample -> goes ONLY to run.log
                 
             run_logger.info(
                 "TEC Status -  temp: %.2f set: %.2f tec_c: %.3f tec_v: %.3f good: %s",
-                self._tec_voltage, self._tec_temp, float(p), float(t), bool(ok)
+                status["voltage"], status["temp"], float(p), float(t), bool(ok)
             )
 
-            self.tecStatusChanged.emit()
+            # QML sees the new values on the next telemetry flush
+            self._publish_telemetry("tec", status)
 
             return True
 
@@ -2445,23 +3866,21 @@ class MOTIONConnector(QObject):
             
             temp1, temp2, temp3 = motion_interface.console_module.get_temperatures()  
 
-            # Cache for QML bindings
-            self._pdu_raws = list(pdu.raws)
-            self._pdu_vals = list(pdu.volts)
+            raws = list(pdu.raws)
+            vals = list(pdu.volts)
 
-            
-            # Emit change for any bound properties
-            self.pduMonChanged.emit()
+            # QML bindings update on the next telemetry flush
+            self._publish_telemetry("pdu", {"raws": raws, "vals": vals})
 
             adc1_scaled = [
                 (v / SCALE_V) if i == 6 else (v / SCALE_I)  # i is ADC1 channel index 0..7
-                for i, v in enumerate(self._pdu_vals[8:])
+                for i, v in enumerate(vals[8:])
             ]
 
             # Run-log (concise)
             run_logger.info(
                 "PDU MON ADC0 vals: %s",
-                " ".join(f"{(v/SCALE_V):.3f}" for v in self._pdu_vals[:8])
+                " ".join(f"{(v/SCALE_V):.3f}" for v in vals[:8])
             )
             
             run_logger.info(
@@ -2478,12 +3897,12 @@ class MOTIONConnector(QObject):
             return {
                 "ok": True,
                 "adc0": {
-                    "raws": self._pdu_raws[:8],
-                    "vals": self._pdu_vals[:8],
+                    "raws": raws[:8],
+                    "vals": vals[:8],
                 },
                 "adc1": {
-                    "raws": self._pdu_raws[8:],
-                    "vals": self._pdu_vals[8:],
+                    "raws": raws[8:],
+                    "vals": vals[8:],
                 },
             }
 
@@ -2493,6 +3912,248 @@ class MOTIONConnector(QObject):
         finally:
             self._console_mutex.unlock()
 
+    def _publish_telemetry(self, group, fields, replayed=False):
+        """
+        Submit a telemetry snapshot from any thread.
+
+        Args:
+            replayed (bool): The snapshot comes from a session replay, not the device
+
+        Returns:
+            dict: The fields that changed beyond their deadband
+        """
+        recorder = self._session_recorder
+        if recorder is not None and self._replay_thread is None:
+            recorder.record_telemetry(group, fields)
+        bus = self._frame_bus
+        if bus is not None:
+            try:
+                bus.publish_telemetry(group, fields)
+            except Exception as e:
+                logger.error(f"Error publishing telemetry to the frame bus: {e}")
+        # Replayed samples carry no live timing and describe another run: they
+        # only refresh the telemetry model, never the history, run summary,
+        # anomaly detector or settle detector
+        if not replayed:
+            self._record_telemetry_history(group, fields)
+        return self._telemetry.submit(group, fields)
+
+    def _publish_replayed_telemetry(self, group, fields):
+        self._publish_telemetry(group, fields, replayed=True)
+
+    def _record_telemetry_history(self, group, fields):
+        samples = {}
+        for field in TELEMETRY_HISTORY_FIELDS.get(group, ()):
+            value = fields.get(field)
+            if isinstance(value, (list, tuple)):
+                for i, v in enumerate(value):
+                    samples[f"{group}.{field}{i}"] = float(v)
+            elif value is not None:
+                samples[f"{group}.{field}"] = float(value)
+        if not samples:
+            return
+        if "tec.voltage" in samples and "tec.temp" in samples:
+            # Derived channel: measured - setpoint
+            samples["tec.error"] = samples["tec.voltage"] - samples["tec.temp"]
+        now = time.time()
+        self._telemetry_history.add(now, samples)
+        summary = self._run_summary
+        if summary is not None:
+            summary.add_many(samples)
+        for event in self._anomaly_detector.update(samples, now):
+            self._on_telemetry_anomaly(event)
+        if "tec.error" in samples:
+            self._settle.add("tec.error", now, samples["tec.error"])
+
+    def _on_telemetry_anomaly(self, event):
+        """Log, count and announce one anomaly (polling thread)."""
+        self._anomaly_events.append(event)
+        message = (
+            f"{event['channel']} {event['kind']}: value {event['value']:.6g}, "
+            f"baseline {event['baseline']:.6g}, score {event['score']:.1f} > {event['threshold']:g}"
+        )
+        logger.warning(f"Telemetry anomaly - {message}")
+        run_logger.warning(f"Telemetry Anomaly - {message}")
+        summary = self._run_summary
+        if summary is not None:
+            summary.count_event("telemetry_anomalies")
+        self.telemetryAnomalyDetected.emit(event)
+
+    @pyqtSlot(result=QVariant)
+    def telemetryChannels(self):
+        """Names of the channels in the telemetry history, e.g. "tec.voltage", "pdu.vals3"."""
+        return self._telemetry_history.channels()
+
+    @pyqtSlot(result=QVariant)
+    def telemetryAnomalies(self):
+        """Detector state per channel and the most recent anomaly events."""
+        return {
+            "channels": self._anomaly_detector.status(),
+            "events": list(self._anomaly_events),
+        }
+
+    @pyqtSlot(str)
+    def resetTelemetryBaselines(self, prefix: str = ""):
+        """Re-learn the anomaly baselines of channels starting with prefix (all if empty)."""
+        self._anomaly_detector.reset(prefix)
+        logger.info(f"Telemetry anomaly baselines reset ({prefix or 'all channels'})")
+
+    def _settle_channels(self):
+        channels = {"tec.error": SETTLE_CHANNELS["tec.error"]}
+        for side, connected in (("left", self._leftSensorConnected), ("right", self._rightSensorConnected)):
+            channel = f"imu.{side}.temp"
+            if connected and channel in SETTLE_CHANNELS:
+                channels[channel] = SETTLE_CHANNELS[channel]
+        return channels
+
+    def _sample_settle_channels(self):
+        """
+        Sample the settle channels no other poll is feeding (settle threads).
+
+        The console status thread reads the TEC while the trigger is on and an
+        IMU stream reads its sensor's temperature; everything else is read here.
+        """
+        if (self._consoleConnected and self._console_status_thread is None
+                and not self._console_fw_busy):
+            self.tec_status()
+        for side, connected in (("left", self._leftSensorConnected), ("right", self._rightSensorConnected)):
+            if not connected or side in self._imu_threads:
+                continue
+            mutex = self._get_sensor_mutex("SENSOR_LEFT" if side == "left" else "SENSOR_RIGHT")
+            # A capture holding the sensor wins; the next poll catches up
+            if not mutex.tryLock(IMU_LOCK_TIMEOUT_MS):
+                continue
+            try:
+                imu_temp = motion_interface.sensors[side].imu_get_temperature()
+                self._settle.add(f"imu.{side}.temp", time.time(), imu_temp)
+            except Exception as e:
+                logger.error(f"Error reading {side} IMU temperature: {e}")
+            finally:
+                mutex.unlock()
+
+    def _assess_stability(self, tolerance, window):
+        report = self._settle.assess_all(self._settle_channels(), tolerance, window)
+        report["tecGood"] = bool(self._tec_good)
+        report["stable"] = report["stable"] and report["tecGood"]
+        return report
+
+    @pyqtSlot(float, float, result=QVariant)
+    def stabilityStatus(self, tolerance: float, window: float):
+        """
+        Whether the TEC error and IMU temperatures are settled right now.
+
+        Args:
+            tolerance (float): Allowed drift, noise and TEC error in C
+            window (float): Trailing window in seconds
+
+        Returns:
+            dict: stable, etaS (estimated seconds to stable, None if unknown),
+                  tecGood and per-channel details
+        """
+        try:
+            return self._assess_stability(tolerance, window)
+        except Exception as e:
+            logger.error(f"Error assessing thermal stability: {e}")
+            return {}
+
+    @pyqtSlot(float, float, result=bool)
+    @pyqtSlot(float, float, float, result=bool)
+    def awaitStable(self, tolerance: float, window: float, timeout: float = SETTLE_TIMEOUT_S):
+        """
+        Wait in the background until the system is thermally settled.
+
+        Emits stabilityProgress about once per second and stabilityReached
+        when stable or after `timeout` seconds.
+
+        Returns:
+            bool: False if a wait is already running
+        """
+        if self._settle_thread is not None:
+            logger.warning("awaitStable: already waiting")
+            return False
+        thread = _SettleWaitThread(self, tolerance, window, timeout)
+        thread.progress.connect(self.stabilityProgress)
+        thread.done.connect(self._on_settle_done)
+        self._settle_thread = thread
+        logger.info(f"Waiting for thermal stability (tolerance {tolerance} C, window {window:.0f} s)")
+        thread.start()
+        return True
+
+    @pyqtSlot()
+    def cancelAwaitStable(self):
+        if self._settle_thread is not None:
+            self._settle_thread.stop()
+
+    @pyqtSlot(bool, 'QVariant')
+    def _on_settle_done(self, stable, report):
+        thread, self._settle_thread = self._settle_thread, None
+        if thread is not None:
+            thread.wait()
+        waited = report.get("waitedS", 0.0) if isinstance(report, dict) else 0.0
+        if stable:
+            run_logger.info(f"Thermal Stable - after {waited:.0f} s")
+        else:
+            run_logger.warning(f"Thermal Not Stable - gave up after {waited:.0f} s")
+        self.stabilityReached.emit(stable, report)
+
+    @pyqtSlot(result=QVariant)
+    def runSummary(self):
+        """Statistics and limit checks of the current trigger run so far ({} when not running)."""
+        summary = self._run_summary
+        return summary.report(self._runlog_path) if summary is not None else {}
+
+    @pyqtSlot(str, float, int, result=QVariant)
+    def telemetrySeries(self, channel: str, seconds: float, max_points: int):
+        """
+        Min/max/mean buckets of one channel over the last `seconds`, at most ~max_points.
+
+        Returns:
+            dict: t (seconds relative to now, negative), min, max, mean lists and bucketS
+        """
+        try:
+            now = time.time()
+            series = self._telemetry_history.query(channel, now - seconds, now, max(2, max_points))
+            series["t"] = [t - now for t in series["t"]]
+            return series
+        except Exception as e:
+            logger.error(f"Error reading telemetry history: {e}")
+            return {}
+
+    @pyqtSlot('QVariantMap')
+    def _on_telemetry_updated(self, changes):
+        """Apply a batch of telemetry changes and notify only affected bindings (GUI thread)."""
+        tec = changes.get("tec")
+        if tec:
+            for field, value in tec.items():
+                setattr(self, f"_tec_{field}", value)
+            self.tecStatusChanged.emit()
+
+        analog = changes.get("analog")
+        if analog:
+            signals = {"tcm": self.tcmChanged, "tcl": self.tclChanged, "pdc": self.pdcChanged}
+            for field, value in analog.items():
+                setattr(self, f"_{field}", value)
+            for field in analog:
+                signals[field].emit()
+
+        pdu = changes.get("pdu")
+        if pdu:
+            self._pdu_raws = list(pdu.get("raws", self._pdu_raws))
+            self._pdu_vals = list(pdu.get("vals", self._pdu_vals))
+            self._pdu_channels.update_channels(self._pdu_raws, self._pdu_vals)
+            self.pduMonChanged.emit()
+
+    @pyqtSlot(result=QVariant)
+    def telemetryNotifyStats(self):
+        """Submitted / deadband-suppressed / flushed counts of the telemetry model."""
+        return self._telemetry.stats()
+
+    @pyqtSlot(result=QVariant)
+    def telemetryPollStats(self):
+        """Per-task run/overrun/jitter statistics of the console telemetry poller."""
+        thread = self._console_status_thread
+        return thread.pollStats() if thread is not None else []
+
     @pyqtSlot()
     def shutdown(self):
         logger.info("Shutting down MOTIONConnector...")
@@ -2505,147 +4166,350 @@ class MOTIONConnector(QObject):
             self._console_status_thread.stop()
             self._console_status_thread = None
 
+        self._safety_monitor.stop()
+
+        if self._profiler is not None:
+            self._profiler.stop()
+
+        if self._loop_monitor.beats:
+            self.exportLoopLagReport()
+        self._loop_monitor.stop()
+
+        if self._bus_tracer.active:
+            self.stopBusTrace()
+
+        if self._replay_thread is not None:
+            self._replay_thread.stop()
+            self._replay_thread.wait(2000)
+        self.stopSessionRecording()
+
+        if self._settle_thread is not None:
+            self._settle_thread.stop()
+            self._settle_thread.wait(2000)
+        self._settle_sampler.stop()
+        self._settle_sampler.wait(2000)
+
+        self.stopFrameBus()
+        self.stopCameraStream()
+
+        for thread in list(self._auto_exposure_threads.values()):
+            thread.requestInterruption()
+            thread.wait(5000)
+
+        if self._archive_import_thread is not None:
+            self._archive_import_thread.requestInterruption()
+            self._archive_import_thread.wait(5000)
+
+        for side in list(self._imu_threads):
+            self._stop_imu_stream(side)
+
+        self._storage.stop()
+
+class _HistogramImportThread(QThread):
+    progress = pyqtSignal(int, int)
+    done = pyqtSignal(int)
+
+    def __init__(self, archive, directory, parent=None):
+        super().__init__(parent)
+        self._archive = archive
+        self._directory = directory
+
+    def run(self):
+        try:
+            imported = self._archive.import_csv_directory(
+                self._directory, progress=self.progress.emit, should_stop=self.isInterruptionRequested
+            )
+        except Exception as e:
+            logger.error(f"Histogram archive import failed: {e}")
+            imported = -1
+        self.done.emit(imported)
+
+class _SettleWaitThread(QThread):
+    progress = pyqtSignal('QVariant')
+    done = pyqtSignal(bool, 'QVariant')
+
+    def __init__(self, connector: MOTIONConnector, tolerance, window, timeout, parent=None):
+        super().__init__(parent)
+        self._connector = connector
+        self._tolerance = tolerance
+        self._window = window
+        self._timeout = timeout
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        connector = self._connector
+        start = time.monotonic()
+        report = {}
+        stable = False
+        while not self._stop.is_set():
+            connector._sample_settle_channels()
+            report = connector._assess_stability(self._tolerance, self._window)
+            report["waitedS"] = time.monotonic() - start
+            stable = report["stable"]
+            self.progress.emit(report)
+            if stable or report["waitedS"] >= self._timeout:
+                break
+            self._stop.wait(SETTLE_POLL_S)
+        self.done.emit(stable, report)
+
+class _HistogramStreamThread(QThread):
+    frame = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, connector: MOTIONConnector, side, camera_index, fps, parent=None):
+        super().__init__(parent)
+        self._connector = connector
+        self.side = side
+        self.camera_index = camera_index
+        self.period = 1.0 / max(float(fps), 0.1)
+        self._stop = threading.Event()
+        self._stats = {"frames": 0, "skipped": 0, "errors": 0}
+        self._started_at = None
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        out = dict(self._stats)
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        out["achievedHz"] = out["frames"] / elapsed if elapsed > 0 else 0.0
+        return out
+
+    def run(self):
+        connector = self._connector
+        self._started_at = next_due = time.monotonic()
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                bins = connector._read_stream_histogram(self.side, self.camera_index)
+                failures = 0
+            except Exception as e:
+                self._stats["errors"] += 1
+                failures += 1
+                if failures >= CAMERA_STREAM_MAX_ERRORS:
+                    self.failed.emit(f"{self.side} camera {self.camera_index + 1}: {e}")
+                    return
+                bins = None
+            else:
+                if bins is None:
+                    self._stats["skipped"] += 1
+                else:
+                    self._stats["frames"] += 1
+                    self.frame.emit(bins)
+            # Uploads slower than the period run back to back
+            next_due = max(next_due + self.period, time.monotonic())
+            self._stop.wait(next_due - time.monotonic())
+
+class _SettleSamplerThread(QThread):
+    """Keeps the settle detector's window filled between awaitStable() calls."""
+
+    def __init__(self, connector: MOTIONConnector, parent=None):
+        super().__init__(parent)
+        self._connector = connector
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        connector = self._connector
+        while not self._stop.wait(SETTLE_BACKGROUND_POLL_S):
+            # A running wait samples faster by itself
+            if connector._settle_thread is not None:
+                continue
+            try:
+                connector._sample_settle_channels()
+            except Exception as e:
+                logger.error(f"Error sampling settle channels: {e}")
+
+class _AutoExposureThread(QThread):
+    step = pyqtSignal(str, int, int, int, float, float)
+    done = pyqtSignal(str, 'QVariant')
+
+    def __init__(self, connector: MOTIONConnector, side, cameras, search, parent=None):
+        super().__init__(parent)
+        self._connector = connector
+        self._side = side
+        self._cameras = cameras
+        self._search = search
+
+    def run(self):
+        connector = self._connector
+        side = self._side
+        results = {}
+        for camera_index in self._cameras:
+            if self.isInterruptionRequested():
+                break
+
+            def capture(gain, exposure):
+                if self.isInterruptionRequested():
+                    return None
+                bins = connector._auto_exposure_capture(side, camera_index, gain, exposure)
+                if bins is not None:
+                    mean, saturation = measure_exposure(bins)
+                    self.step.emit(side, camera_index, gain, exposure, mean, saturation)
+                return bins
+
+            try:
+                start = connector._exposure_cache.get(side, camera_index) or connector._camera_setting(side, camera_index)
+                result = self._search.run(capture, start)
+                connector._finish_auto_exposure(side, camera_index, result)
+            except Exception as e:
+                logger.error(f"Auto-exposure failed on {side} camera {camera_index + 1}: {e}")
+                result = {"converged": False, "reason": str(e), "captures": 0}
+            results[f"{side}:{camera_index}"] = result
+        self.done.emit(side, results)
+
+class _ImuStreamThread(QThread):
+    updated = pyqtSignal(str, 'QVariantMap')
+
+    def __init__(self, connector: MOTIONConnector, side, ring, rate_hz, parent=None):
+        super().__init__(parent)
+        self._side = side
+        self.sampler = ImuSampler(
+            lambda with_temp: connector._read_imu_sample(side, with_temp), ring,
+            rate_hz=rate_hz, ui_rate_hz=IMU_STREAM_UI_RATE_HZ,
+            on_update=lambda sample: self.updated.emit(side, sample),
+        )
+
+    def stop(self):
+        self.sampler.stop()
+
+    def run(self):
+        self.sampler.run()
+
+class _DeviceRestoreThread(QThread):
+    restored = pyqtSignal(str, bool, 'QVariant', float)  # descriptor, identity_ok, action names, seconds
+
+    def __init__(self, connector: MOTIONConnector, descriptor: str, parent=None):
+        super().__init__(parent)
+        self._connector = connector
+        self._descriptor = descriptor
+
+    def run(self):
+        connector = self._connector
+        device = device_key(self._descriptor)
+        start = time.perf_counter()
+        try:
+            live = connector._read_live_state(device)
+        except Exception as e:
+            logger.error(f"{self._descriptor}: reading state after reconnect failed: {e}")
+            return
+
+        identity_ok, actions = connector._reconnect.plan_restore(device, live)
+        failed = []
+        for action in actions:
+            try:
+                if not connector._apply_restore_action(device, action):
+                    failed.append(action[0])
+            except Exception as e:
+                logger.error(f"{self._descriptor}: restoring {action[0]} failed: {e}")
+                failed.append(action[0])
+
+        seconds = time.perf_counter() - start
+        connector._reconnect.record_restore(device, identity_ok, actions, failed, seconds)
+        if failed:
+            logger.error(f"{self._descriptor}: could not restore {', '.join(failed)}")
+        self.restored.emit(self._descriptor, identity_ok, [a[0] for a in actions], seconds)
+
+
 class ConsoleStatusThread(QThread):
     statusUpdate = pyqtSignal(str)
 
+    # Poll periods (seconds) per metric group. The SE/SO interlock is not
+    # polled here; SafetyMonitorThread watches it at a much higher rate.
+    TEC_PERIOD_S = 1.0      # 1 read
+    ANALOG_PERIOD_S = 2.0   # lsync count + 2 I2C reads
+    PDU_PERIOD_S = 5.0      # PDU monitor + temperatures
+
     def __init__(self, connector: MOTIONConnector, parent=None):
         super().__init__(parent)
         self.connector = connector
         self._running = True
         self._mutex = QMutex()
         self._wait_condition = QWaitCondition()
-        self.last_run = time.time()
+
+        self._scheduler = PollScheduler()
+        # Stagger first runs so the groups do not all hit the bus at once
+        self._scheduler.add_task("tec", self.TEC_PERIOD_S, self._poll_tec, offset=0.1)
+        self._scheduler.add_task("analog", self.ANALOG_PERIOD_S, self._poll_analog, offset=0.2)
+        self._scheduler.add_task("pdu", self.PDU_PERIOD_S, self._poll_pdu, offset=0.3)
+
+    def pollStats(self):
+        """Per-task run/overrun/jitter statistics of the poll schedule."""
+        return self._scheduler.stats()
 
     def run(self):
+        self._scheduler.start()
         while self._running:
-            now = time.time()
+            self._scheduler.run_pending(keep_running=lambda: self._running)
 
-            # run the heavy work ~1 Hz
-            if now - self.last_run >= 1.0:
-                try:
-                    #
-                    # 1. TEC status poll
-                    #
-                    # This updates _tec_* fields inside connector and emits tecStatusChanged
-                    self.connector.tec_status()
-                    
-                    #
-                    # 2. PDU Mon poll
-                    #
-                    self.connector.pdu_mon()
-
-                    #
-                    # 3. Safety / interlock state
-                    #
-                    muxIdx   = 1
-                    i2cAddr  = 0x41
-                    offset   = 0x24
-                    data_len = 1
-
-                    channels = {
-                        "SE": 6,
-                        "SO": 7
-                    }
-                    statuses = {}
-
-                    for label, channel in channels.items():
-                        status = self.connector.i2cReadBytes("CONSOLE", muxIdx, channel, i2cAddr, offset, data_len)
-                        if status:
-                            statuses[label] = status[0]
-                        else:
-                            self.statusUpdate.emit(f"{label} Disconnected")
-                            raise Exception("I2C read error")
-
-                    status_text = f"SE: 0x{statuses['SE']:02X}, SO: 0x{statuses['SO']:02X}"
-                    run_logger.info(
-                        f"Safety Status - SE: 0x{statuses['SE']:02X}, SO: 0x{statuses['SO']:02X}"
-                    )
+            # Sleep until the next task is due, or until stop() wakes us
+            wait_ms = int(math.ceil(self._scheduler.time_until_next() * 1000))
+            self._mutex.lock()
+            if self._running and wait_ms > 0:
+                self._wait_condition.wait(self._mutex, wait_ms)
+            self._mutex.unlock()
 
-                    ok_se = (statuses["SE"] & 0x0F) == 0
-                    ok_so = (statuses["SO"] & 0x0F) == 0
+    def _poll_tec(self):
+        # Publishes the TEC group; tecStatusChanged fires on the next telemetry flush
+        self.connector.tec_status()
 
-                    if ok_se and ok_so:
-                        if self.connector._safetyFailure:
-                            self.connector._safetyFailure = False
-                            self.connector.safetyFailureStateChanged.emit(False)
-                    else:
-                        if not self.connector._safetyFailure:
-                            # First time we see a failure
-                            self.connector._safetyFailure = True
-                            # Request trigger stop (safe version won't deadlock)
-                            self.connector.stopTrigger()
-                            self.connector.laserStateChanged.emit(False)
-                            self.connector.safetyFailureStateChanged.emit(True)
-                            logging.error(f"Failure Detected: {status_text}")
-
-                    #
-                    # 3. Analog telemetry (tcm/tcl/pdc)
-                    #
-                    tcm_raw = self.connector.getLsyncCount()
-                    tcl_raw = self.connector.i2cReadBytes("CONSOLE", muxIdx, 4, i2cAddr, 0x10, 4)
-                    pdc_raw = self.connector.i2cReadBytes("CONSOLE", muxIdx, 7, i2cAddr, 0x1C, 2)
-
-                    # Represent raw byte arrays as hex for easier reading
-                    try:
-                        if isinstance(tcl_raw, (bytes, bytearray, list)):
-                            tcl_hex = ' '.join(f"0x{int(b):02X}" for b in tcl_raw)
-                        else:
-                            tcl_hex = str(tcl_raw)
-
-                        if isinstance(pdc_raw, (bytes, bytearray, list)):
-                            pdc_hex = ' '.join(f"0x{int(b):02X}" for b in pdc_raw)
-                        else:
-                            pdc_hex = str(pdc_raw)
-                    except Exception:
-                        tcl_hex = str(tcl_raw)
-                        pdc_hex = str(pdc_raw)
-
-                    logging.debug(f"tcm_raw: {tcm_raw} tcl_raw: [{tcl_hex}] pdc_raw: [{pdc_hex}]")
-
-                    if tcl_raw and pdc_raw:
-                        tcm = int(tcm_raw)
-                        tcl = int.from_bytes(tcl_raw, byteorder='little')
-
-                        # Attempt to read the ADC DATA scale from models/FpgaModel.js
-                        scale = self.connector._get_fpga_scale('Safety OPT', 'ADC DATA')
-
-                        pdc = int.from_bytes(pdc_raw, byteorder='little') * float(scale)  # mA
-
-                        if (
-                            tcl != self.connector._tcl or
-                            tcm != self.connector._tcm or
-                            pdc != self.connector._pdc
-                        ):
-                            self.connector._tcl = tcl
-                            self.connector._tcm = tcm
-                            self.connector._pdc = pdc
-
-                            logging.debug(
-                                f"Analog Values - TCM: {tcm}, TCL: {tcl}, PDC: {pdc:.3f} mA"
-                            )
-
-                            run_logger.info(
-                                f"Analog Values - TCM: {tcm}, TCL: {tcl}, PDC: {pdc:.3f}"
-                            )
-
-                            self.connector.tclChanged.emit()
-                            self.connector.tcmChanged.emit()
-                            self.connector.pdcChanged.emit()
+    def _poll_pdu(self):
+        self.connector.pdu_mon()
 
-                except Exception as e:
-                    logging.error(f"Console status query failed: {e}")
+    def _poll_analog(self):
+        muxIdx   = 1
+        i2cAddr  = 0x41
 
-                # mark we ran this 1Hz tick
-                self.last_run = now
+        tcm_raw = self.connector.getLsyncCount()
+        tcl_raw = self.connector.i2cReadBytes("CONSOLE", muxIdx, 4, i2cAddr, 0x10, 4)
+        pdc_raw = self.connector.i2cReadBytes("CONSOLE", muxIdx, 7, i2cAddr, 0x1C, 2)
 
-            # sleep-ish for up to 100ms, or until stop() wakes us
-            self._mutex.lock()
-            self._wait_condition.wait(self._mutex, 100)
-            self._mutex.unlock()
+        # Represent raw byte arrays as hex for easier reading
+        try:
+            if isinstance(tcl_raw, (bytes, bytearray, list)):
+                tcl_hex = ' '.join(f"0x{int(b):02X}" for b in tcl_raw)
+            else:
+                tcl_hex = str(tcl_raw)
+
+            if isinstance(pdc_raw, (bytes, bytearray, list)):
+                pdc_hex = ' '.join(f"0x{int(b):02X}" for b in pdc_raw)
+            else:
+                pdc_hex = str(pdc_raw)
+        except Exception:
+            tcl_hex = str(tcl_raw)
+            pdc_hex = str(pdc_raw)
+
+        logging.debug(f"tcm_raw: {tcm_raw} tcl_raw: [{tcl_hex}] pdc_raw: [{pdc_hex}]")
+
+        if tcl_raw and pdc_raw:
+            tcm = int(tcm_raw)
+            tcl = int.from_bytes(tcl_raw, byteorder='little')
+
+            # Attempt to read the ADC DATA scale from models/FpgaModel.js
+            scale = self.connector._get_fpga_scale('Safety OPT', 'ADC DATA')
+
+            pdc = int.from_bytes(pdc_raw, byteorder='little') * float(scale)  # mA
+
+            # Only changed fields are published; signals fire on the GUI thread
+            if self.connector._publish_telemetry("analog", {"tcm": tcm, "tcl": tcl, "pdc": pdc}):
+                logging.debug(
+                    f"Analog Values - TCM: {tcm}, TCL: {tcl}, PDC: {pdc:.3f} mA"
+                )
+
+                run_logger.info(
+                    f"Analog Values - TCM: {tcm}, TCL: {tcl}, PDC: {pdc:.3f}"
+                )
 
     def stop(self):
         # Called from *another* thread in normal shutdown
+        self._mutex.lock()
         self._running = False
         self._wait_condition.wakeAll()
+        self._mutex.unlock()
         self.quit()
         self.wait()
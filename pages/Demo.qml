@@ -84,7 +84,7 @@ Rectangle {
         ListElement { label: "Squares"; tp_id: 0x02}
         // ListElement { label: "Continuous"; tp_id: 0x03}
         ListElement { label: "Live"; tp_id: 0x04}
-        // ListElement { label: "Stream"; tp_id: 0x04}
+        ListElement { label: "Stream"; tp_id: 0x04}
     }
 
     function writeFpgaRegister(fpgaLabel, funcName, data) {
@@ -590,6 +590,7 @@ Rectangle {
                         TabButton { text: "Safety OPT"; font.pixelSize: 12; padding: 6 }
                         TabButton { text: "Safety EE";  font.pixelSize: 12; padding: 6 }
                         TabButton { text: "TEC CTRL";   font.pixelSize: 12; padding: 6 }
+                        TabButton { text: "TRENDS";     font.pixelSize: 12; padding: 6 }
                     }
 
                     StackLayout {
@@ -1373,6 +1374,16 @@ Rectangle {
                                 }
                             }
                         }
+
+                        Rectangle {
+                            id: pageTrends
+                            color: "#1E1E20"
+
+                            TelemetryChart {
+                                anchors.fill: parent
+                                anchors.margins: 6
+                            }
+                        }
                     }
                 }
             }
@@ -1540,14 +1551,11 @@ Rectangle {
                                 // console.log("Selected: ", target)
 
                                 if (tp && tp.label === "Stream") {
+                                    // cameraCapStatus follows onIsStreamingChanged
                                     if (MOTIONInterface.isStreaming) {
-                                        // MOTIONInterface.stopCameraStream(cam.cam_num)
-                                        // cameraCapStatus.text = "Stopped"
-                                        // cameraCapStatus.color = "red"
+                                        MOTIONInterface.stopCameraStream()
                                     } else {
-                                        // MOTIONInterface.startCameraStream(cam.cam_num)
-                                        // cameraCapStatus.text = "Streaming"
-                                        // cameraCapStatus.color = "lightgreen"
+                                        MOTIONInterface.startCameraStream(target, cam.cam_num)
                                     }
                                 } else {
                                     // console.log("Capture Histogram from " + cam.cam_num + " TestPattern: " + tp.tp_id)
@@ -2189,6 +2197,8 @@ Rectangle {
 
     Component.onDestruction: {
         // console.log("Closing UI, clearing MOTIONInterface...");
+        if (MOTIONInterface.isStreaming)
+            MOTIONInterface.stopCameraStream()
     }
 
     Connections {
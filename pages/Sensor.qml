@@ -48,6 +48,11 @@ Rectangle {
     // Fan control properties
     property bool fanControlOn: false
 
+    // IMU stream: tag of the sensor being streamed ("" when stopped) and its
+    // latest imuStreamStats() entry
+    property string imuStreamTag: ""
+    property var imuStreamStats: null
+
     ListModel {
         id: cameraStatusModel
         ListElement { label: "Camera 1"; status: "Not Tested"; color: "gray" }
@@ -82,6 +87,22 @@ Rectangle {
         //MOTIONInterface.queryTriggerInfo()
     }
 
+    function startImuStream() {
+        let sensor_tag = (sensorSelector.currentIndex === 0) ? "SENSOR_LEFT" : "SENSOR_RIGHT";
+        if (MOTIONInterface.startImuStream(sensor_tag)) {
+            imuStreamTag = sensor_tag
+            imuStatsTimer.start()
+        }
+    }
+
+    function stopImuStream() {
+        if (imuStreamTag !== "")
+            MOTIONInterface.stopImuStream(imuStreamTag)
+        imuStreamTag = ""
+        imuStreamStats = null
+        imuStatsTimer.stop()
+    }
+
     // Run refresh logic immediately on page load if Sensor is already connected
     Component.onCompleted: {
         sensorSelector.currentIndex = 0 // default
@@ -106,6 +127,28 @@ Rectangle {
         }
     }
 
+    // The stream keeps sampling the bus, so it must not outlive the page
+    Component.onDestruction: {
+        stopImuStream()
+    }
+
+    Timer {
+        id: imuStatsTimer
+        interval: 1000
+        running: false
+        repeat: true
+        onTriggered: {
+            let stats = MOTIONInterface.imuStreamStats()
+            let side = (imuStreamTag === "SENSOR_LEFT") ? "left" : "right"
+            if (stats[side] === undefined) {
+                // Stopped by the connector (sensor disconnected)
+                stopImuStream()
+                return
+            }
+            imuStreamStats = stats[side]
+        }
+    }
+
     Timer {
         id: fanStatusTimer
         interval: 1000   // Poll fan status every second
@@ -165,6 +208,15 @@ Rectangle {
                 fanControlOn = false;
                 fanStatusTimer.stop();
             }
+
+            // The connector stops the stream of a sensor that goes away
+            if (imuStreamTag !== "") {
+                let streamConnected = (imuStreamTag === "SENSOR_LEFT")
+                    ? MOTIONInterface.leftSensorConnected
+                    : MOTIONInterface.rightSensorConnected;
+                if (!streamConnected)
+                    stopImuStream();
+            }
         }
 
         // Handle device info response
@@ -1161,6 +1213,15 @@ Rectangle {
                                                         serialNumber = camNum.toString();
                                                     }
                                                     
+                                                // A cached dark frame for this temperature band and setting is reused
+                                                if (MOTIONInterface.isDarkFrameCurrent(sensor_tag, selectedIndex)) {
+                                                    cameraStatusModel.set(selectedIndex, {
+                                                        label: "Camera " + camNum,
+                                                        status: "Dark frame current",
+                                                        color: "green"
+                                                    });
+                                                    return;
+                                                }
                                                 // console.log("Capturing dark histogram for camera", selectedIndex, "with SN", serialNumber);
                                                 MOTIONInterface.captureHistogramToCSV(sensor_tag, selectedIndex, serialNumber, true);
                                                 } else {
@@ -1190,7 +1251,8 @@ Rectangle {
                                                     serialNumbers.push(serialNumber);
                                                 }
                                                 
-                                                MOTIONInterface.captureAllCamerasHistogramToCSV(sensor_tag, true, serialNumbers);
+                                                // Only cameras without a current dark frame are re-captured
+                                                MOTIONInterface.refreshDarkFrames(sensor_tag, serialNumbers);
                                                 }
                                             }
                                         }
@@ -1475,6 +1537,9 @@ Rectangle {
                                     // Clear fan control status
                                     fanControlOn = false;
 
+                                    // The IMU stream belongs to the previous sensor
+                                    stopImuStream()
+
                                     // Fetch new sensor states
                                     updateStates()
                                 }
@@ -1586,12 +1651,73 @@ Rectangle {
                             IMUWidget {
                                 mode: "Accel"
                                 imuLabel: "IMU Data"
+                                streamSide: (sensorSelector.currentIndex === 0) ? "left" : "right"
                                 xVal: accel_x
                                 yVal: accel_y
                                 zVal: accel_z
                             }
                         }
 
+                        // IMU Stream Toggle
+                        RowLayout {
+                            Layout.fillWidth: true
+                            spacing: 8
+
+                            Rectangle {
+                                id: imuStreamButton
+                                width: 120
+                                height: 30
+                                radius: 10
+                                color: enabled ? (imuStreamTag !== "" ? "#E67E22" : "#3498DB") : "#7F8C8D"
+                                enabled: (imuStreamTag !== "") || ((sensorSelector.currentIndex === 0)
+                                    ? MOTIONInterface.leftSensorConnected
+                                    : MOTIONInterface.rightSensorConnected)
+
+                                Text {
+                                    text: imuStreamTag !== "" ? "Stop IMU Stream" : "Start IMU Stream"
+                                    anchors.centerIn: parent
+                                    color: parent.enabled ? "white" : "#BDC3C7"
+                                    font.pixelSize: 12
+                                }
+
+                                MouseArea {
+                                    anchors.fill: parent
+                                    enabled: parent.enabled
+                                    onClicked: {
+                                        if (imuStreamTag !== "")
+                                            stopImuStream()
+                                        else
+                                            startImuStream()
+                                    }
+                                }
+                            }
+
+                            Text {
+                                Layout.fillWidth: true
+                                text: {
+                                    if (imuStreamTag === "")
+                                        return "Stream stopped"
+                                    if (!imuStreamStats)
+                                        return "Starting..."
+                                    return imuStreamStats.achievedHz.toFixed(0) + " / "
+                                        + imuStreamStats.rateHz.toFixed(0) + " Hz, "
+                                        + imuStreamStats.skipped + " skipped, "
+                                        + imuStreamStats.errors + " errors"
+                                }
+                                color: (imuStreamStats && imuStreamStats.errors > 0) ? "#E74C3C" : "#BDC3C7"
+                                font.pixelSize: 12
+                                elide: Text.ElideRight
+                                ToolTip.visible: imuStatsMouseArea.containsMouse && imuStreamStats && imuStreamStats.lastError
+                                ToolTip.text: imuStreamStats && imuStreamStats.lastError ? imuStreamStats.lastError : ""
+
+                                MouseArea {
+                                    id: imuStatsMouseArea
+                                    anchors.fill: parent
+                                    hoverEnabled: true
+                                }
+                            }
+                        }
+
 
                         // Soft Reset Button
                         Rectangle {
@@ -40,6 +40,22 @@ Rectangle {
     property string rightSensorFirmwareVersion: "N/A"
     property string rightSensorDeviceId: "N/A"
 
+    // Last profile written by the sampling profiler
+    property string lastProfilePath: ""
+
+    // GUI loop lag summary (refreshed while the page is visible)
+    property string loopLagText: "N/A"
+
+    function refreshLoopLag() {
+        var r = MOTIONInterface.loopLagReport()
+        if (!r || !r.lag) return
+        var p99 = r.lag.p99Ms !== null ? r.lag.p99Ms.toFixed(0) + " ms" : "--"
+        var worst = (r.topCallSites && r.topCallSites.length > 0)
+            ? ", worst: " + r.topCallSites[0].callSite + " (" + r.topCallSites[0].maxMs.toFixed(0) + " ms)"
+            : ""
+        loopLagText = "p99 " + p99 + ", " + r.stalls + " stalls" + worst
+    }
+
     // Console firmware update UI state
     property string consoleFwToken: ""
     property string consoleFwSelectedTag: ""
@@ -125,6 +141,10 @@ Rectangle {
             }
         }
 
+        function onProfileWritten(path) {
+            lastProfilePath = path
+        }
+
         function onConsoleDeviceInfoReceived(fwVersion, devId, boardId) {
             consoleFirmwareVersion = fwVersion
             consoleDeviceId = devId
@@ -256,6 +276,15 @@ Rectangle {
         }
     }
 
+    Timer {
+        id: loopLagTimer
+        interval: 2000
+        repeat: true
+        running: page1.visible
+        triggeredOnStart: true
+        onTriggered: refreshLoopLag()
+    }
+
     // Small delay after connect to let the device stabilize (matches pattern in other pages)
     Timer {
         id: settingsInfoTimer
@@ -827,6 +856,56 @@ Rectangle {
                             elide: Text.ElideRight
                             Layout.fillWidth: true
                         }
+
+                        Text { text: "UI Loop:"; color: "#BDC3C7"; font.pixelSize: 14; horizontalAlignment: Text.AlignRight; Layout.preferredWidth: 120 }
+                        RowLayout {
+                            Layout.fillWidth: true
+                            spacing: 10
+
+                            Text {
+                                text: loopLagText
+                                color: "#3498DB"
+                                font.pixelSize: 12
+                                elide: Text.ElideRight
+                                Layout.fillWidth: true
+                            }
+
+                            Button {
+                                text: "Export"
+                                Layout.preferredHeight: 32
+                                onClicked: {
+                                    var path = MOTIONInterface.exportLoopLagReport()
+                                    if (path !== "")
+                                        loopLagText = "Report: " + path
+                                }
+                            }
+                        }
+
+                        Text { text: "Profiler:"; color: "#BDC3C7"; font.pixelSize: 14; horizontalAlignment: Text.AlignRight; Layout.preferredWidth: 120 }
+                        RowLayout {
+                            Layout.fillWidth: true
+                            spacing: 10
+
+                            Button {
+                                text: MOTIONInterface.profilingActive ? "Stop Profiling" : "Start Profiling"
+                                Layout.preferredHeight: 32
+                                onClicked: {
+                                    if (MOTIONInterface.profilingActive)
+                                        MOTIONInterface.stopProfiling()
+                                    else
+                                        MOTIONInterface.startProfiling(0)
+                                }
+                            }
+
+                            Text {
+                                text: MOTIONInterface.profilingActive ? "Sampling all threads…"
+                                      : (lastProfilePath !== "" ? lastProfilePath : "Idle")
+                                color: MOTIONInterface.profilingActive ? "#E67E22" : "#3498DB"
+                                font.pixelSize: 12
+                                elide: Text.ElideMiddle
+                                Layout.fillWidth: true
+                            }
+                        }
                     }
                 }
             }
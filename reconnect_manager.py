@@ -0,0 +1,192 @@
+"""
+Hot-plug recovery from a cached device configuration.
+
+ReconnectManager keeps a snapshot of the last configuration applied to each
+device ("console", "left", "right"): hardware ID, camera power mask,
+configured cameras with their gain/exposure, fan state, trigger config and
+laser I2C parameters. When a device re-enumerates, plan_restore() compares
+the snapshot with what the device reports now and returns only the actions
+needed to bring it back. A USB glitch that kept the device powered needs
+no actions. A device that lost power gets back only what it lost.
+
+Identity is checked first. If the hardware ID changed, a different unit was
+plugged in, so the snapshot is dropped and nothing is restored. A running
+trigger is never restarted automatically; only its configuration is.
+"""
+
+import copy
+import threading
+import time
+
+DEVICES = ("console", "left", "right")
+
+_DESCRIPTOR_DEVICES = {"CONSOLE": "console", "SENSOR_LEFT": "left", "SENSOR_RIGHT": "right"}
+
+
+def device_key(descriptor):
+    """Map "CONSOLE" / "SENSOR_LEFT" / "SENSOR_RIGHT" to a snapshot key (None if unknown)."""
+    return _DESCRIPTOR_DEVICES.get(str(descriptor).upper())
+
+
+def power_mask(status):
+    """Convert a per-camera power status list to a bit mask."""
+    return sum(1 << i for i, on in enumerate(status or []) if on)
+
+
+class DeviceSnapshot:
+    """Last known configuration of one device."""
+
+    def __init__(self):
+        self.hardware_id = None
+        self.firmware_version = None
+        self.camera_power_mask = None
+        self.cameras = {}           # camera index -> (gain, exposure_us)
+        self.fan_control = None     # sensor fan on/off
+        self.fan_level = None       # console fan speed
+        self.trigger_config = None  # dict sent with set_trigger_json
+        self.laser_params = None    # list of I2C writes applied to the console
+        self.updated_at = None
+        self.disconnected_at = None
+
+
+class ReconnectManager:
+    """Thread-safe per-device configuration snapshots and restore planning."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self.restores = 0
+        self.identity_mismatches = 0
+        self.history = []   # recent restore records, newest last
+
+    def snapshot(self, device):
+        """Copy of the snapshot for device (None if nothing is known)."""
+        with self._lock:
+            snap = self._snapshots.get(device)
+            return copy.deepcopy(snap) if snap is not None else None
+
+    def update(self, device, **fields):
+        """Record configuration fields of a device (see DeviceSnapshot)."""
+        with self._lock:
+            snap = self._snapshots.setdefault(device, DeviceSnapshot())
+            for name, value in fields.items():
+                if not hasattr(snap, name):
+                    raise AttributeError(f"Unknown snapshot field: {name}")
+                setattr(snap, name, value)
+            snap.updated_at = time.time()
+
+    def record_camera(self, device, camera_index, gain, exposure):
+        with self._lock:
+            snap = self._snapshots.setdefault(device, DeviceSnapshot())
+            snap.cameras[int(camera_index)] = (int(gain), int(exposure))
+            snap.updated_at = time.time()
+
+    def drop_cameras(self, device, mask=0xFF):
+        """Forget configured cameras in mask, e.g. after their power was cut."""
+        with self._lock:
+            snap = self._snapshots.get(device)
+            if snap is not None:
+                snap.cameras = {i: v for i, v in snap.cameras.items() if not (mask >> i) & 1}
+
+    def mark_disconnected(self, device):
+        with self._lock:
+            snap = self._snapshots.get(device)
+            if snap is not None:
+                snap.disconnected_at = time.time()
+
+    def forget(self, device):
+        with self._lock:
+            self._snapshots.pop(device, None)
+
+    def plan_restore(self, device, live):
+        """
+        Work out what a re-enumerated device lost.
+
+        Args:
+            device (str): "console", "left" or "right"
+            live (dict): State read back from the device. Keys used:
+                hardware_id; sensors: camera_power_status, fan_control;
+                console: trigger_config, fan_level, laser_readback (one
+                bytes object or None per laser_params entry)
+
+        Returns:
+            tuple: (identity_ok: bool, actions: list of tuples)
+                ("camera_power", mask)
+                ("configure_camera", camera_index, gain, exposure)
+                ("fan_control", on)
+                ("fan_level", level)
+                ("trigger", config)
+                ("laser", param)
+        """
+        snap = self.snapshot(device)
+        if snap is None or snap.hardware_id is None:
+            return True, []
+
+        if live.get("hardware_id") != snap.hardware_id:
+            with self._lock:
+                self.identity_mismatches += 1
+                self._snapshots.pop(device, None)
+            return False, []
+
+        actions = []
+        if device == "console":
+            if snap.trigger_config:
+                current = live.get("trigger_config") or {}
+                if any(current.get(k) != v for k, v in snap.trigger_config.items()):
+                    actions.append(("trigger", snap.trigger_config))
+            if snap.fan_level is not None and live.get("fan_level") != snap.fan_level:
+                actions.append(("fan_level", snap.fan_level))
+            if snap.laser_params:
+                readback = live.get("laser_readback") or [None] * len(snap.laser_params)
+                for param, current in zip(snap.laser_params, readback):
+                    if current is None or bytes(current) != bytes(param["dataToSend"]):
+                        actions.append(("laser", param))
+        else:
+            if snap.camera_power_mask:
+                live_mask = power_mask(live.get("camera_power_status"))
+                lost = snap.camera_power_mask & ~live_mask
+                if lost:
+                    actions.append(("camera_power", lost))
+                # A camera that lost power lost its FPGA image and registers
+                for idx in sorted(snap.cameras):
+                    if (lost >> idx) & 1:
+                        gain, exposure = snap.cameras[idx]
+                        actions.append(("configure_camera", idx, gain, exposure))
+            if snap.fan_control is not None and live.get("fan_control") != snap.fan_control:
+                actions.append(("fan_control", snap.fan_control))
+        return True, actions
+
+    def record_restore(self, device, identity_ok, actions, failed, seconds):
+        """Keep a short history of restores for reporting."""
+        with self._lock:
+            self.restores += 1
+            self.history.append({
+                "device": device,
+                "identityOk": bool(identity_ok),
+                "actions": [a[0] for a in actions],
+                "failed": list(failed),
+                "seconds": float(seconds),
+                "time": time.time(),
+            })
+            del self.history[:-20]
+
+    def report(self):
+        with self._lock:
+            devices = {}
+            for name, snap in self._snapshots.items():
+                devices[name] = {
+                    "hardwareId": snap.hardware_id,
+                    "firmwareVersion": snap.firmware_version,
+                    "cameraPowerMask": snap.camera_power_mask,
+                    "cameras": sorted(snap.cameras),
+                    "fanControl": snap.fan_control,
+                    "fanLevel": snap.fan_level,
+                    "hasTrigger": bool(snap.trigger_config),
+                    "hasLaser": bool(snap.laser_params),
+                }
+            return {
+                "restores": self.restores,
+                "identityMismatches": self.identity_mismatches,
+                "devices": devices,
+                "history": list(self.history),
+            }
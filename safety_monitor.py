@@ -0,0 +1,199 @@
+"""
+High-rate safety interlock monitor.
+
+SafetyMonitorThread does nothing but poll the SE/SO interlock registers at a
+configurable rate. On a fault it calls the stop callback first, from the
+monitor thread itself, and only then signals the GUI thread to do the
+bookkeeping (run log, status thread, UI state).
+
+Detection latency (fault onset to detection) and stop latency (detection to
+trigger stopped) are recorded in LatencyHistograms for auditing. Real faults
+have an unknown onset, so their detection latency is the upper bound since
+the last clean read. SimulatedFaultSource injects faults with a known onset
+for end-to-end testing.
+"""
+
+import threading
+import time
+
+from PyQt6.QtCore import QMutex, QThread, QWaitCondition, pyqtSignal
+
+from diagnostics import LatencyHistogram
+
+# Interlock status registers: mux 1, address 0x41, offset 0x24, one byte per channel
+SAFETY_MUX_IDX = 1
+SAFETY_I2C_ADDR = 0x41
+SAFETY_OFFSET = 0x24
+SAFETY_CHANNELS = {"SE": 6, "SO": 7}
+
+DEFAULT_RATE_HZ = 20.0
+
+
+def safety_ok(statuses):
+    """True if neither SE nor SO reports a fault (low nibble clear)."""
+    return (statuses["SE"] & 0x0F) == 0 and (statuses["SO"] & 0x0F) == 0
+
+
+def safety_status_text(statuses):
+    return f"SE: 0x{statuses['SE']:02X}, SO: 0x{statuses['SO']:02X}"
+
+
+class SimulatedFaultSource:
+    """
+    Wraps a register reader and can override it with an injected fault.
+
+    read() returns {"SE": int, "SO": int}. While a fault is injected the
+    injected values are returned and fault_onset() reports when it started.
+    """
+
+    def __init__(self, reader=None):
+        self._reader = reader
+        self._lock = threading.Lock()
+        self._fault = None
+        self._onset = None
+
+    def inject(self, se=0x01, so=0x00):
+        with self._lock:
+            self._fault = {"SE": int(se) & 0xFF, "SO": int(so) & 0xFF}
+            self._onset = time.perf_counter()
+
+    def clear(self):
+        with self._lock:
+            self._fault = None
+            self._onset = None
+
+    def fault_onset(self):
+        with self._lock:
+            return self._onset
+
+    def read(self):
+        with self._lock:
+            fault = self._fault
+        if fault is not None:
+            return dict(fault)
+        if self._reader is None:
+            return {"SE": 0, "SO": 0}
+        return self._reader()
+
+
+class SafetyMonitorThread(QThread):
+    faultDetected = pyqtSignal(str)   # status text, emitted after the stop callback returned
+    faultCleared = pyqtSignal()
+    readError = pyqtSignal(str)
+
+    def __init__(self, source, stop_callback, rate_hz=DEFAULT_RATE_HZ, status_log=None, parent=None):
+        """
+        Args:
+            source: Object with read() -> {"SE": int, "SO": int} and optional fault_onset()
+            stop_callback (callable): Stops the trigger; called from this thread on a fault
+            rate_hz (float): Poll rate
+            status_log (callable): Optional, called with the status text about once per second
+        """
+        super().__init__(parent)
+        self.source = source
+        self.stop_callback = stop_callback
+        self.period = 1.0 / float(rate_hz)
+        self.status_log = status_log
+        self.detection_latency = LatencyHistogram()
+        self.stop_latency = LatencyHistogram()
+        self.read_latency = LatencyHistogram()
+        self.polls = 0
+        self.read_errors = 0
+        self.faults = 0
+        self._running = False
+        self._latched = False
+        self._read_failing = False
+        self._last_clean = None
+        self._mutex = QMutex()
+        self._wait_condition = QWaitCondition()
+
+    def report(self):
+        return {
+            "rateHz": 1.0 / self.period,
+            "polls": self.polls,
+            "readErrors": self.read_errors,
+            "faults": self.faults,
+            "detectionLatency": self.detection_latency.to_dict(),
+            "stopLatency": self.stop_latency.to_dict(),
+            "readLatency": self.read_latency.to_dict(),
+        }
+
+    def start_monitoring(self, priority=QThread.Priority.TimeCriticalPriority):
+        """Start (or restart) polling; latency statistics are kept across runs."""
+        if self.isRunning():
+            return
+        self._running = True
+        self._latched = False
+        self._read_failing = False
+        self._last_clean = None
+        self.start(priority)
+
+    def run(self):
+        log_every = max(1, int(round(1.0 / self.period)))
+        next_due = time.perf_counter()
+        while self._running:
+            self._poll_once(log_every)
+
+            # Drift-free: stay on the start + k * period grid, skip missed slots
+            next_due += self.period
+            now = time.perf_counter()
+            if next_due <= now:
+                next_due += (int((now - next_due) / self.period) + 1) * self.period
+            wait_ms = int((next_due - now) * 1000)
+            self._mutex.lock()
+            if self._running and wait_ms > 0:
+                self._wait_condition.wait(self._mutex, wait_ms)
+            self._mutex.unlock()
+
+    def _poll_once(self, log_every):
+        t0 = time.perf_counter()
+        try:
+            statuses = self.source.read()
+        except Exception as e:
+            self.read_errors += 1
+            # Report only the first error of a streak
+            if not self._read_failing:
+                self._read_failing = True
+                self.readError.emit(str(e))
+            return
+        self._read_failing = False
+        t1 = time.perf_counter()
+        self.polls += 1
+        self.read_latency.record(t1 - t0)
+
+        if safety_ok(statuses):
+            self._last_clean = t1
+            if self._latched:
+                self._latched = False
+                self.faultCleared.emit()
+        elif not self._latched:
+            self._latched = True
+            self.faults += 1
+            self._handle_fault(statuses, t1)
+
+        if self.status_log is not None and self.polls % log_every == 0:
+            self.status_log(safety_status_text(statuses))
+
+    def _handle_fault(self, statuses, detected_at):
+        # Stop the trigger before anything else
+        try:
+            self.stop_callback()
+        except Exception as e:
+            self.readError.emit(f"Trigger stop failed: {e}")
+        stopped_at = time.perf_counter()
+
+        onset = getattr(self.source, "fault_onset", lambda: None)()
+        if onset is None:
+            onset = self._last_clean if self._last_clean is not None else detected_at
+        self.detection_latency.record(detected_at - onset)
+        self.stop_latency.record(stopped_at - detected_at)
+
+        self.faultDetected.emit(safety_status_text(statuses))
+
+    def stop(self):
+        self._mutex.lock()
+        self._running = False
+        self._wait_condition.wakeAll()
+        self._mutex.unlock()
+        if QThread.currentThread() is not self:
+            self.wait()
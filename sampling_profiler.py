@@ -0,0 +1,240 @@
+"""
+Low-overhead sampling profiler for all Python threads.
+
+A daemon thread wakes every `interval` seconds, grabs sys._current_frames()
+and counts each thread's call stack. No tracing hooks are installed, so the
+profiled code runs at full speed; the cost is one stack walk per thread per
+sample.
+
+Threads are named from threading.enumerate() where possible. QThreads
+started by PyQt are not registered with the threading module, so they are
+named after the class of the QThread whose run() is at the bottom of the
+stack (e.g. "ConsoleStatusThread").
+
+Results are written as collapsed stacks (flamegraph.pl / speedscope input,
+"thread;outer;...;inner count") and as a speedscope JSON document with one
+sampled profile per thread.
+"""
+
+import collections
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger("ow-testapp.profiler")
+
+DEFAULT_INTERVAL_S = 0.01
+MAX_STACK_DEPTH = 128
+
+
+class SamplingProfiler:
+    """Periodic stack sampler; start(), then stop() and write()."""
+
+    def __init__(self, interval=DEFAULT_INTERVAL_S):
+        self.interval = float(interval)
+        self._counts = collections.Counter()    # (thread name, stack tuple) -> samples
+        self._counts_lock = threading.Lock()     # the sampler inserts while summary() reads
+        self._frame_labels = {}                  # code object -> (name, file, line)
+        self._thread_names = {}                  # ident -> (root code, name)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._on_finished = None
+        self.started_at = None
+        self.stopped_at = None
+        self.samples = 0
+        self.sample_time = 0.0   # seconds spent inside the sampler
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration=None, on_finished=None):
+        """
+        Start sampling in a daemon thread.
+
+        Args:
+            duration (float): Stop automatically after this many seconds (None: until stop())
+            on_finished (callable): Called with the profiler from the sampler thread once it stops
+        """
+        if self.running:
+            return
+        with self._counts_lock:
+            self._counts.clear()
+        self.samples = 0
+        self.sample_time = 0.0
+        self._on_finished = on_finished
+        self._stop_event.clear()
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._thread = threading.Thread(
+            target=self._run, args=(duration,), name="SamplingProfiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, wait=True, timeout=2.0):
+        """
+        Stop sampling.
+
+        Args:
+            wait (bool): Wait for the sampler thread, including on_finished
+                         (ignored when called from on_finished)
+            timeout (float): Longest wait in seconds
+        """
+        self._stop_event.set()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self, duration):
+        own_ident = threading.get_ident()
+        deadline = None if duration is None else time.monotonic() + float(duration)
+        next_due = time.monotonic()
+        while not self._stop_event.is_set():
+            t0 = time.perf_counter()
+            self._sample(own_ident)
+            self.sample_time += time.perf_counter() - t0
+
+            next_due += self.interval
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            if next_due <= now:
+                next_due = now + self.interval
+            self._stop_event.wait(next_due - now)
+
+        self.stopped_at = time.time()
+        if self._on_finished is not None:
+            try:
+                self._on_finished(self)
+            except Exception as e:
+                logger.error(f"Profiler completion callback failed: {e}")
+
+    def _sample(self, own_ident):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        main_ident = threading.main_thread().ident
+        keys = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            root = frame
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(self._label(frame.f_code))
+                root = frame
+                frame = frame.f_back
+            stack.reverse()
+            keys.append((self._thread_name(ident, root, names, main_ident), tuple(stack)))
+        with self._counts_lock:
+            self._counts.update(keys)
+        self.samples += 1
+
+    def _label(self, code):
+        label = self._frame_labels.get(code)
+        if label is None:
+            label = (code.co_qualname if hasattr(code, "co_qualname") else code.co_name,
+                     os.path.basename(code.co_filename), code.co_firstlineno)
+            self._frame_labels[code] = label
+        return label
+
+    def _thread_name(self, ident, root, names, main_ident):
+        cached = self._thread_names.get(ident)
+        if cached is not None and cached[0] is root.f_code:
+            return cached[1]
+
+        if ident == main_ident:
+            name = "MainThread (GUI)"
+        elif ident in names and not names[ident].startswith("Dummy-"):
+            name = names[ident]
+        else:
+            owner = root.f_locals.get("self") if root.f_code.co_name == "run" else None
+            name = type(owner).__name__ if owner is not None else f"Thread-{ident}"
+        self._thread_names[ident] = (root.f_code, name)
+        return name
+
+    def _snapshot(self):
+        with self._counts_lock:
+            return dict(self._counts)
+
+    def summary(self):
+        """Totals and the 20 hottest leaf functions per thread (safe while sampling)."""
+        per_thread = collections.defaultdict(collections.Counter)
+        for (thread, stack), n in self._snapshot().items():
+            leaf = stack[-1] if stack else ("<idle>", "", 0)
+            per_thread[thread][f"{leaf[0]} ({leaf[1]}:{leaf[2]})"] += n
+        elapsed = (self.stopped_at or time.time()) - (self.started_at or time.time())
+        return {
+            "samples": self.samples,
+            "intervalMs": self.interval * 1000.0,
+            "elapsedS": elapsed,
+            "overheadPct": 100.0 * self.sample_time / elapsed if elapsed > 0 else 0.0,
+            "threads": {
+                thread: [{"frame": f, "samples": n} for f, n in leaves.most_common(20)]
+                for thread, leaves in per_thread.items()
+            },
+        }
+
+    def write_collapsed(self, path):
+        """Write "thread;outer;...;inner count" lines (Brendan Gregg's collapsed format)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for (thread, stack), n in sorted(self._snapshot().items()):
+                frames = [thread.replace(";", ":")]
+                frames += [f"{name} ({file}:{line})".replace(";", ":") for name, file, line in stack]
+                f.write(f"{';'.join(frames)} {n}\n")
+        return path
+
+    def write_speedscope(self, path, name="OpenMOTION profile"):
+        """Write a speedscope JSON file with one sampled profile per thread."""
+        frame_index = {}
+        frames = []
+        profiles = {}
+        for (thread, stack), n in self._snapshot().items():
+            indices = []
+            for label in stack:
+                idx = frame_index.get(label)
+                if idx is None:
+                    idx = frame_index[label] = len(frames)
+                    frames.append({"name": label[0], "file": label[1], "line": label[2]})
+                indices.append(idx)
+            profile = profiles.setdefault(thread, {"samples": [], "weights": []})
+            profile["samples"].append(indices)
+            profile["weights"].append(n * self.interval)
+
+        doc = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "OpenMOTION sampling_profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(p["weights"]),
+                    "samples": p["samples"],
+                    "weights": p["weights"],
+                }
+                for thread, p in sorted(profiles.items())
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+        return path
+
+    def write(self, out_dir, prefix="profile"):
+        """
+        Write both output formats into out_dir.
+
+        Returns:
+            dict: collapsed / speedscope file paths
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        ts = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.started_at or time.time()))
+        base = os.path.join(out_dir, f"{prefix}-{ts}")
+        return {
+            "collapsed": self.write_collapsed(base + ".collapsed.txt"),
+            "speedscope": self.write_speedscope(base + ".speedscope.json"),
+        }
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Attach to the app's shared-memory frame bus and print live rates.
+
+Start the app with --frame-bus (or call startFrameBus) first. Shows frames/s
+per camera, the latest telemetry groups and the reader's overrun counters;
+also a minimal example of a FrameBusSubscriber client.
+
+Usage:
+  python frame_bus_monitor.py
+  python frame_bus_monitor.py --name openmotion-framebus --interval 2
+"""
+import argparse
+import collections
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_bus import DEFAULT_NAME, FrameBusSubscriber  # noqa: E402
+from histogram_classifier import block_weighted_mean_std  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monitor the shared-memory frame bus")
+    parser.add_argument("--name", default=DEFAULT_NAME, help="Segment name given to the publisher")
+    parser.add_argument("--interval", type=float, default=1.0, help="Report period in seconds")
+    args = parser.parse_args()
+
+    try:
+        bus = FrameBusSubscriber(args.name)
+    except FileNotFoundError:
+        print(f"No frame bus named {args.name}; start the app with --frame-bus")
+        return 1
+
+    with bus:
+        counts = collections.Counter()
+        means = {}
+        groups = set()
+        last_report = time.monotonic()
+        while bus.publisher_open:
+            for frame in bus.read_frames():
+                key = f"{frame.side}:{frame.camera + 1}"
+                counts[key] += 1
+                mean, _ = block_weighted_mean_std(frame.data[None, :])
+                if bus.valid(frame):
+                    means[key] = float(mean[0])
+            groups.update(s["group"] for s in bus.read_telemetry())
+
+            now = time.monotonic()
+            if now - last_report >= args.interval:
+                elapsed = now - last_report
+                cams = ", ".join(f"{k} {n / elapsed:.1f}/s (mean {means.get(k, 0):.0f})"
+                                 for k, n in sorted(counts.items())) or "no frames"
+                print(f"{cams} | telemetry: {', '.join(sorted(groups)) or '-'} | "
+                      f"overruns {bus.overruns}/{bus.telemetry_overruns}")
+                counts.clear()
+                groups.clear()
+                last_report = now
+            time.sleep(0.01)
+    print("Publisher closed the frame bus")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
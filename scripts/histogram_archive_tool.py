@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Import capture CSVs into the histogram archive and query it.
+
+Usage:
+  python histogram_archive_tool.py --db archive/histograms.db import path/to/csv_dir
+  python histogram_archive_tool.py --db archive/histograms.db query --serial ABC123
+  python histogram_archive_tool.py --db archive/histograms.db query --result FAIL --days 7
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from histogram_archive import HistogramArchive  # noqa: E402
+
+
+def cmd_import(archive, args):
+    t0 = time.perf_counter()
+    n = archive.import_csv_directory(args.directory, recursive=not args.no_recursive,
+                                     classify=not args.no_classify)
+    print(f"Imported {n} captures in {time.perf_counter() - t0:.1f} s "
+          f"({archive.count()} captures in archive)")
+
+
+def cmd_query(archive, args):
+    since = time.time() - args.days * 86400 if args.days else None
+    t0 = time.perf_counter()
+    rows = archive.query(serial=args.serial, result=args.result, since=since, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    for r in rows:
+        ts = datetime.fromtimestamp(r['captured_at']).strftime('%Y-%m-%d %H:%M:%S')
+        kind = 'dark' if r['is_dark'] else 'light'
+        mean = f"{r['mean']:.1f}" if r['mean'] is not None else '-'
+        print(f"{r['id']:>8} {ts} {r['serial']:<16} cam {r['camera_index']} {kind:<5} "
+              f"mean {mean:>7} {r['result'] or '-':<9} {'; '.join(r['reasons'])}")
+    print(f"{len(rows)} row(s) in {elapsed_ms:.1f} ms")
+
+
+def main():
+    p = argparse.ArgumentParser(description='Histogram capture archive tool')
+    p.add_argument('--db', default=os.path.join('archive', 'histograms.db'), help='Archive database path')
+    sub = p.add_subparsers(dest='command', required=True)
+
+    p_imp = sub.add_parser('import', help='Import a directory of capture CSVs')
+    p_imp.add_argument('directory')
+    p_imp.add_argument('--no-recursive', action='store_true', help='Do not scan subdirectories')
+    p_imp.add_argument('--no-classify', action='store_true', help='Skip mean/std and classification')
+
+    p_q = sub.add_parser('query', help='List archived captures')
+    p_q.add_argument('--serial')
+    p_q.add_argument('--result', choices=['PASS', 'FAIL', 'LOW_LIGHT'])
+    p_q.add_argument('--days', type=float, help='Only captures from the last N days')
+    p_q.add_argument('--limit', type=int, default=50)
+
+    args = p.parse_args()
+    archive = HistogramArchive(args.db)
+    try:
+        if args.command == 'import':
+            cmd_import(archive, args)
+        else:
+            cmd_query(archive, args)
+    finally:
+        archive.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
 """Plot run log values: TEC, PDU, and Analog vs time.
 
+The log is parsed once into min/max/mean telemetry pyramids, cached next to
+it in <log>.lod/, so long runs plot at a fixed point count; later plots of
+the same log (or of a zoomed window) skip parsing entirely.
+
 Usage: python plot_runlog.py --file path/to/run-YYYYMMDD_HHMMSS.log [--save out.png]
+       python plot_runlog.py --file run.log --start 3600 --end 7200 --points 1500
 """
 import argparse
+import json
 import re
+import sys
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage_manager import open_log  # noqa: E402
+from telemetry_pyramid import TelemetryPyramid  # noqa: E402
+
+# Channels per plot group, in parse_log() tuple order after the timestamp
+GROUP_CHANNELS = {
+    'tec': ('temp', 'set', 'tec_c', 'tec_v'),
+    'pdu0': tuple(f'ADC0_{i}' for i in range(8)),
+    'pdu1': tuple(f'ADC1_{i}' for i in range(8)),
+    'analog': ('TCM', 'TCL', 'PDC'),
+}
+
 
 def parse_log(path):
     ts_re = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})')
@@ -20,7 +40,7 @@ def parse_log(path):
         'analog': [],  # tuples: (dt, tcm, tcl, pdc)
         'versions': {}
     }
-    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+    with open_log(path, 'r', encoding='utf-8', errors='ignore') as f:
         for line in f:
             m = ts_re.match(line)
             if not m:
@@ -68,19 +88,82 @@ def parse_log(path):
     return data
 
 
-def to_seconds(base, dt):
-    return (dt - base).total_seconds()
-
-
-def plot_data(filepath, data, save_path=None, show=True):
-    # choose base time
-    all_times = []
-    for k in ('tec', 'pdu0', 'pdu1', 'analog'):
-        for t in data[k]:
-            all_times.append(t[0])
-    if not all_times:
+def _group_arrays(data, group):
+    """(epoch seconds, (n, channels) values) of one parse_log() group."""
+    rows = data[group]
+    t = np.array([r[0].timestamp() for r in rows], dtype=np.float64)
+    if group in ('pdu0', 'pdu1'):
+        width = len(GROUP_CHANNELS[group])
+        vals = np.full((len(rows), width), np.nan)
+        for i, r in enumerate(rows):
+            vals[i, :min(width, len(r[1]))] = r[1][:width]
+    else:
+        vals = np.array([[np.nan if x is None else x for x in r[1:]] for r in rows], dtype=np.float64)
+    return t, vals
+
+
+def build_pyramids(data, max_points=2000):
+    """One pyramid per group, bucketed at the group's typical sample spacing."""
+    pyramids = {}
+    for group, channels in GROUP_CHANNELS.items():
+        if not data[group]:
+            continue
+        t, vals = _group_arrays(data, group)
+        spacing = float(np.median(np.diff(t))) if len(t) > 1 else 1.0
+        pyramid = TelemetryPyramid.for_span(t.max() - t.min() + spacing, max(spacing, 0.1), max_points)
+        for i, name in enumerate(channels):
+            pyramid.extend(name, t, vals[:, i])
+        pyramids[group] = pyramid
+    return pyramids
+
+
+def load_or_build(filepath, rebuild=False):
+    """Pyramids and version info for a log, from the <log>.lod cache when up to date."""
+    cache_dir = filepath + '.lod'
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    log_mtime = os.path.getmtime(filepath)
+    if not rebuild and os.path.isfile(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('logMtime') == log_mtime:
+            pyramids = {g: TelemetryPyramid.load(os.path.join(cache_dir, f'{g}.npz')) for g in meta['groups']}
+            return pyramids, meta['versions']
+
+    data = parse_log(filepath)
+    pyramids = build_pyramids(data)
+    os.makedirs(cache_dir, exist_ok=True)
+    for group, pyramid in pyramids.items():
+        pyramid.save(os.path.join(cache_dir, f'{group}.npz'))
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'logMtime': log_mtime, 'groups': list(pyramids), 'versions': data['versions']}, f)
+    return pyramids, data['versions']
+
+
+def _plot_channel(ax, pyramid, name, base, start, end, points, **style):
+    series = pyramid.query(name, start, end, points)
+    if not series['t']:
+        return False
+    t = np.asarray(series['t']) + series['bucketS'] / 2 - base
+    line, = ax.plot(t, series['mean'], label=name, **style)
+    if series['bucketS'] > pyramid.base_interval:
+        ax.fill_between(t, series['min'], series['max'], color=line.get_color(), alpha=0.15, linewidth=0)
+    return True
+
+
+def plot_data(filepath, pyramids, versions, save_path=None, show=True, start=None, end=None, points=2000):
+    """
+    Plot TEC, PDU and analog groups from their pyramids.
+
+    start/end are seconds since the first sample; each channel is drawn as
+    its bucket means with a min/max band once buckets span several samples.
+    """
+    ranges = [p.time_range() for p in pyramids.values()]
+    ranges = [r for r in ranges if r is not None]
+    if not ranges:
         raise SystemExit('No timestamped data found in log.')
-    base = min(all_times)
+    base = min(r[0] for r in ranges)
+    t_start = base + start if start is not None else None
+    t_end = base + end if end is not None else None
 
     fig, axes = plt.subplots(3, 1, figsize=(12, 9), sharex=True)
 
@@ -89,25 +172,21 @@ def plot_data(filepath, data, save_path=None, show=True):
     fig.suptitle(fname, fontsize=14)
     ver_lines = []
     for k in ('App', 'SDK', 'Console'):
-        if k in data['versions']:
-            ver_lines.append(f"{k}: {data['versions'][k]}")
+        if k in versions:
+            ver_lines.append(f"{k}: {versions[k]}")
     ver_text = '\n'.join(ver_lines)
     fig.text(0.01, 0.98, ver_text, ha='left', va='top', fontsize=10)
 
     # TEC plot
-    if data['tec']:
-        times = [to_seconds(base, t[0]) for t in data['tec']]
-        temp = [t[1] for t in data['tec']]
-        setp = [t[2] for t in data['tec']]
-        tec_c = [t[3] for t in data['tec']]
-        tec_v = [t[4] for t in data['tec']]
+    tec = pyramids.get('tec')
+    if tec is not None:
         ax = axes[0]
-        ax.plot(times, temp, label='temp (C)')
-        ax.plot(times, setp, label='set (C)', linestyle='--')
+        _plot_channel(ax, tec, 'temp', base, t_start, t_end, points)
+        _plot_channel(ax, tec, 'set', base, t_start, t_end, points, linestyle='--')
         ax.set_ylabel('Temp (C)')
         ax2 = ax.twinx()
-        ax2.plot(times, tec_c, label='tec_c', color='C3', alpha=0.8)
-        ax2.plot(times, tec_v, label='tec_v', color='C4', alpha=0.8)
+        _plot_channel(ax2, tec, 'tec_c', base, t_start, t_end, points, color='C3', alpha=0.8)
+        _plot_channel(ax2, tec, 'tec_v', base, t_start, t_end, points, color='C4', alpha=0.8)
         ax2.set_ylabel('TEC I/V')
         ax.legend(loc='upper left')
         ax2.legend(loc='upper right')
@@ -118,19 +197,12 @@ def plot_data(filepath, data, save_path=None, show=True):
     # PDU plot
     ax = axes[1]
     plotted = False
-    if data['pdu0']:
-        times0 = [to_seconds(base, t[0]) for t in data['pdu0']]
-        # transpose lists to channels
-        vals0 = list(zip(*[t[1] for t in data['pdu0']]))
-        for i, ch in enumerate(vals0):
-            ax.plot(times0, ch, label=f'ADC0_{i}')
-            plotted = True
-    if data['pdu1']:
-        times1 = [to_seconds(base, t[0]) for t in data['pdu1']]
-        vals1 = list(zip(*[t[1] for t in data['pdu1']]))
-        for i, ch in enumerate(vals1):
-            ax.plot(times1, ch, label=f'ADC1_{i}', linestyle='--', alpha=0.8)
-            plotted = True
+    for group, style in (('pdu0', {}), ('pdu1', {'linestyle': '--', 'alpha': 0.8})):
+        pyramid = pyramids.get(group)
+        if pyramid is None:
+            continue
+        for name in GROUP_CHANNELS[group]:
+            plotted |= _plot_channel(ax, pyramid, name, base, t_start, t_end, points, **style)
     if plotted:
         ax.set_ylabel('PDU (V)')
         ax.legend(ncol=4, fontsize=8)
@@ -140,14 +212,10 @@ def plot_data(filepath, data, save_path=None, show=True):
 
     # Analog plot
     ax = axes[2]
-    if data['analog']:
-        times = [to_seconds(base, t[0]) for t in data['analog']]
-        tcm = [t[1] for t in data['analog']]
-        tcl = [t[2] for t in data['analog']]
-        pdc = [t[3] for t in data['analog']]
-        ax.plot(times, tcm, label='TCM')
-        ax.plot(times, tcl, label='TCL')
-        ax.plot(times, pdc, label='PDC')
+    analog = pyramids.get('analog')
+    if analog is not None:
+        for name in GROUP_CHANNELS['analog']:
+            _plot_channel(ax, analog, name, base, t_start, t_end, points)
         ax.set_ylabel('Analog')
         ax.legend()
         ax.grid(True)
@@ -168,9 +236,14 @@ def main():
     p = argparse.ArgumentParser(description='Plot run log values')
     p.add_argument('--file', '-f', required=True, help='Path to run log')
     p.add_argument('--save', '-s', help='Save output image (png)')
+    p.add_argument('--start', type=float, help='Window start (seconds since start of log)')
+    p.add_argument('--end', type=float, help='Window end (seconds since start of log)')
+    p.add_argument('--points', type=int, default=2000, help='Points per channel')
+    p.add_argument('--rebuild', action='store_true', help='Re-parse the log even if a cache exists')
     args = p.parse_args()
-    data = parse_log(args.file)
-    plot_data(args.file, data, save_path=args.save)
+    pyramids, versions = load_or_build(args.file, rebuild=args.rebuild)
+    plot_data(args.file, pyramids, versions, save_path=args.save,
+              start=args.start, end=args.end, points=args.points)
 
 
 if __name__ == '__main__':
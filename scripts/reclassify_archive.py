@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Re-score saved light captures with new classifier thresholds.
+
+Finds every *_histogram_light*.csv below the given directories, parses
+them into a memory-mapped (n, 1024) matrix and classifies the matrix in
+chunks across a process pool. Writes a verdict table and a table of the
+captures whose verdict changed relative to the baseline:
+
+- --db: the result stored in the histogram archive for the same CSV path
+- --baseline: the "result" column of an earlier verdict table
+- otherwise: the classifier's current defaults, scored in the same pass
+
+With --cache DIR the parsed matrix is kept, and only new or modified
+files are parsed on the next run.
+
+Usage:
+  python reclassify_archive.py captures/ --kurtosis 1.5 --skewness 0.3
+  python reclassify_archive.py captures/ --db archive/histograms.db --out verdicts.csv
+  python reclassify_archive.py captures/ --cache reclassify-cache --workers 8 --peak-prominence 0.1
+"""
+import argparse
+import collections
+import csv
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+import histogram_classifier  # noqa: E402
+from histogram_archive import capture_csv_kind, iter_capture_csvs, read_capture_csv  # noqa: E402
+from histogram_classifier import block_moments, block_weighted_mean_std  # noqa: E402
+
+BINS = 1024
+
+# Command-line option -> histogram_classifier module setting
+TUNABLES = {
+    "kurtosis": "kurtosis_threshold",
+    "skewness": "skewness_threshold",
+    "low_light": "LOW_LIGHT_MEAN_THRESHOLD",
+    "smoothing": "SMOOTHING_WINDOW",
+    "peak_height": "PEAK_HEIGHT_FRACTION",
+    "peak_distance": "PEAK_MIN_DISTANCE",
+    "peak_prominence": "PEAK_PROMINENCE_FRACTION",
+    "hump_threshold": "HUMP_THRESHOLD_FRACTION",
+}
+# Settings counted in bins; everything else is a float
+INTEGER_TUNABLES = {"SMOOTHING_WINDOW", "PEAK_MIN_DISTANCE"}
+
+
+def parse_capture(path):
+    """(camera_index, bins, temperature) of one capture CSV, or None."""
+    with open(path, "rb") as f:
+        f.readline()                # header
+        line = f.readline()
+    values = np.fromstring(line, sep=",") if line else np.empty(0)
+    if len(values) < 2 + BINS:
+        # Not plain numbers (or truncated): take the tolerant path
+        return read_capture_csv(path)
+    temperature = float(values[2 + BINS]) if len(values) > 2 + BINS else float("nan")
+    return int(values[0]), values[2:2 + BINS], temperature
+
+
+# --- worker processes -------------------------------------------------------
+
+_matrices = {}
+
+
+def _matrix(path, mode="r"):
+    key = (path, mode)
+    if key not in _matrices:
+        _matrices[key] = np.load(path, mmap_mode=mode)
+    return _matrices[key]
+
+
+def _apply(settings):
+    for name, value in settings.items():
+        setattr(histogram_classifier, name, value)
+
+
+def _parse_chunk(task):
+    matrix_path, rows = task
+    matrix = _matrix(matrix_path, "r+")
+    out = []
+    for row, path in rows:
+        try:
+            parsed = parse_capture(path)
+        except Exception:
+            parsed = None
+        if parsed is None:
+            out.append((row, -1, float("nan"), False))
+            continue
+        camera, bins, temperature = parsed
+        matrix[row, :len(bins)] = bins
+        out.append((row, camera, float("nan") if temperature is None else temperature, True))
+    matrix.flush()
+    return out
+
+
+def _classify_chunk(task):
+    matrix_path, start, stop, settings, baseline_settings = task
+    block = np.asarray(_matrix(matrix_path)[start:stop], dtype=np.float64)
+    means, _ = block_weighted_mean_std(block)
+    _, _, skewness, kurtosis = block_moments(block)
+    results = []
+    for hist in block:
+        baseline = None
+        if baseline_settings is not None:
+            _apply(baseline_settings)
+            baseline, _ = histogram_classifier.classify_histogram_with_reasons(hist, True)
+        _apply(settings)
+        result, reasons = histogram_classifier.classify_histogram_with_reasons(hist, True)
+        results.append((result, reasons, baseline))
+    return start, means.tolist(), skewness.tolist(), kurtosis.tolist(), results
+
+
+# --- parent process ---------------------------------------------------------
+
+def discover(directories):
+    files = []
+    for directory in directories:
+        for path in iter_capture_csvs(directory):
+            kind = capture_csv_kind(path)
+            if kind and kind[1] == "light":
+                st = os.stat(path)
+                files.append((path, kind[0], st.st_mtime, st.st_size))
+    return sorted(files)
+
+
+def chunks(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def load_matrix(files, cache_dir, pool, chunk):
+    """Parse files into <cache_dir>/matrix.npy, reusing rows of an earlier run."""
+    matrix_path = os.path.join(cache_dir, "matrix.npy")
+    index_path = os.path.join(cache_dir, "index.json")
+    previous = {}
+    old = None
+    if os.path.exists(matrix_path) and os.path.exists(index_path):
+        with open(index_path, "r", encoding="utf-8") as f:
+            previous = {tuple(e[:3]): e[3:] + [i] for i, e in enumerate(json.load(f))}
+        old = np.load(matrix_path, mmap_mode="r")
+
+    new_path = os.path.join(cache_dir, "matrix.tmp.npy")
+    matrix = np.lib.format.open_memmap(new_path, mode="w+", dtype=np.uint32, shape=(len(files), BINS))
+    cameras = np.full(len(files), -1, dtype=np.int64)
+    temperatures = np.full(len(files), np.nan)
+    ok = np.zeros(len(files), dtype=bool)
+
+    reused, todo = [], []
+    for row, (path, _, mtime, size) in enumerate(files):
+        hit = previous.get((path, mtime, size))
+        if hit is not None and hit[2]:
+            cameras[row], temperatures[row], ok[row] = hit[0], hit[1], True
+            reused.append((row, hit[3]))
+        else:
+            todo.append((row, path))
+    if reused:
+        rows, old_rows = (np.array(x) for x in zip(*reused))
+        matrix[rows] = old[old_rows]
+    matrix.flush()
+    del matrix, old
+
+    for results in pool.imap_unordered(_parse_chunk, [(new_path, c) for c in chunks(todo, chunk)]):
+        for row, camera, temperature, parsed in results:
+            cameras[row], temperatures[row], ok[row] = camera, temperature, parsed
+
+    os.replace(new_path, matrix_path)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump([[p, m, s, int(c), None if t != t else float(t), bool(k)]
+                   for (p, _, m, s), c, t, k in zip(files, cameras, temperatures, ok)], f)
+    return matrix_path, cameras, temperatures, ok, len(reused), len(todo)
+
+
+def load_baseline(args):
+    if args.db:
+        conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+        try:
+            return dict(conn.execute(
+                "SELECT source_path, result FROM captures WHERE source_path IS NOT NULL AND is_dark = 0"))
+        finally:
+            conn.close()
+    if args.baseline:
+        with open(args.baseline, "r", newline="", encoding="utf-8") as f:
+            return {r["path"]: r["result"] for r in csv.DictReader(f)}
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-classify saved light histogram captures")
+    parser.add_argument("directories", nargs="+", help="Directories with capture CSVs (searched recursively)")
+    parser.add_argument("--out", default="reclassified.csv", help="Verdict table (default reclassified.csv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--chunk", type=int, default=256, help="Captures per task")
+    parser.add_argument("--cache", default=None, help="Keep the parsed matrix here for the next run")
+    baseline = parser.add_mutually_exclusive_group()
+    baseline.add_argument("--db", default=None, help="Histogram archive with the original verdicts")
+    baseline.add_argument("--baseline", default=None, help="Earlier verdict table to diff against")
+    tuning = parser.add_argument_group("classifier settings (default: histogram_classifier.py)")
+    for option, name in TUNABLES.items():
+        kind = int if name in INTEGER_TUNABLES else float
+        tuning.add_argument(f"--{option.replace('_', '-')}", type=kind, default=None,
+                            help=f"{name} (now {getattr(histogram_classifier, name)})")
+    args = parser.parse_args()
+
+    defaults = {name: getattr(histogram_classifier, name) for name in TUNABLES.values()}
+    settings = dict(defaults)
+    settings.update({TUNABLES[o]: v for o, v in vars(args).items() if o in TUNABLES and v is not None})
+
+    t0 = time.perf_counter()
+    files = discover(args.directories)
+    if not files:
+        print("No light capture CSVs found")
+        return 1
+    print(f"Found {len(files)} light captures in {time.perf_counter() - t0:.1f} s")
+
+    stored = load_baseline(args)
+    cache_dir = args.cache or tempfile.mkdtemp(prefix="reclassify-")
+    os.makedirs(cache_dir, exist_ok=True)
+    try:
+        with multiprocessing.Pool(max(1, args.workers)) as pool:
+            t1 = time.perf_counter()
+            matrix_path, cameras, temperatures, ok, reused, parsed = load_matrix(files, cache_dir, pool, args.chunk)
+            print(f"Parsed {parsed} files, reused {reused} cached rows in {time.perf_counter() - t1:.1f} s")
+
+            t2 = time.perf_counter()
+            n = len(files)
+            means, skews, kurts = np.zeros(n), np.zeros(n), np.zeros(n)
+            verdicts = [None] * n
+            baseline_settings = defaults if stored is None else None
+            # Unreadable files are zero rows; they are scored but left out of the table
+            tasks = []
+            for start in range(0, n, args.chunk):
+                stop = min(start + args.chunk, n)
+                tasks.append((matrix_path, start, stop, settings, baseline_settings))
+            done = 0
+            for start, m, s, k, results in pool.imap_unordered(_classify_chunk, tasks):
+                stop = start + len(results)
+                means[start:stop], skews[start:stop], kurts[start:stop] = m, s, k
+                verdicts[start:stop] = results
+                done += len(results)
+                print(f"\rClassified {done}/{n}", end="", flush=True)
+            elapsed = time.perf_counter() - t2
+            print(f"\rClassified {n} captures in {elapsed:.1f} s "
+                  f"({n / elapsed if elapsed > 0 else 0:,.0f}/s on {args.workers} workers)")
+    finally:
+        if args.cache is None:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    header = ["path", "serial", "camera", "temperature", "mean", "skewness", "kurtosis",
+              "baseline", "result", "changed", "reasons"]
+    transitions = collections.Counter()
+    changed_rows = []
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i, (path, serial, _, _) in enumerate(files):
+            if not ok[i]:
+                continue
+            result, reasons, base = verdicts[i]
+            if stored is not None:
+                base = stored.get(path)
+            changed = base is not None and base != result
+            transitions[(base or "-", result)] += 1
+            row = [path, serial, int(cameras[i]),
+                   "" if np.isnan(temperatures[i]) else f"{temperatures[i]:.2f}",
+                   f"{means[i]:.2f}", f"{skews[i]:.4f}", f"{kurts[i]:.4f}",
+                   base or "", result, int(changed), "; ".join(reasons)]
+            writer.writerow(row)
+            if changed:
+                changed_rows.append(row)
+
+    diff_path = os.path.splitext(args.out)[0] + "_diff.csv"
+    with open(diff_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(changed_rows)
+
+    source = "archive" if args.db else (args.baseline if args.baseline else "current defaults")
+    print(f"Baseline: {source}")
+    for (base, result), count in sorted(transitions.items()):
+        marker = "" if base in ("-", result) else "  <- changed"
+        print(f"  {base:>9} -> {result:<9} {count:>7}{marker}")
+    skipped = int((~ok).sum())
+    print(f"{len(changed_rows)} verdict(s) changed; table: {args.out}, diff: {diff_path}"
+          + (f"; {skipped} unreadable file(s) skipped" if skipped else ""))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Replay a recorded session through the analysis chain as fast as possible.
+
+Runs the same stages the app applies to live frames (per-bin statistics and
+speckle contrast, optionally the histogram classifier) without Qt or
+hardware, and reports the frames per second each stage sustains.
+
+Usage:
+  python replay_benchmark.py sessions/session-YYYYMMDD_HHMMSS.omsession
+  python replay_benchmark.py session.omsession --repeat 5 --classify
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from histogram_classifier import classify_histogram_with_reasons  # noqa: E402
+from histogram_stats import BinStatistics, camera_slot  # noqa: E402
+from session_replay import KIND_FRAMES, iter_session  # noqa: E402
+from speckle_analysis import SpeckleContrastStage  # noqa: E402
+
+
+def load_blocks(path):
+    blocks = []
+    for event in iter_session(path):
+        if event.kind == KIND_FRAMES:
+            side, cameras, frames = event.data
+            slots = [camera_slot(side, idx) for idx in cameras]
+            blocks.append((event.timestamp, slots, frames.astype(np.float64)[:, :1024]))
+    return blocks
+
+
+def run(blocks, classify):
+    stages = {"binStatistics": 0.0, "speckle": 0.0}
+    if classify:
+        stages["classifier"] = 0.0
+    bin_stats = BinStatistics()
+    speckle = SpeckleContrastStage()
+    frames = 0
+    t_start = time.perf_counter()
+    for timestamp, slots, block in blocks:
+        t0 = time.perf_counter()
+        bin_stats.update(slots, block)
+        t1 = time.perf_counter()
+        speckle.process(timestamp, slots, block)
+        t2 = time.perf_counter()
+        stages["binStatistics"] += t1 - t0
+        stages["speckle"] += t2 - t1
+        if classify:
+            for row in block:
+                classify_histogram_with_reasons(row, True)
+            stages["classifier"] += time.perf_counter() - t2
+        frames += len(slots)
+    return frames, time.perf_counter() - t_start, stages
+
+
+def main():
+    p = argparse.ArgumentParser(description='Session replay throughput benchmark')
+    p.add_argument('session', help='Session file recorded by the app')
+    p.add_argument('--repeat', type=int, default=3, help='Number of passes over the session')
+    p.add_argument('--classify', action='store_true', help='Also run the histogram classifier per frame')
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    blocks = load_blocks(args.session)
+    n_frames = sum(len(b[1]) for b in blocks)
+    if not blocks:
+        print("No frames in session")
+        return 1
+    span = blocks[-1][0] - blocks[0][0]
+    print(f"Loaded {len(blocks)} blocks / {n_frames} frames ({span:.1f} s recorded) "
+          f"in {time.perf_counter() - t0:.2f} s")
+
+    for i in range(args.repeat):
+        frames, elapsed, stages = run(blocks, args.classify)
+        fps = frames / elapsed if elapsed > 0 else 0.0
+        speed = span / elapsed if elapsed > 0 else 0.0
+        detail = ", ".join(f"{name} {1e6 * t / frames:.1f} us/frame" for name, t in stages.items())
+        print(f"pass {i + 1}: {fps:,.0f} frames/s ({speed:.0f}x real time) - {detail}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Sweep histogram classifier thresholds over archived light captures.
+
+Features are extracted once per capture into a feature store (keyed by a
+hash of the bins), so later sweeps over the same captures only read the
+store. Each setting takes a comma-separated list or a start:stop:step
+range. Settings left out keep their histogram_classifier.py value.
+
+Usage:
+  python sweep_thresholds.py --db archive/histograms.db --kurtosis 0.5:2:0.25 --skewness 0.1,0.2,0.3
+  python sweep_thresholds.py --csv captures/ --peak-prominence 0.05,0.08,0.12 --out sweep.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+import histogram_classifier  # noqa: E402
+from histogram_archive import (HISTOGRAM_BINS, HistogramArchive, capture_csv_kind,  # noqa: E402
+                               iter_capture_csvs, read_capture_csv)
+from histogram_features import SWEEP_SETTINGS, FeatureStore, sweep  # noqa: E402
+
+# Command-line option -> sweepable classifier setting
+OPTIONS = {
+    "low_light": "LOW_LIGHT_MEAN_THRESHOLD",
+    "kurtosis": "kurtosis_threshold",
+    "skewness": "skewness_threshold",
+    "peak_height": "PEAK_HEIGHT_FRACTION",
+    "peak_distance": "PEAK_MIN_DISTANCE",
+    "peak_prominence": "PEAK_PROMINENCE_FRACTION",
+    "hump_threshold": "HUMP_THRESHOLD_FRACTION",
+}
+BATCH = 5000
+
+
+def parse_values(text):
+    """'0.1,0.2' or 'start:stop:step' (stop included) -> list of floats."""
+    if ":" in text:
+        start, stop, step = (float(x) for x in text.split(":"))
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 10) for i in range(max(count, 0))]
+    return [float(x) for x in text.split(",") if x.strip()]
+
+
+def load_from_archive(store, db_path, serial=None, days=None):
+    archive = HistogramArchive(db_path)
+    try:
+        since = time.time() - days * 86400 if days else None
+        ids = [r["id"] for r in archive.query(serial=serial, is_dark=False, since=since)]
+        rows = [store.add(archive.get_histograms(ids[i:i + BATCH])) for i in range(0, len(ids), BATCH)]
+    finally:
+        archive.close()
+    return np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+
+
+def load_from_csvs(store, directory):
+    block, rows = [], []
+    for path in iter_capture_csvs(directory):
+        kind = capture_csv_kind(path)
+        parsed = read_capture_csv(path) if kind and kind[1] == "light" else None
+        if parsed is None:
+            continue
+        bins = np.zeros(HISTOGRAM_BINS, dtype=np.uint32)
+        values = parsed[1][:HISTOGRAM_BINS]
+        bins[:len(values)] = values
+        block.append(bins)
+        if len(block) == BATCH:
+            rows.append(store.add(np.array(block)))
+            block = []
+    if block:
+        rows.append(store.add(np.array(block)))
+    return np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep classifier thresholds over stored captures")
+    parser.add_argument("--db", default=None, help="Histogram archive to take light captures from")
+    parser.add_argument("--csv", action="append", default=[], help="Directory of capture CSVs (repeatable)")
+    parser.add_argument("--serial", default=None, help="Only this camera serial (archive)")
+    parser.add_argument("--days", type=float, default=None, help="Only captures from the last N days (archive)")
+    parser.add_argument("--store", default=os.path.join("archive", "features"), help="Feature store directory")
+    parser.add_argument("--out", default="threshold_sweep.csv", help="Result table")
+    grid_opts = parser.add_argument_group("grid (list '0.1,0.2' or range 'start:stop:step')")
+    for option, name in OPTIONS.items():
+        grid_opts.add_argument(f"--{option.replace('_', '-')}", default=None,
+                               help=f"{name} (now {getattr(histogram_classifier, name)})")
+    args = parser.parse_args()
+    if not args.db and not args.csv:
+        parser.error("give --db and/or --csv")
+
+    grid = {}
+    for option, name in OPTIONS.items():
+        text = getattr(args, option)
+        if text:
+            values = parse_values(text)
+            if name == "PEAK_MIN_DISTANCE":
+                values = [int(round(v)) for v in values]
+            grid[name] = values
+
+    t0 = time.perf_counter()
+    store = FeatureStore(args.store)
+    known = len(store)
+    rows = []
+    if args.db:
+        rows.append(load_from_archive(store, args.db, args.serial, args.days))
+    for directory in args.csv:
+        rows.append(load_from_csvs(store, directory))
+    rows = np.unique(np.concatenate(rows))
+    store.save()
+    print(f"{len(rows)} captures ({len(store) - known} new to the feature store) "
+          f"in {time.perf_counter() - t0:.1f} s")
+    if not len(rows):
+        return 1
+
+    t1 = time.perf_counter()
+    results = sweep(store.select(rows), grid, store.min_height_fraction)
+    print(f"Evaluated {len(results)} setting(s) in {time.perf_counter() - t1:.2f} s")
+
+    columns = list(results[0])
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+
+    varied = [name for name in SWEEP_SETTINGS if len(grid.get(name, ())) > 1]
+    shown = sorted(results, key=lambda r: r["fail_rate"])[:20]
+    print("  ".join(f"{name:>24}" for name in varied) + "      PASS      FAIL  LOW_LIGHT  fail rate")
+    for r in shown:
+        print("  ".join(f"{r[name]:>24g}" for name in varied)
+              + f"  {r['PASS']:>8}  {r['FAIL']:>8}  {r['LOW_LIGHT']:>9}  {100 * r['fail_rate']:>8.2f}%")
+    if len(results) > len(shown):
+        print(f"... lowest {len(shown)} fail rates of {len(results)}; full table: {args.out}")
+    else:
+        print(f"Table: {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Record live sessions and replay them without hardware.
+
+SessionRecorder appends two kinds of records to a session file while the
+app runs: histogram frame blocks (sensor side, camera indices, 1024-bin
+frames) as they enter the analysis pipeline, and console telemetry
+snapshots as they are published. Each record carries its original
+timestamp.
+
+SessionReplayThread reads a session back and emits the records in order,
+paced from the recorded timestamps at 1x, Nx, or as fast as the consumer
+keeps up (speed <= 0). Pacing uses an absolute schedule, so delays do not
+accumulate, and frame timestamps are passed through unchanged, so a replay
+produces the same analysis results at any speed. At most `max_in_flight`
+frame blocks are outstanding; the consumer calls release() after
+processing each one, which makes an as-fast-as-possible replay a measure of
+the frames per second the processing chain sustains.
+
+File layout: MAGIC, then records of struct "<BdI" (kind, timestamp,
+payload length) followed by the payload. Frame payloads are a "<H"-length
+JSON header ({"side", "cameras"}) and the frame block encoded with
+histogram_codec (version 1 files: zlib-compressed little-endian uint32);
+telemetry payloads are JSON {"group", "fields"}.
+"""
+
+import collections
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from histogram_codec import decode_frames, encode_frames
+
+logger = logging.getLogger("ow-testapp.replay")
+
+MAGIC = b"OMSESSION2\n"
+MAGIC_V1 = b"OMSESSION1\n"
+KIND_FRAMES = 1
+KIND_TELEMETRY = 2
+
+_RECORD = struct.Struct("<BdI")
+_META_LEN = struct.Struct("<H")
+
+DEFAULT_MAX_IN_FLIGHT = 4
+
+SessionEvent = collections.namedtuple("SessionEvent", "kind timestamp data")
+
+
+def _json_default(value):
+    # numpy scalars and arrays coming from the telemetry pollers
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class SessionRecorder:
+    """Thread-safe append-only writer for session files."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self.started_at = time.time()
+        self.frames = 0
+        self.telemetry = 0
+        self.bytes_written = len(MAGIC)
+
+    def record_frames(self, sensor_side, camera_indices, frames, timestamp=None):
+        """
+        Append one frame block.
+
+        Args:
+            sensor_side (str): "left" or "right"
+            camera_indices (list): Camera index of each row
+            frames (array): (len(camera_indices), 1024) histogram counts
+            timestamp (float): Frame time (defaults to now)
+        """
+        block = np.asarray(frames).reshape(len(camera_indices), -1)
+        meta = json.dumps({"side": sensor_side, "cameras": [int(i) for i in camera_indices]}).encode()
+        payload = _META_LEN.pack(len(meta)) + meta + encode_frames(block, level=1)
+        self._write(KIND_FRAMES, timestamp, payload)
+        self.frames += len(camera_indices)
+
+    def record_telemetry(self, group, fields, timestamp=None):
+        payload = json.dumps({"group": group, "fields": fields}, default=_json_default).encode()
+        self._write(KIND_TELEMETRY, timestamp, payload)
+        self.telemetry += 1
+
+    def _write(self, kind, timestamp, payload):
+        header = _RECORD.pack(kind, time.time() if timestamp is None else float(timestamp), len(payload))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(header)
+            self._file.write(payload)
+            self.bytes_written += len(header) + len(payload)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        return self.stats()
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "frames": self.frames,
+            "telemetry": self.telemetry,
+            "bytes": self.bytes_written,
+            "seconds": time.time() - self.started_at,
+        }
+
+
+def iter_session(path):
+    """
+    Yield the records of a session file in recorded order.
+
+    Yields:
+        SessionEvent: kind KIND_FRAMES with data (side, cameras, frames
+                      uint32 array), or KIND_TELEMETRY with data (group, fields)
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+        if magic not in (MAGIC, MAGIC_V1):
+            raise ValueError(f"Not a session file: {path}")
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            kind, timestamp, length = _RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                logger.warning(f"Session file truncated: {path}")
+                return
+            if kind == KIND_FRAMES:
+                (meta_len,) = _META_LEN.unpack_from(payload)
+                meta = json.loads(payload[_META_LEN.size:_META_LEN.size + meta_len])
+                cameras = meta["cameras"]
+                data = payload[_META_LEN.size + meta_len:]
+                if magic == MAGIC:
+                    frames = decode_frames(data)
+                else:
+                    frames = np.frombuffer(zlib.decompress(data), dtype="<u4").reshape(len(cameras), -1)
+                yield SessionEvent(kind, timestamp, (meta["side"], cameras, frames))
+            elif kind == KIND_TELEMETRY:
+                record = json.loads(payload)
+                yield SessionEvent(kind, timestamp, (record["group"], record["fields"]))
+
+
+class SessionReplayThread(QThread):
+    framesReplayed = pyqtSignal(str, list, object, float)   # side, camera indices, frames, timestamp
+    telemetryReplayed = pyqtSignal(str, 'QVariantMap')     # group, fields
+    replayFinished = pyqtSignal('QVariant')                 # stats()
+
+    def __init__(self, path, speed=1.0, max_in_flight=DEFAULT_MAX_IN_FLIGHT, parent=None):
+        """
+        Args:
+            path (str): Session file written by SessionRecorder
+            speed (float): Replay speed factor; <= 0 replays as fast as possible
+            max_in_flight (int): Frame blocks emitted but not yet release()d
+        """
+        super().__init__(parent)
+        self.path = path
+        self.speed = float(speed)
+        self._max_in_flight = int(max_in_flight)
+        self._in_flight = threading.Semaphore(self._max_in_flight)
+        self._stop_event = threading.Event()
+        self._stats = {}
+
+    def release(self):
+        """Consumer finished one frame block."""
+        self._in_flight.release()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        frames = blocks = telemetry = 0
+        max_late = 0.0
+        first_t = last_t = None
+        start = time.perf_counter()
+        error = None
+        try:
+            for event in iter_session(self.path):
+                if self._stop_event.is_set():
+                    break
+                if first_t is None:
+                    first_t = event.timestamp
+                last_t = event.timestamp
+
+                if self.speed > 0:
+                    due = start + (event.timestamp - first_t) / self.speed
+                    delay = due - time.perf_counter()
+                    if delay > 0 and self._stop_event.wait(delay):
+                        break
+
+                if event.kind == KIND_FRAMES:
+                    # Back-pressure: wait for the consumer, but stay stoppable
+                    while not self._in_flight.acquire(timeout=0.1):
+                        if self._stop_event.is_set():
+                            break
+                    if self._stop_event.is_set():
+                        break
+                    side, cameras, block = event.data
+                    self.framesReplayed.emit(side, cameras, block, event.timestamp)
+                    blocks += 1
+                    frames += len(cameras)
+                else:
+                    group, fields = event.data
+                    self.telemetryReplayed.emit(group, fields)
+                    telemetry += 1
+
+                if self.speed > 0:
+                    max_late = max(max_late, time.perf_counter() - due)
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Session replay failed: {e}")
+
+        # Wait for the consumer to finish the last blocks before taking the time
+        if not self._stop_event.is_set():
+            for _ in range(self._max_in_flight):
+                if not self._in_flight.acquire(timeout=1.0):
+                    break
+        elapsed = time.perf_counter() - start
+        session_s = (last_t - first_t) if first_t is not None else 0.0
+        self._stats = {
+            "path": self.path,
+            "speed": self.speed,
+            "stopped": self._stop_event.is_set(),
+            "error": error,
+            "frames": frames,
+            "frameBlocks": blocks,
+            "telemetry": telemetry,
+            "sessionS": session_s,
+            "elapsedS": elapsed,
+            "framesPerSecond": frames / elapsed if elapsed > 0 else 0.0,
+            "achievedSpeed": session_s / elapsed if elapsed > 0 else 0.0,
+            "maxLateMs": max_late * 1000.0,
+        }
+        self.replayFinished.emit(self._stats)
+
+    def stats(self):
+        return dict(self._stats)
@@ -0,0 +1,162 @@
+"""
+Real-time speckle-contrast analysis of histogram streams.
+
+Every incoming block of histogram frames (one row per active camera) is
+reduced in a single batched NumPy pass to per-camera mean intensity, standard
+deviation and speckle contrast K = sigma / mu. Results go into a bounded
+per-channel ring buffer, with downsampled views sized for QML plotting.
+
+In the app, frames arrive from the live camera stream (startCameraStream, one
+camera polled at up to CAMERA_STREAM_FPS, in practice limited by the
+single-frame upload) and as single points from manual captures and
+getCameraHistogram.
+"""
+
+import threading
+
+import numpy as np
+
+from histogram_stats import N_CAMERAS, HISTOGRAM_BINS
+
+# Samples kept per channel: one hour at the full 10 frames/s stream rate
+DEFAULT_CAPACITY = 36000
+
+_FIELDS = ("mean", "std", "contrast")
+
+
+def speckle_contrast(block):
+    """
+    Per-row weighted mean, standard deviation and contrast of the bin index.
+
+    Args:
+        block (array): (n_cams, bins) histogram frames
+
+    Returns:
+        tuple: (mean, std, contrast) arrays of shape (n_cams,); rows with no
+               counts (or zero mean) give 0
+    """
+    hist = np.asarray(block, dtype=np.float64)
+    bins = np.arange(hist.shape[1], dtype=np.float64)
+    # One matrix product computes sum, first and second moments for all rows
+    sums = hist @ np.stack((np.ones_like(bins), bins, bins * bins), axis=1)
+    total = sums[:, 0]
+    valid = total > 0
+    safe_total = np.where(valid, total, 1.0)
+    mean = sums[:, 1] / safe_total
+    variance = np.clip(sums[:, 2] / safe_total - mean * mean, 0.0, None)
+    std = np.sqrt(variance)
+    contrast = np.where(mean > 0, std / np.where(mean > 0, mean, 1.0), 0.0)
+    return np.where(valid, mean, 0.0), np.where(valid, std, 0.0), np.where(valid, contrast, 0.0)
+
+
+class TimeSeriesBuffer:
+    """Fixed-capacity ring of (timestamp, mean, std, contrast) samples per channel."""
+
+    def __init__(self, n_channels=N_CAMERAS, capacity=DEFAULT_CAPACITY):
+        self.n_channels = int(n_channels)
+        self.capacity = int(capacity)
+        self._lock = threading.Lock()
+        self._t = np.zeros((self.n_channels, self.capacity), dtype=np.float64)
+        self._data = {f: np.zeros((self.n_channels, self.capacity), dtype=np.float32) for f in _FIELDS}
+        self._head = np.zeros(self.n_channels, dtype=np.int64)
+        self._size = np.zeros(self.n_channels, dtype=np.int64)
+
+    def append(self, channels, timestamps, mean, std, contrast):
+        """Append one sample for each listed channel (channels must be unique)."""
+        channels = np.asarray(channels, dtype=np.intp)
+        with self._lock:
+            pos = self._head[channels]
+            self._t[channels, pos] = timestamps
+            self._data["mean"][channels, pos] = mean
+            self._data["std"][channels, pos] = std
+            self._data["contrast"][channels, pos] = contrast
+            self._head[channels] = (pos + 1) % self.capacity
+            self._size[channels] = np.minimum(self._size[channels] + 1, self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._head[:] = 0
+            self._size[:] = 0
+
+    def series(self, channel, since=None):
+        """
+        Return the samples of one channel in time order.
+
+        Returns:
+            dict: t, mean, std, contrast arrays
+        """
+        with self._lock:
+            size = int(self._size[channel])
+            head = int(self._head[channel])
+            order = (np.arange(head - size, head) % self.capacity)
+            out = {"t": self._t[channel, order].copy()}
+            for f in _FIELDS:
+                out[f] = self._data[f][channel, order].astype(np.float64)
+        if since is not None and size:
+            start = int(np.searchsorted(out["t"], since))
+            out = {k: v[start:] for k, v in out.items()}
+        return out
+
+    def latest(self):
+        """Most recent sample of every channel that has data, as a list of dicts."""
+        with self._lock:
+            out = []
+            for ch in np.flatnonzero(self._size):
+                pos = (self._head[ch] - 1) % self.capacity
+                out.append({
+                    "channel": int(ch),
+                    "t": float(self._t[ch, pos]),
+                    "mean": float(self._data["mean"][ch, pos]),
+                    "std": float(self._data["std"][ch, pos]),
+                    "contrast": float(self._data["contrast"][ch, pos]),
+                })
+            return out
+
+    def downsampled(self, channel, max_points=500, field="contrast", since=None):
+        """
+        Reduce one channel to at most max_points buckets for plotting.
+
+        Each bucket keeps its min, max and mean so spikes survive decimation.
+
+        Returns:
+            dict: t (bucket start times), min, max, mean as lists
+        """
+        s = self.series(channel, since)
+        t, v = s["t"], s[field]
+        n = len(v)
+        if n <= max_points:
+            return {"t": t.tolist(), "min": v.tolist(), "max": v.tolist(), "mean": v.tolist()}
+        edges = np.linspace(0, n, int(max_points) + 1).astype(np.intp)[:-1]
+        counts = np.diff(np.append(edges, n))
+        return {
+            "t": t[edges].tolist(),
+            "min": np.minimum.reduceat(v, edges).tolist(),
+            "max": np.maximum.reduceat(v, edges).tolist(),
+            "mean": (np.add.reduceat(v, edges) / counts).tolist(),
+        }
+
+
+class SpeckleContrastStage:
+    """Turns histogram frame blocks into per-camera contrast time series."""
+
+    def __init__(self, buffer=None):
+        self.buffer = buffer if buffer is not None else TimeSeriesBuffer()
+        self.frames_processed = 0
+
+    def process(self, timestamp, channels, block):
+        """
+        Reduce one block and append the results.
+
+        Args:
+            timestamp (float): Frame time (seconds)
+            channels (array): (n_cams,) unique camera slots
+            block (array): (n_cams, 1024) histogram frames
+
+        Returns:
+            tuple: (mean, std, contrast) arrays for the block
+        """
+        block = np.asarray(block)[:, :HISTOGRAM_BINS]
+        mean, std, contrast = speckle_contrast(block)
+        self.buffer.append(channels, timestamp, mean, std, contrast)
+        self.frames_processed += len(block)
+        return mean, std, contrast
@@ -0,0 +1,269 @@
+"""
+Retention, compression and indexing of the app's output directories.
+
+app-logs/, run-logs/ and downloads/ gain files on every launch, trigger run
+and firmware download. StorageManager applies a policy per directory from a
+background thread, at startup and then periodically:
+
+1. closed files matching the policy's compress patterns are gzipped in place
+   (name.log -> name.log.gz, modification time kept); a file counts as
+   closed when no one reports it in use and it has not been modified for
+   min_idle_s,
+2. files older than max_age_days are deleted,
+3. the oldest files are deleted until the directory is within max_mb and
+   max_files,
+4. the remaining files are written to an index (.storage-index.json) with
+   their size, original size and modification time, so the app can list a
+   directory without touching every file.
+
+Only the top level of each directory is managed. The <file>.lod plot caches
+next to run logs go with their log.
+"""
+
+import fnmatch
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+logger = logging.getLogger("ow-testapp.storage")
+
+INDEX_NAME = ".storage-index.json"
+DEFAULT_INTERVAL_S = 6 * 3600
+DEFAULT_INITIAL_DELAY_S = 30.0
+# Files modified more recently than this are treated as still being written
+DEFAULT_MIN_IDLE_S = 600.0
+COMPRESS_LEVEL = 6
+# Companion cache directories removed together with their file
+COMPANION_SUFFIXES = (".lod",)
+
+
+class StorageManager:
+    """Applies per-directory quotas and compression, off the calling thread."""
+
+    def __init__(self, policies, in_use=None, min_idle_s=DEFAULT_MIN_IDLE_S):
+        """
+        Args:
+            policies (dict): directory -> {max_mb, max_age_days, max_files,
+                             compress (glob patterns)}; missing limits are off
+            in_use (callable): Returns paths that must not be touched (open logs,
+                               firmware being flashed)
+            min_idle_s (float): Files modified within this many seconds are skipped
+        """
+        self.policies = {os.path.abspath(d): dict(p) for d, p in policies.items()}
+        self.in_use = in_use
+        self.min_idle_s = float(min_idle_s)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last = {}
+
+    def start(self, interval_s=DEFAULT_INTERVAL_S, initial_delay_s=DEFAULT_INITIAL_DELAY_S):
+        """Sweep after initial_delay_s, then every interval_s, in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(float(interval_s), float(initial_delay_s)),
+            name="StorageManager", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout=5.0)
+
+    def request_sweep(self):
+        """Run the next sweep now instead of at the next interval."""
+        self._wake.set()
+
+    def _run(self, interval_s, initial_delay_s):
+        delay = initial_delay_s
+        while not self._stop.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Storage sweep failed: {e}")
+            delay = interval_s
+
+    def last_sweep(self):
+        """Result of the last sweep per directory (see sweep())."""
+        with self._lock:
+            return {d: dict(r) for d, r in self._last.items()}
+
+    def sweep(self, now=None):
+        """
+        Compress, prune and index every managed directory once.
+
+        Returns:
+            dict: directory -> {files, bytes, compressed, deleted, freedBytes,
+                  savedBytes, seconds}
+        """
+        now = time.time() if now is None else now
+        busy = {os.path.abspath(p) for p in (self.in_use() if self.in_use else ()) if p}
+        results = {}
+        with self._lock:
+            for directory, policy in self.policies.items():
+                if os.path.isdir(directory):
+                    results[directory] = self._sweep_directory(directory, policy, busy, now)
+            self._last.update(results)
+        return results
+
+    def _sweep_directory(self, directory, policy, busy, now):
+        start = time.perf_counter()
+        index = self._read_index(directory)
+        result = {"compressed": 0, "deleted": 0, "freedBytes": 0, "savedBytes": 0}
+
+        entries = self._scan(directory)
+        protected = {e["path"] for e in entries
+                     if e["path"] in busy or now - e["mtime"] < self.min_idle_s}
+
+        patterns = policy.get("compress") or ()
+        for e in entries:
+            if (e["path"] in protected or e["name"].endswith(".gz")
+                    or not any(fnmatch.fnmatch(e["name"], p) for p in patterns)):
+                continue
+            try:
+                gz = self._compress(e["path"])
+            except OSError as ex:
+                logger.warning(f"Could not compress {e['path']}: {ex}")
+                continue
+            result["compressed"] += 1
+            result["savedBytes"] += e["bytes"] - os.path.getsize(gz)
+            index[os.path.basename(gz)] = {"originalBytes": e["bytes"]}
+        if result["compressed"]:
+            entries = self._scan(directory)
+
+        # Oldest first; deletion candidates exclude anything possibly open
+        entries.sort(key=lambda e: e["mtime"])
+        max_age_days = policy.get("max_age_days")
+        max_bytes = policy["max_mb"] * 1024 * 1024 if policy.get("max_mb") else None
+        max_files = policy.get("max_files")
+        total = sum(e["bytes"] for e in entries)
+        count = len(entries)
+        kept = []
+        for e in entries:
+            expired = max_age_days is not None and now - e["mtime"] > max_age_days * 86400
+            over = ((max_bytes is not None and total > max_bytes)
+                    or (max_files is not None and count > max_files))
+            if (expired or over) and e["path"] not in protected and self._delete(e["path"]):
+                total -= e["bytes"]
+                count -= 1
+                result["deleted"] += 1
+                result["freedBytes"] += e["bytes"]
+                continue
+            kept.append(e)
+        if max_bytes is not None and total > max_bytes:
+            logger.warning(f"{directory} is over its {policy['max_mb']} MB quota with files still in use")
+
+        self._write_index(directory, kept, index)
+        result.update(files=len(kept), bytes=total, seconds=time.perf_counter() - start, at=now)
+        if result["compressed"] or result["deleted"]:
+            logger.info(f"Storage {directory}: compressed {result['compressed']} "
+                        f"(saved {result['savedBytes'] / 1e6:.1f} MB), deleted {result['deleted']} "
+                        f"(freed {result['freedBytes'] / 1e6:.1f} MB); {len(kept)} files, {total / 1e6:.1f} MB")
+        return result
+
+    @staticmethod
+    def _scan(directory):
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if (entry.name == INDEX_NAME or entry.name.endswith((".tmp", ".gz.part"))
+                        or not entry.is_file(follow_symlinks=False)):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append({"name": entry.name, "path": os.path.abspath(entry.path),
+                                "bytes": st.st_size, "mtime": st.st_mtime})
+        return entries
+
+    @staticmethod
+    def _compress(path):
+        gz = path + ".gz"
+        part = gz + ".part"
+        st = os.stat(path)
+        try:
+            with open(path, "rb") as src, gzip.open(part, "wb", compresslevel=COMPRESS_LEVEL) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.utime(part, (st.st_atime, st.st_mtime))
+            os.replace(part, gz)
+        except BaseException:
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+        os.remove(path)
+        StorageManager._remove_companions(path)
+        return gz
+
+    @staticmethod
+    def _delete(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            # Typically a file still open elsewhere on Windows
+            logger.warning(f"Could not delete {path}: {e}")
+            return False
+        StorageManager._remove_companions(path)
+        if path.endswith(".gz"):
+            StorageManager._remove_companions(path[:-3])
+        return True
+
+    @staticmethod
+    def _remove_companions(path):
+        for suffix in COMPANION_SUFFIXES:
+            if os.path.isdir(path + suffix):
+                shutil.rmtree(path + suffix, ignore_errors=True)
+
+    @staticmethod
+    def _read_index(directory):
+        try:
+            with open(os.path.join(directory, INDEX_NAME), "r", encoding="utf-8") as f:
+                return {e["name"]: e for e in json.load(f)["files"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    @staticmethod
+    def _write_index(directory, entries, previous):
+        files = []
+        for e in sorted(entries, key=lambda e: e["mtime"], reverse=True):
+            original = previous.get(e["name"], {}).get("originalBytes", e["bytes"])
+            files.append({"name": e["name"], "bytes": e["bytes"], "originalBytes": original,
+                          "mtime": e["mtime"], "compressed": e["name"].endswith(".gz")})
+        path = os.path.join(directory, INDEX_NAME)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"updated": time.time(), "files": files}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write storage index for {directory}: {e}")
+
+    def index(self, directory):
+        """
+        Files of a managed directory as of the last sweep, newest first.
+
+        Returns:
+            list: {name, bytes, originalBytes, mtime, compressed} per file
+        """
+        return list(self._read_index(os.path.abspath(directory)).values())
+
+
+def open_log(path, mode="r", **kwargs):
+    """Open a log that may have been gzipped by the StorageManager."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t" if "b" not in mode else mode, **kwargs)
+    return open(path, mode, **kwargs)
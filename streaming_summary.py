@@ -0,0 +1,288 @@
+"""
+Constant-memory run statistics and the end-of-run report.
+
+StreamingSummary tracks count, min, max, mean and variance (Welford) and a
+set of quantiles with the P-squared algorithm (Jain & Chlamtac, 1985): five
+markers per quantile, adjusted by piecewise-parabolic interpolation, so
+every sample costs O(1) time and the memory does not grow with run length.
+
+RunSummary keeps one StreamingSummary per metric plus event counters while
+the trigger runs, checks limits when the run stops and writes the report
+as JSON and Markdown next to the run log.
+"""
+
+import datetime
+import json
+import math
+import threading
+
+DEFAULT_QUANTILES = (0.01, 0.5, 0.99)
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile with five markers."""
+
+    def __init__(self, p):
+        self.p = float(p)
+        self._initial = []
+        self._q = None                      # marker heights
+        self._n = None                      # marker positions
+        self._desired = None
+        self._increment = (0.0, self.p / 2, self.p, (1 + self.p) / 2, 1.0)
+
+    def add(self, x):
+        if self._q is None:
+            self._initial.append(x)
+            if len(self._initial) == 5:
+                self._q = sorted(self._initial)
+                self._n = [0, 1, 2, 3, 4]
+                p = self.p
+                self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+            return
+
+        q, n = self._q, self._n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increment[i]
+
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self._q, self._n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        if self._q is not None:
+            return self._q[2]
+        if not self._initial:
+            return None
+        # Fewer than five samples: exact nearest-rank quantile
+        ordered = sorted(self._initial)
+        return ordered[min(len(ordered) - 1, int(round(self.p * (len(ordered) - 1))))]
+
+
+class StreamingSummary:
+    """Count, min, max, mean, variance and P-squared quantiles of one metric."""
+
+    def __init__(self, quantiles=DEFAULT_QUANTILES):
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._quantiles = [P2Quantile(p) for p in quantiles]
+
+    def add(self, x):
+        x = float(x)
+        if x != x:
+            return
+        self.count += 1
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+        for q in self._quantiles:
+            q.add(x)
+
+    @property
+    def mean(self):
+        return self._mean if self.count else None
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def quantile(self, p):
+        for q in self._quantiles:
+            if q.p == p:
+                return q.value()
+        raise KeyError(f"Quantile {p} is not tracked")
+
+    def to_dict(self):
+        if not self.count:
+            return {"count": 0}
+        out = {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self._mean,
+            "std": math.sqrt(self.variance),
+        }
+        for q in self._quantiles:
+            out[f"p{q.p * 100:g}"] = q.value()
+        return out
+
+
+class RunSummary:
+    """Per-metric streaming summaries and event counts of one trigger run."""
+
+    def __init__(self, limits=None, quantiles=DEFAULT_QUANTILES, events=()):
+        """
+        Args:
+            limits (dict): metric -> (low, high) or (low, high, (low_stat, high_stat));
+                           the run fails if the metric's min/max, or the named
+                           statistics (e.g. ("p1", "p99")), leave the range
+                           (None: unbounded side). Event names map to (None, max_count).
+            quantiles (tuple): Quantiles tracked for every metric
+            events (iterable): Names in limits that are event counters (0 until
+                               counted); any other limited metric without
+                               samples is reported as "no data"
+        """
+        self.limits = dict(limits or {})
+        self.events = frozenset(events)
+        self._quantiles = tuple(quantiles)
+        self._metrics = {}
+        self._events = {}
+        self._lock = threading.Lock()
+        self.started_at = datetime.datetime.now()
+
+    def add(self, metric, value):
+        if value is None:
+            return
+        with self._lock:
+            summary = self._metrics.get(metric)
+            if summary is None:
+                summary = self._metrics[metric] = StreamingSummary(self._quantiles)
+            summary.add(value)
+
+    def add_many(self, samples):
+        """Add a dict of metric -> value in one call."""
+        for metric, value in samples.items():
+            self.add(metric, value)
+
+    def count_event(self, name, n=1):
+        with self._lock:
+            self._events[name] = self._events.get(name, 0) + n
+
+    def _check(self, metrics, events):
+        checks = []
+        for name, limit in sorted(self.limits.items()):
+            low, high = limit[:2]
+            if name in self.events:
+                value = events.get(name, 0)
+                lo_val = hi_val = value
+                rule = "count"
+            elif not metrics.get(name, {}).get("count"):
+                checks.append({"name": name, "rule": "no data", "low": low, "high": high,
+                               "min": None, "max": None, "ok": False})
+                continue
+            else:
+                s = metrics[name]
+                lo_stat, hi_stat = limit[2] if len(limit) > 2 else ("min", "max")
+                if s.get(lo_stat) is None or s.get(hi_stat) is None:
+                    lo_stat, hi_stat = "min", "max"
+                lo_val, hi_val = s[lo_stat], s[hi_stat]
+                rule = f"{lo_stat}..{hi_stat}"
+            ok = (low is None or lo_val >= low) and (high is None or hi_val <= high)
+            checks.append({"name": name, "rule": rule, "low": low, "high": high,
+                           "min": lo_val, "max": hi_val, "ok": ok})
+        return checks
+
+    def report(self, run_log=None, stopped_at=None):
+        """Report so far; `stopped` is now unless given."""
+        stopped = stopped_at or datetime.datetime.now()
+        with self._lock:
+            metrics = {name: s.to_dict() for name, s in sorted(self._metrics.items())}
+            events = dict(self._events)
+        checks = self._check(metrics, events)
+        if any(not c["ok"] and c["rule"] != "no data" for c in checks):
+            result = "FAIL"
+        elif any(not c["ok"] for c in checks):
+            result = "NO DATA"
+        else:
+            result = "PASS"
+        return {
+            "runLog": run_log,
+            "started": self.started_at.isoformat(timespec="seconds"),
+            "stopped": stopped.isoformat(timespec="seconds"),
+            "durationS": (stopped - self.started_at).total_seconds(),
+            "result": result,
+            "checks": checks,
+            "events": events,
+            "metrics": metrics,
+        }
+
+    def write(self, base_path, run_log=None):
+        """
+        Write <base_path>.summary.json and <base_path>.summary.md.
+
+        Returns:
+            dict: The report
+        """
+        report = self.report(run_log)
+        with open(f"{base_path}.summary.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        with open(f"{base_path}.summary.md", "w", encoding="utf-8") as f:
+            f.write(format_markdown(report))
+        return report
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
+
+
+def format_markdown(report):
+    """Render a RunSummary.report() as a Markdown document."""
+    lines = [
+        f"# Run report: {report['result']}",
+        "",
+        f"- Run log: `{report['runLog'] or '-'}`",
+        f"- Started: {report['started']}",
+        f"- Stopped: {report['stopped']} ({report['durationS']:.0f} s)",
+        "",
+    ]
+    if report["checks"]:
+        lines += ["## Checks", "", "| Check | Rule | Range | Observed | Result |", "|---|---|---|---|---|"]
+        for c in report["checks"]:
+            lines.append(
+                f"| {c['name']} | {c['rule']} | {_fmt(c['low'])} .. {_fmt(c['high'])} | "
+                f"{_fmt(c['min'])} .. {_fmt(c['max'])} | "
+                f"{'OK' if c['ok'] else ('NO DATA' if c['rule'] == 'no data' else 'FAIL')} |"
+            )
+        lines.append("")
+    if report["events"]:
+        lines += ["## Events", ""]
+        lines += [f"- {name}: {count}" for name, count in sorted(report["events"].items())]
+        lines.append("")
+    if report["metrics"]:
+        quantile_keys = sorted(
+            {k for m in report["metrics"].values() for k in m if k.startswith("p")},
+            key=lambda k: float(k[1:]),
+        )
+        header = ["Metric", "Count", "Min", "Mean", "Std", "Max"] + quantile_keys
+        lines += ["## Metrics", "", "| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+        for name, m in report["metrics"].items():
+            row = [name, m.get("count"), m.get("min"), m.get("mean"), m.get("std"), m.get("max")]
+            row += [m.get(k) for k in quantile_keys]
+            lines.append("| " + " | ".join(_fmt(v) for v in row) + " |")
+        lines.append("")
+    return "\n".join(lines)
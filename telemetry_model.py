@@ -0,0 +1,207 @@
+"""
+Coalesced, change-only telemetry for QML.
+
+Worker threads submit telemetry snapshots per group ("tec", "analog",
+"pdu", ...). TelemetryModel diffs every field against the last published
+value, applying a per-field deadband, and keeps only real changes pending.
+Pending changes are flushed from the GUI thread at most max_rate_hz times per
+second as one batched `updated` signal, so a burst of worker updates costs a
+single cross-thread notification per UI frame.
+
+PduChannelModel exposes the 16 PDU monitor channels as a list model; a flush
+only emits dataChanged for the rows that actually changed.
+"""
+
+import threading
+import time
+
+from PyQt6.QtCore import (
+    QAbstractListModel, QByteArray, QModelIndex, QObject, QTimer, Qt,
+    pyqtSignal, pyqtSlot,
+)
+
+DEFAULT_MAX_RATE_HZ = 10.0
+
+
+def _changed(old, new, deadband):
+    """True if new differs from old by more than the deadband."""
+    if old is None:
+        return True
+    if isinstance(new, (list, tuple)):
+        if not isinstance(old, (list, tuple)) or len(old) != len(new):
+            return True
+        return any(_changed(o, n, deadband) for o, n in zip(old, new))
+    if deadband and isinstance(new, (int, float)) and not isinstance(new, bool):
+        return abs(new - old) > deadband
+    return new != old
+
+
+class TelemetryModel(QObject):
+    """Per-group telemetry values with deadband diffing and rate-capped flushes."""
+
+    updated = pyqtSignal('QVariantMap')    # {group: {field: value}} of the fields that changed
+    _pendingReady = pyqtSignal()          # worker -> GUI thread, once per batch
+
+    def __init__(self, deadbands=None, max_rate_hz=DEFAULT_MAX_RATE_HZ, parent=None):
+        """
+        Args:
+            deadbands (dict): {(group, field): deadband}; fields not listed
+                              are published on any change
+            max_rate_hz (float): Upper bound on flushes per second
+        """
+        super().__init__(parent)
+        self.deadbands = dict(deadbands or {})
+        self.min_interval = 1.0 / float(max_rate_hz)
+        self._lock = threading.Lock()
+        self._published = {}
+        self._pending = {}
+        self._last_flush = 0.0
+        self.submitted = 0
+        self.suppressed = 0
+        self.flushes = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._pendingReady.connect(self._schedule_flush)
+
+    def submit(self, group, fields):
+        """
+        Offer a new snapshot of a group's fields. Safe to call from any thread.
+
+        Args:
+            group (str): Telemetry group name
+            fields (dict): {field: value}
+
+        Returns:
+            dict: The fields that passed the deadband and are now pending
+        """
+        changes = {}
+        with self._lock:
+            published = self._published.get(group, {})
+            pending = self._pending.get(group, {})
+            for name, value in fields.items():
+                self.submitted += 1
+                # Compare against what QML will see once pending changes flush
+                current = pending.get(name, published.get(name))
+                if _changed(current, value, self.deadbands.get((group, name), 0.0)):
+                    changes[name] = value
+                else:
+                    self.suppressed += 1
+            if not changes:
+                return changes
+            was_idle = not self._pending
+            self._pending.setdefault(group, {}).update(changes)
+        if was_idle:
+            self._pendingReady.emit()
+        return changes
+
+    @pyqtSlot()
+    def _schedule_flush(self):
+        if self._timer.isActive():
+            return
+        wait = self.min_interval - (time.monotonic() - self._last_flush)
+        self._timer.start(max(0, int(wait * 1000)))
+
+    @pyqtSlot()
+    def flush(self):
+        """Publish all pending changes as one `updated` signal (GUI thread)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            for group, fields in pending.items():
+                self._published.setdefault(group, {}).update(fields)
+        self._last_flush = time.monotonic()
+        if pending:
+            self.flushes += 1
+            self.updated.emit(pending)
+
+    def value(self, group, field, default=None):
+        with self._lock:
+            return self._published.get(group, {}).get(field, default)
+
+    def snapshot(self):
+        """Copy of every published value, {group: {field: value}}."""
+        with self._lock:
+            return {g: dict(f) for g, f in self._published.items()}
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "suppressed": self.suppressed,
+            "flushes": self.flushes,
+            "maxRateHz": 1.0 / self.min_interval,
+        }
+
+
+class PduChannelModel(QAbstractListModel):
+    """The 16 PDU monitor channels (ADC0 0-7, ADC1 8-15) as QML list rows."""
+
+    ChannelRole = Qt.ItemDataRole.UserRole + 1
+    AdcRole = Qt.ItemDataRole.UserRole + 2
+    RawRole = Qt.ItemDataRole.UserRole + 3
+    ValueRole = Qt.ItemDataRole.UserRole + 4
+
+    CHANNELS_PER_ADC = 8
+
+    def __init__(self, n_channels=16, parent=None):
+        super().__init__(parent)
+        self._raws = [0] * n_channels
+        self._vals = [0.0] * n_channels
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._vals)
+
+    def roleNames(self):
+        return {
+            self.ChannelRole: QByteArray(b"channel"),
+            self.AdcRole: QByteArray(b"adc"),
+            self.RawRole: QByteArray(b"raw"),
+            self.ValueRole: QByteArray(b"value"),
+        }
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        row = index.row()
+        if not index.isValid() or not 0 <= row < len(self._vals):
+            return None
+        if role == self.ChannelRole:
+            return row % self.CHANNELS_PER_ADC
+        if role == self.AdcRole:
+            return row // self.CHANNELS_PER_ADC
+        if role == self.RawRole:
+            return self._raws[row]
+        if role in (self.ValueRole, Qt.ItemDataRole.DisplayRole):
+            return self._vals[row]
+        return None
+
+    def raws(self):
+        return list(self._raws)
+
+    def values(self):
+        return list(self._vals)
+
+    def update_channels(self, raws=None, vals=None):
+        """
+        Store new readings and emit dataChanged for changed rows only.
+
+        Returns:
+            int: Number of rows that changed
+        """
+        changed = []
+        for row in range(len(self._vals)):
+            raw = self._raws[row] if raws is None else raws[row]
+            val = self._vals[row] if vals is None else vals[row]
+            if raw != self._raws[row] or val != self._vals[row]:
+                self._raws[row] = raw
+                self._vals[row] = val
+                changed.append(row)
+
+        # One dataChanged per contiguous run of changed rows
+        roles = [self.RawRole, self.ValueRole, Qt.ItemDataRole.DisplayRole]
+        start = None
+        for i, row in enumerate(changed):
+            if start is None:
+                start = row
+            if i + 1 == len(changed) or changed[i + 1] != row + 1:
+                self.dataChanged.emit(self.index(start), self.index(row), roles)
+                start = None
+        return len(changed)
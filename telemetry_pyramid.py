@@ -0,0 +1,266 @@
+"""
+Multi-resolution (level-of-detail) store for console telemetry.
+
+Every channel keeps min / max / sum / count aggregates at power-of-two time
+buckets: level k buckets are base_interval * 2**k seconds wide and aligned
+to the epoch. Samples are folded into all levels as they arrive (add()) or
+in bulk when importing an old run log (extend()), so a plot of any window
+reads at most `max_points` precomputed buckets from the finest level that
+is coarse enough, instead of every raw sample.
+
+Each level is a ring of `capacity` buckets. A window ending at the newest
+sample is always served at full detail when max_points <= capacity / 2;
+older windows fall back to the finest level that still holds them. For
+offline use, for_span() sizes every level to hold a whole run.
+"""
+
+import math
+import threading
+
+import numpy as np
+
+DEFAULT_BASE_INTERVAL_S = 1.0
+DEFAULT_LEVELS = 12
+DEFAULT_CAPACITY = 2048
+DEFAULT_MAX_POINTS = 1000
+
+
+class _Channel:
+    """Aggregates of one channel, all levels concatenated into flat arrays."""
+
+    __slots__ = ("ids", "count", "sum", "min", "max", "first", "last")
+
+    def __init__(self, size):
+        self.ids = np.full(size, -1, dtype=np.int64)     # bucket id held by each slot
+        self.count = np.zeros(size, dtype=np.uint32)
+        self.sum = np.zeros(size, dtype=np.float64)
+        self.min = np.full(size, np.inf, dtype=np.float32)
+        self.max = np.full(size, -np.inf, dtype=np.float32)
+        self.first = math.inf
+        self.last = -math.inf
+
+
+class TelemetryPyramid:
+    """Thread-safe min/max/mean pyramid for named telemetry channels."""
+
+    def __init__(self, base_interval=DEFAULT_BASE_INTERVAL_S, levels=DEFAULT_LEVELS,
+                 capacity=DEFAULT_CAPACITY):
+        """
+        Args:
+            base_interval (float): Bucket width of level 0 in seconds
+            levels (int): Number of levels (level k buckets are base * 2**k wide)
+            capacity (int or sequence): Buckets kept per level (one value per level allowed)
+        """
+        self.base_interval = float(base_interval)
+        self.levels = int(levels)
+        self.widths = self.base_interval * (2.0 ** np.arange(self.levels))
+        caps = np.broadcast_to(np.asarray(capacity, dtype=np.int64), (self.levels,))
+        self.capacities = np.maximum(caps, 1).copy()
+        self._offsets = np.concatenate(([0], np.cumsum(self.capacities)[:-1]))
+        self._size = int(self.capacities.sum())
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_span(cls, span_s, base_interval=DEFAULT_BASE_INTERVAL_S, max_points=DEFAULT_MAX_POINTS):
+        """Pyramid whose levels each hold `span_s` seconds, with levels up to one plot width."""
+        span_s = max(float(span_s), base_interval)
+        ratio = span_s / base_interval / max_points
+        levels = 1 if ratio <= 1 else int(math.ceil(math.log2(ratio))) + 1
+        widths = base_interval * (2.0 ** np.arange(levels))
+        capacity = (np.ceil(span_s / widths) + 2).astype(np.int64)
+        return cls(base_interval, levels, capacity)
+
+    def channels(self):
+        with self._lock:
+            return sorted(self._channels)
+
+    def time_range(self, channel=None):
+        """(first, last) sample time of one channel, or of all channels."""
+        with self._lock:
+            chans = [self._channels[channel]] if channel is not None else list(self._channels.values())
+            chans = [c for c in chans if c.last >= c.first]
+            if not chans:
+                return None
+            return min(c.first for c in chans), max(c.last for c in chans)
+
+    def clear(self):
+        with self._lock:
+            self._channels = {}
+
+    def _channel(self, name):
+        chan = self._channels.get(name)
+        if chan is None:
+            chan = self._channels[name] = _Channel(self._size)
+        return chan
+
+    def add(self, timestamp, samples):
+        """
+        Fold one sample per channel into every level.
+
+        Args:
+            timestamp (float): Sample time (epoch seconds)
+            samples (dict): channel name -> value; None and NaN are skipped
+        """
+        ids = np.floor(timestamp / self.widths).astype(np.int64)
+        slots = self._offsets + ids % self.capacities
+        with self._lock:
+            for name, value in samples.items():
+                if value is None or value != value:
+                    continue
+                chan = self._channel(name)
+                current = chan.ids[slots]
+                newer = ids > current
+                if newer.any():
+                    self._reset(chan, slots[newer], ids[newer])
+                s = slots[ids >= current]
+                chan.count[s] += 1
+                chan.sum[s] += value
+                chan.min[s] = np.minimum(chan.min[s], value)
+                chan.max[s] = np.maximum(chan.max[s], value)
+                chan.first = min(chan.first, timestamp)
+                chan.last = max(chan.last, timestamp)
+
+    def extend(self, channel, timestamps, values):
+        """
+        Bulk-import a series, e.g. parsed from a run log.
+
+        Args:
+            channel (str): Channel name
+            timestamps (array): Sample times (epoch seconds)
+            values (array): Sample values; NaN is skipped
+        """
+        t = np.asarray(timestamps, dtype=np.float64)
+        v = np.asarray(values, dtype=np.float64)
+        keep = ~np.isnan(v)
+        t, v = t[keep], v[keep]
+        if not len(t):
+            return
+        order = np.argsort(t, kind="stable")
+        t, v = t[order], v[order]
+
+        # Level 0 from the samples; every further level merges bucket pairs of
+        # the previous one (floor(t / 2w) == floor(t / w) // 2)
+        ids = np.floor(t / self.widths[0]).astype(np.int64)
+        aggregates = (np.ones(len(v), dtype=np.int64), v, v, v)
+
+        with self._lock:
+            chan = self._channel(channel)
+            for level in range(self.levels):
+                if level:
+                    ids = ids // 2
+                starts = np.flatnonzero(np.diff(ids, prepend=ids[0] - 1))
+                ids = ids[starts]
+                counts, sums, mins, maxs = aggregates
+                aggregates = (
+                    np.add.reduceat(counts, starts),
+                    np.add.reduceat(sums, starts),
+                    np.minimum.reduceat(mins, starts),
+                    np.maximum.reduceat(maxs, starts),
+                )
+                self._merge(chan, level, ids, *aggregates)
+            chan.first = min(chan.first, float(t[0]))
+            chan.last = max(chan.last, float(t[-1]))
+
+    def _merge(self, chan, level, bucket_ids, counts, sums, mins, maxs):
+        # Only the newest `capacity` buckets fit in the ring
+        cap = int(self.capacities[level])
+        if len(bucket_ids) > cap:
+            bucket_ids, counts, sums, mins, maxs = (a[-cap:] for a in (bucket_ids, counts, sums, mins, maxs))
+        slots = self._offsets[level] + bucket_ids % cap
+        current = chan.ids[slots]
+        newer = bucket_ids > current
+        self._reset(chan, slots[newer], bucket_ids[newer])
+        ok = bucket_ids >= current
+        s = slots[ok]
+        chan.count[s] += counts[ok].astype(np.uint32)
+        chan.sum[s] += sums[ok]
+        chan.min[s] = np.minimum(chan.min[s], mins[ok])
+        chan.max[s] = np.maximum(chan.max[s], maxs[ok])
+
+    @staticmethod
+    def _reset(chan, slots, ids):
+        chan.ids[slots] = ids
+        chan.count[slots] = 0
+        chan.sum[slots] = 0.0
+        chan.min[slots] = np.inf
+        chan.max[slots] = -np.inf
+
+    def query(self, channel, start=None, end=None, max_points=DEFAULT_MAX_POINTS):
+        """
+        Aggregates of one channel over [start, end] in at most ~max_points buckets.
+
+        Args:
+            channel (str): Channel name
+            start (float): Window start (default: first sample)
+            end (float): Window end (default: last sample)
+            max_points (int): Upper bound on returned buckets
+
+        Returns:
+            dict: t (bucket start times), min, max, mean as lists, plus
+                  bucketS (bucket width) and level; empty lists if no data
+        """
+        empty = {"t": [], "min": [], "max": [], "mean": [], "bucketS": 0.0, "level": -1}
+        with self._lock:
+            chan = self._channels.get(channel)
+            if chan is None or chan.last < chan.first:
+                return empty
+            start = chan.first if start is None else float(start)
+            end = chan.last if end is None else float(end)
+            if end < start:
+                return empty
+            wanted = (end - start) / max(int(max_points), 1)
+
+            for level in range(self.levels):
+                width = self.widths[level]
+                first_id = int(math.floor(start / width))
+                last_id = int(math.floor(end / width))
+                cap = int(self.capacities[level])
+                newest = int(math.floor(chan.last / width))
+                # Too fine for the window, or its start was already overwritten;
+                # the coarsest level serves whatever it still holds
+                if level < self.levels - 1 and (
+                        width < wanted or last_id - first_id + 1 > cap or first_id <= newest - cap):
+                    continue
+                ids = np.arange(max(first_id, newest - cap + 1), last_id + 1, dtype=np.int64)
+                slots = self._offsets[level] + ids % cap
+                valid = (chan.ids[slots] == ids) & (chan.count[slots] > 0)
+                s = slots[valid]
+                counts = chan.count[s]
+                return {
+                    "t": (ids[valid] * width).tolist(),
+                    "min": chan.min[s].astype(np.float64).tolist(),
+                    "max": chan.max[s].astype(np.float64).tolist(),
+                    "mean": (chan.sum[s] / counts).tolist(),
+                    "bucketS": float(width),
+                    "level": level,
+                }
+        return empty
+
+    def save(self, path):
+        """Write all channels to an .npz file (see load())."""
+        with self._lock:
+            arrays = {
+                "base_interval": np.float64(self.base_interval),
+                "capacities": self.capacities,
+                "names": np.array(sorted(self._channels), dtype=str),
+            }
+            for i, name in enumerate(sorted(self._channels)):
+                chan = self._channels[name]
+                for field in ("ids", "count", "sum", "min", "max"):
+                    arrays[f"{i}_{field}"] = getattr(chan, field)
+                arrays[f"{i}_range"] = np.array([chan.first, chan.last])
+        np.savez(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            capacities = data["capacities"]
+            pyramid = cls(float(data["base_interval"]), len(capacities), capacities)
+            for i, name in enumerate(data["names"].tolist()):
+                chan = pyramid._channel(name)
+                for field in ("ids", "count", "sum", "min", "max"):
+                    setattr(chan, field, data[f"{i}_{field}"].copy())
+                chan.first, chan.last = (float(x) for x in data[f"{i}_range"])
+        return pyramid
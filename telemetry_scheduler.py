@@ -0,0 +1,135 @@
+"""
+Deadline-based multi-rate scheduler for telemetry polling.
+
+Each task has its own period and runs on a fixed time grid
+(start + offset + k * period), so overruns never shift the schedule. The
+caller sleeps exactly until the next due task via time_until_next().
+
+Per-task statistics (runs, overruns, skipped slots, start jitter and run
+duration) are kept so the polling load can be audited.
+"""
+
+import logging
+import math
+import time
+
+logger = logging.getLogger("ow-testapp.scheduler")
+
+
+class PollTask:
+    """One periodic task and its timing statistics."""
+
+    def __init__(self, name, period, callback, offset=0.0):
+        if period <= 0:
+            raise ValueError(f"Task period must be positive: {name}={period}")
+        self.name = name
+        self.period = float(period)
+        self.callback = callback
+        self.offset = float(offset)
+        self.next_due = 0.0
+        self.runs = 0
+        self.errors = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+        self.duration_sum = 0.0
+        self.duration_max = 0.0
+        self.last_duration = 0.0
+
+    def stats(self):
+        runs = max(self.runs, 1)
+        return {
+            "name": self.name,
+            "period": self.period,
+            "runs": self.runs,
+            "errors": self.errors,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "jitterMeanMs": 1000.0 * self.jitter_sum / runs,
+            "jitterMaxMs": 1000.0 * self.jitter_max,
+            "durationMeanMs": 1000.0 * self.duration_sum / runs,
+            "durationMaxMs": 1000.0 * self.duration_max,
+            "lastDurationMs": 1000.0 * self.last_duration,
+        }
+
+
+class PollScheduler:
+    """Runs PollTasks at their own rates on a drift-free grid."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._tasks = []
+
+    def add_task(self, name, period, callback, offset=0.0):
+        """
+        Register a periodic task.
+
+        Args:
+            name (str): Label used in statistics
+            period (float): Seconds between runs
+            callback (callable): Called with no arguments
+            offset (float): Delay of the first run after start(), to stagger tasks
+        """
+        task = PollTask(name, period, callback, offset)
+        self._tasks.append(task)
+        return task
+
+    def start(self, now=None):
+        """Anchor every task's schedule at now (plus its offset)."""
+        now = self._clock() if now is None else now
+        for task in self._tasks:
+            task.next_due = now + task.offset
+
+    def run_pending(self, keep_running=None):
+        """
+        Run every task that is due, earliest deadline first.
+
+        Args:
+            keep_running (callable): Checked before each task; stop early when it returns False
+
+        Returns:
+            int: Number of tasks run
+        """
+        ran = 0
+        for task in sorted(self._tasks, key=lambda t: t.next_due):
+            if keep_running is not None and not keep_running():
+                break
+            start = self._clock()
+            if start < task.next_due:
+                break
+
+            try:
+                task.callback()
+            except Exception as e:
+                task.errors += 1
+                logger.error(f"Poll task '{task.name}' failed: {e}")
+            end = self._clock()
+
+            jitter = start - task.next_due
+            task.runs += 1
+            task.jitter_sum += jitter
+            task.jitter_max = max(task.jitter_max, jitter)
+            task.last_duration = end - start
+            task.duration_sum += task.last_duration
+            task.duration_max = max(task.duration_max, task.last_duration)
+
+            # Advance on the fixed grid; if we fell a whole period behind,
+            # skip the missed slots instead of running a burst to catch up.
+            task.next_due += task.period
+            if task.next_due <= end:
+                missed = math.floor((end - task.next_due) / task.period) + 1
+                task.overruns += 1
+                task.skipped += missed
+                task.next_due += missed * task.period
+            ran += 1
+        return ran
+
+    def time_until_next(self):
+        """Seconds until the earliest task is due (0 if one is already due)."""
+        if not self._tasks:
+            return float("inf")
+        return max(0.0, min(t.next_due for t in self._tasks) - self._clock())
+
+    def stats(self):
+        return [t.stats() for t in self._tasks]
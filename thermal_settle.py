@@ -0,0 +1,172 @@
+"""
+Thermal settle detection for the TEC and sensor temperatures.
+
+A channel is stable over the last `window` seconds when
+
+- the least-squares drift over the window (|slope| * window) is within the
+  tolerance,
+- no sample deviates from the fitted line by more than the tolerance, and
+- the window mean is within the tolerance of the channel's target, if it
+  has one (e.g. TEC error -> 0).
+
+While a channel is still moving, the time to steady state is estimated by
+treating the approach as first order: the means of the three thirds of the
+window give the time constant (their differences shrink by
+exp(-third / tau)) and the current slope, and the drift criterion is met
+after tau * ln(|slope| * window / tolerance). Without a decaying slope,
+only a linear approach to the target can be estimated.
+"""
+
+import collections
+import math
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_HORIZON_S = 3600.0
+DEFAULT_MAX_SAMPLES = 4096
+# A window counts as covered when its samples span at least this fraction of it
+MIN_COVERAGE = 0.9
+
+
+class SettleDetector:
+    """Recent samples per channel and stability checks over a trailing window."""
+
+    def __init__(self, horizon_s=DEFAULT_HORIZON_S, max_samples=DEFAULT_MAX_SAMPLES):
+        """
+        Args:
+            horizon_s (float): Samples older than this are dropped
+            max_samples (int): Samples kept per channel at most
+        """
+        self.horizon_s = float(horizon_s)
+        self.max_samples = int(max_samples)
+        self._samples = {}
+        self._cond = threading.Condition()
+
+    def add(self, channel, timestamp, value):
+        self.add_many(timestamp, {channel: value})
+
+    def add_many(self, timestamp, samples):
+        """Add one sample per channel and wake waiters."""
+        with self._cond:
+            for channel, value in samples.items():
+                if value is None or value != value:
+                    continue
+                buf = self._samples.get(channel)
+                if buf is None:
+                    buf = self._samples[channel] = collections.deque(maxlen=self.max_samples)
+                buf.append((float(timestamp), float(value)))
+                while buf and buf[0][0] < timestamp - self.horizon_s:
+                    buf.popleft()
+            self._cond.notify_all()
+
+    def clear(self, prefix=""):
+        with self._cond:
+            for channel in [c for c in self._samples if c.startswith(prefix)]:
+                del self._samples[channel]
+
+    def channels(self):
+        with self._cond:
+            return sorted(self._samples)
+
+    def assess(self, channel, tolerance, window, target=None, now=None):
+        """
+        Stability of one channel over the last `window` seconds.
+
+        Returns:
+            dict: stable, etaS (seconds to steady state, 0 if stable, None if
+                  unknown), mean, last, slope (per second), drift, noise
+                  (max deviation from the fit), samples, and reason when not stable
+        """
+        now = time.time() if now is None else now
+        with self._cond:
+            data = [s for s in self._samples.get(channel, ()) if s[0] >= now - window]
+        out = {"channel": channel, "stable": False, "etaS": None, "samples": len(data)}
+        if len(data) < 3 or data[-1][0] - data[0][0] < MIN_COVERAGE * window:
+            out["reason"] = "not enough data"
+            return out
+
+        t = np.array([s[0] for s in data]) - data[-1][0]
+        v = np.array([s[1] for s in data])
+        slope, intercept = np.polyfit(t, v, 1)
+        drift = abs(slope) * window
+        noise = float(np.max(np.abs(v - (slope * t + intercept))))
+        mean = float(v.mean())
+        out.update(mean=mean, last=float(v[-1]), slope=float(slope), drift=float(drift), noise=noise)
+
+        offset = 0.0 if target is None else abs(mean - target)
+        if drift <= tolerance and noise <= tolerance and offset <= tolerance:
+            out.update(stable=True, etaS=0.0)
+            return out
+        out["reason"] = "drifting" if drift > tolerance else ("noisy" if noise > tolerance else "off target")
+        out["etaS"] = self._eta(t, v, slope, tolerance, window, target)
+        return out
+
+    @staticmethod
+    def _eta(t, v, slope, tolerance, window, target):
+        # Means of three consecutive thirds: for a first-order approach their
+        # differences shrink by r = exp(-(window / 3) / tau)
+        third = (t[-1] - t[0]) / 3
+        seg = np.minimum(((t - t[0]) / third).astype(int), 2) if third > 0 else None
+        if seg is not None and all((seg == k).sum() >= 2 for k in range(3)):
+            m1, m2, m3 = (v[seg == k].mean() for k in range(3))
+            d1, d2 = m2 - m1, m3 - m2
+            if d1 * d2 > 0 and abs(d2) < abs(d1):
+                r = d2 / d1
+                tau = -third / math.log(r)
+                end_slope = abs(d2) / third * r
+                eta = tau * math.log(max(end_slope * window / tolerance, 1.0))
+                if target is not None and abs(v[-1] - target) > tolerance:
+                    # The distance to the target shrinks with the same time constant
+                    eta = max(eta, tau * math.log(abs(v[-1] - target) / tolerance))
+                return float(eta)
+        if target is not None and slope * (target - v[-1]) > 0:
+            # Moving linearly towards the target
+            return float(max(abs(target - v[-1]) - tolerance, 0.0) / abs(slope))
+        return None
+
+    def assess_all(self, channels, tolerance, window, now=None):
+        """
+        Stability of several channels.
+
+        Args:
+            channels (dict): channel -> target (None: no target)
+
+        Returns:
+            dict: stable (all channels stable), etaS (largest estimate, None if
+                  any is unknown), channels (per-channel assess() results)
+        """
+        now = time.time() if now is None else now
+        results = {c: self.assess(c, tolerance, window, target, now) for c, target in channels.items()}
+        etas = [r["etaS"] for r in results.values()]
+        return {
+            "stable": bool(results) and all(r["stable"] for r in results.values()),
+            "etaS": None if not etas or any(e is None for e in etas) else max(etas),
+            "tolerance": tolerance,
+            "windowS": window,
+            "channels": results,
+        }
+
+    def wait_stable(self, channels, tolerance, window, timeout=None, cancelled=None):
+        """
+        Block until all channels are stable, for scripted flows.
+
+        Args:
+            channels (dict): channel -> target (None: no target)
+            timeout (float): Give up after this many seconds (None: wait forever)
+            cancelled (callable): Returns True to stop waiting early
+
+        Returns:
+            dict: The last assess_all() result, plus waitedS
+        """
+        start = time.monotonic()
+        while True:
+            report = self.assess_all(channels, tolerance, window)
+            waited = time.monotonic() - start
+            if report["stable"] or (timeout is not None and waited >= timeout) or (cancelled and cancelled()):
+                report["waitedS"] = waited
+                return report
+            with self._cond:
+                remaining = None if timeout is None else max(timeout - waited, 0.0)
+                self._cond.wait(1.0 if remaining is None else min(remaining, 1.0))